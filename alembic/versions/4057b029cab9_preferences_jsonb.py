@@ -0,0 +1,62 @@
+"""Store user preferences as JSONB
+
+Revision ID: 4057b029cab9
+Revises: f18094fc9511
+Create Date: 2026-10-17 10:41:08.512337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4057b029cab9'
+down_revision: Union[str, None] = 'f18094fc9511'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows written before crud serialized dicts may hold plain text or JSON that is not an
+    # object. UserProfile.preferences must be an object, so keep such values as {"text": ...}
+    # instead of failing the cast; blank values and JSON null become NULL
+    op.execute("""
+        CREATE FUNCTION pg_temp.preferences_to_jsonb(value text) RETURNS jsonb AS $$
+        DECLARE
+            parsed jsonb;
+        BEGIN
+            IF btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            parsed := value::jsonb;
+            IF jsonb_typeof(parsed) = 'object' THEN
+                RETURN parsed;
+            ELSIF jsonb_typeof(parsed) = 'null' THEN
+                RETURN NULL;
+            END IF;
+            RETURN jsonb_build_object('text', value);
+        EXCEPTION WHEN invalid_text_representation THEN
+            RETURN jsonb_build_object('text', value);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+    op.alter_column('user_profiles', 'preferences',
+                    existing_type=sa.Text(),
+                    type_=postgresql.JSONB(astext_type=sa.Text()),
+                    existing_nullable=True,
+                    postgresql_using='pg_temp.preferences_to_jsonb(preferences)')
+    op.execute("DROP FUNCTION pg_temp.preferences_to_jsonb(text)")
+    op.create_index('ix_user_profiles_preferences', 'user_profiles', ['preferences'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'preferences': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_profiles_preferences', table_name='user_profiles', postgresql_using='gin')
+    op.alter_column('user_profiles', 'preferences',
+                    existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                    type_=sa.Text(),
+                    existing_nullable=True,
+                    postgresql_using='preferences::text')
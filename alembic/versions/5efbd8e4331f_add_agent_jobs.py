@@ -0,0 +1,45 @@
+"""Add agent jobs table
+
+Revision ID: 5efbd8e4331f
+Revises: 4057b029cab9
+Create Date: 2026-10-17 11:02:14.387290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5efbd8e4331f'
+down_revision: Union[str, None] = '4057b029cab9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('agent_jobs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('agent_name', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('request', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('callback_url', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('output', sa.Text(), nullable=True),
+    sa.Column('info', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_agent_jobs_status_created_at', 'agent_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agent_jobs_status_created_at', table_name='agent_jobs')
+    op.drop_table('agent_jobs')
@@ -0,0 +1,47 @@
+"""Add conversation memory tables
+
+Revision ID: 7f2d2dbf06aa
+Revises: 5efbd8e4331f
+Create Date: 2026-10-17 14:21:08.513402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f2d2dbf06aa'
+down_revision: Union[str, None] = '5efbd8e4331f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('conversations',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=False),
+    sa.Column('summary_tokens', sa.Integer(), nullable=False),
+    sa.Column('summarized_turns', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user_profiles.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('conversation_turns',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('tokens', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_conversation_turns_user_id_id', 'conversation_turns', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversation_turns_user_id_id', table_name='conversation_turns')
+    op.drop_table('conversation_turns')
+    op.drop_table('conversations')
@@ -0,0 +1,42 @@
+"""Add composite indexes for task and expense access patterns
+
+Revision ID: a48107e09f75
+Revises: c76bbdb588a8
+Create Date: 2026-10-17 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a48107e09f75'
+down_revision: Union[str, None] = 'c76bbdb588a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    # Paginated task listing: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+    ('ix_tasks_user_id_created_at_id', 'tasks', ['user_id', 'created_at', 'id']),
+    # Tasks by status and due date: WHERE user_id = ? AND status = ? ORDER BY deadline
+    ('ix_tasks_user_id_status_deadline', 'tasks', ['user_id', 'status', 'deadline']),
+    # Paginated expense listing and date ranges: WHERE user_id = ? AND created_at ... ORDER BY created_at DESC, id DESC
+    ('ix_expenses_user_id_created_at_id', 'expenses', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
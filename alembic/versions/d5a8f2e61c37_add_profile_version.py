@@ -0,0 +1,26 @@
+"""Add user profile version
+
+Revision ID: d5a8f2e61c37
+Revises: 7f2d2dbf06aa
+Create Date: 2026-10-17 16:32:10.640213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8f2e61c37'
+down_revision: Union[str, None] = '7f2d2dbf06aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_profiles', sa.Column('profile_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user_profiles', 'profile_version')
@@ -0,0 +1,26 @@
+"""Add user data version
+
+Revision ID: e81c4b07a9f2
+Revises: d5a8f2e61c37
+Create Date: 2026-10-17 17:05:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81c4b07a9f2'
+down_revision: Union[str, None] = 'd5a8f2e61c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_profiles', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user_profiles', 'data_version')
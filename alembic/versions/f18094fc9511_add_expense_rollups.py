@@ -0,0 +1,48 @@
+"""Add expense rollup table
+
+Revision ID: f18094fc9511
+Revises: a48107e09f75
+Create Date: 2026-10-17 10:03:27.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f18094fc9511'
+down_revision: Union[str, None] = 'a48107e09f75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('expense_rollups',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user_profiles.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'month', 'category', 'type')
+    )
+    # Backfill from existing expenses; the crud layer keeps it current from here on
+    op.execute("""
+        INSERT INTO expense_rollups (user_id, month, category, type, total, count)
+        SELECT user_id,
+               date_trunc('month', created_at)::date,
+               coalesce(category, 'other'),
+               coalesce(type, 'Personal'),
+               sum(amount),
+               count(*)
+        FROM expenses
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('expense_rollups')
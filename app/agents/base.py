@@ -1,9 +1,11 @@
 """
 Base agent class for LangGraph agents.
 """
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-from langgraph.graph import StateGraph
+from typing import Any, AsyncIterator, Dict, Optional
+from app.agents.profiling import AgentProfile
 
 
 class BaseAgent(ABC):
@@ -11,6 +13,10 @@ class BaseAgent(ABC):
     Base class for all LangGraph agents.
     """
     
+    # Opt in to the response cache. Only set this for agents whose output depends
+    # solely on the request and the user's stored data (no clock, no external calls).
+    cacheable: bool = False
+    
     def __init__(self, name: str):
         """
         Initialize the base agent.
@@ -19,14 +25,71 @@ class BaseAgent(ABC):
             name: Name of the agent
         """
         self.name = name
-        self.graph = None
-        self._build_graph()
+        self._graph = None
+        self._built = False
+        self._building_thread: Optional[int] = None
+        self._build_lock = threading.RLock()
+        self.build_seconds: Optional[float] = None
+        self.profile = AgentProfile()
+    
+    @property
+    def graph(self) -> Any:
+        """
+        The compiled graph, built on first access (see build). Other threads wait
+        for a build in progress; only _build_graph itself reading self.graph on
+        the building thread gets the graph as assigned so far.
+        """
+        if not self._built and self._building_thread != threading.get_ident():
+            self.build()
+        return self._graph
+    
+    @graph.setter
+    def graph(self, value: Any) -> None:
+        self._graph = value
+    
+    def build(self) -> None:
+        """
+        Compile the graph once and record how long it took.
+        Every node of the graph _build_graph returns is wrapped to record its
+        wall time, LLM token usage and errors in self.profile.
+        Safe to call from several threads; later calls return immediately.
+        """
+        with self._build_lock:
+            if self._built:
+                return
+            from app.agents.node_hooks import profile_graph_nodes  # Imports langgraph, so deferred to the first build
+            
+            self._building_thread = threading.get_ident()
+            start = time.perf_counter()
+            try:
+                workflow = self._build_graph()
+                if workflow is not None:
+                    profile_graph_nodes(workflow, self.profile)
+                    self.graph = workflow.compile()
+            finally:
+                self._building_thread = None
+            self.build_seconds = time.perf_counter() - start
+            self._built = True
+    
+    def warm_up(self) -> None:
+        """
+        Prepare expensive clients (e.g. construct LLM clients and open their
+        connections) so the first request does not pay for it. Called after
+        build() during the startup warm-up; the default does nothing.
+        """
+        pass
     
     @abstractmethod
-    def _build_graph(self) -> None:
+    def _build_graph(self) -> Optional[Any]:
         """
         Build the LangGraph state graph for this agent.
         This method should be implemented by each specific agent.
+        Called lazily by build(), not from __init__.
+        
+        Returns:
+            The graph, not compiled: build() profiles its nodes and compiles it.
+            Agents that compile it themselves (setting self.graph) return None
+            and get no node profile.
         """
         pass
     
@@ -43,6 +106,22 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the agent's progress as events.
+        The default runs invoke and yields its output as a single event; agents
+        override this (see app.agents.streaming.stream_graph) to emit node
+        updates and LLM tokens as they happen.
+        
+        Args:
+            input_data: Input data for the agent
+            
+        Yields:
+            Events of the form {"event": name, "data": payload}, ending with an "output" event
+        """
+        result = await self.invoke(input_data)
+        yield {"event": "output", "data": {"output": result.get("output", "")}}
+    
     def get_info(self) -> Dict[str, Any]:
         """
         Get information about this agent.
@@ -53,6 +132,10 @@ class BaseAgent(ABC):
         return {
             "name": self.name,
             "type": self.__class__.__name__,
+            "cacheable": self.cacheable,
+            "graph_built": self._built,
+            "build_seconds": round(self.build_seconds, 6) if self.build_seconds is not None else None,
+            "nodes": self.profile.as_dict(),
             "description": self.__doc__ or "No description available"
         }
 
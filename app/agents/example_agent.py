@@ -2,15 +2,17 @@
 Example LangGraph agent implementation.
 This file serves as a template for creating new agents.
 """
-from typing import Dict, Any, TypedDict
+from typing import AsyncIterator, Dict, Any, TypedDict
 from langgraph.graph import StateGraph, END
 from app.agents.base import BaseAgent
+from app.agents.streaming import stream_graph
 
 
 class AgentState(TypedDict):
     """State schema for the example agent."""
     messages: list
     input: str
+    prompt_prefix: str
     output: str
 
 
@@ -20,14 +22,20 @@ class ExampleAgent(BaseAgent):
     Replace this with your actual agent logic.
     """
     
+    # Output is a pure function of the input
+    cacheable = True
+    
     def __init__(self):
         """Initialize the example agent."""
         super().__init__(name="example_agent")
     
-    def _build_graph(self) -> None:
+    def _build_graph(self) -> StateGraph:
         """
         Build the LangGraph state graph.
         This is a simple example - replace with your actual graph logic.
+        
+        Returns:
+            The graph, compiled by build()
         """
         # Define the graph
         workflow = StateGraph(AgentState)
@@ -41,8 +49,7 @@ class ExampleAgent(BaseAgent):
         workflow.add_edge("process_input", "generate_output")
         workflow.add_edge("generate_output", END)
         
-        # Compile the graph
-        self.graph = workflow.compile()
+        return workflow
     
     def _process_input(self, state: AgentState) -> AgentState:
         """
@@ -71,29 +78,53 @@ class ExampleAgent(BaseAgent):
         state["output"] = f"Processed: {state.get('input', '')}"
         return state
     
-    async def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _initial_state(self, input_data: Dict[str, Any]) -> AgentState:
         """
-        Invoke the agent with input data.
+        Build the graph's initial state from the input data.
         
         Args:
             input_data: Input data for the agent
             
         Returns:
-            Output data from the agent
+            Initial state
         """
-        # Prepare initial state
-        initial_state: AgentState = {
+        return {
             "messages": [],
             "input": input_data.get("input", ""),
+            # Rendered user profile; put it right after the agent's fixed system
+            # prompt so every message of a user starts with the same bytes
+            "prompt_prefix": input_data.get("prompt_prefix", ""),
             "output": ""
         }
+    
+    async def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invoke the agent with input data.
         
+        Args:
+            input_data: Input data for the agent
+            
+        Returns:
+            Output data from the agent
+        """
         # Run the graph
-        result = await self.graph.ainvoke(initial_state)
+        result = await self.graph.ainvoke(self._initial_state(input_data))
         
         # Return the output
         return {
             "output": result.get("output", ""),
             "state": result
         }
-
+    
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream node updates, LLM tokens and the final output.
+        
+        Args:
+            input_data: Input data for the agent
+            
+        Yields:
+            Agent events
+        """
+        async for event in stream_graph(self.graph, self._initial_state(input_data)):
+            yield event
@@ -0,0 +1,177 @@
+"""
+Background agent jobs run by a pool of in-process workers.
+Jobs live in the agent_jobs table, so they survive restarts and any process
+running workers can pick them up; no external broker is needed.
+"""
+import asyncio
+import logging
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from app.agents.memory import remember_exchange, resolve_history
+from app.agents.runner import load_user_profile, load_data_version, response_cache_key, run_agent
+from app.core.config import get_settings
+from app.core.dependencies import get_agent
+from app.core.scheduler import SchedulerFull
+from app.db import async_crud
+from app.db.async_database import get_async_session_factory
+from app.db.models import AgentJob
+from app.models.schemas import AgentRequest
+
+logger = logging.getLogger(__name__)
+
+
+def new_job_id() -> str:
+    """Generate a job ID."""
+    return uuid.uuid4().hex
+
+
+class AgentJobWorkers:
+    """
+    Pool of asyncio workers that claim and run queued agent jobs.
+    Workers wake up when a job is submitted in this process and otherwise poll
+    the table, which also picks up jobs from other processes and abandoned runs.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        callback_timeout: float
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            workers: Number of concurrent workers
+            poll_seconds: Seconds an idle worker waits before checking the table again
+            lease_seconds: How long a running job may go unfinished before it is reclaimed
+            max_attempts: How many times a job may be started
+            callback_timeout: Timeout in seconds for callback POSTs
+        """
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.callback_timeout = callback_timeout
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info("Started %d agent job workers.", self.workers)
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake an idle worker after a job was queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        """Claim and run jobs until cancelled."""
+        while True:
+            async with get_async_session_factory()() as db:
+                job = await async_crud.claim_agent_job(db, self.lease_seconds, self.max_attempts)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep the worker alive; the job is reclaimed once its lease expires
+                logger.exception("Error running agent job %s", job.id, extra={"job_id": job.id})
+
+    async def _run(self, job: AgentJob) -> None:
+        """Run one claimed job and record its result."""
+        try:
+            agent = get_agent(job.agent_name)
+            request = AgentRequest.model_validate(job.request)
+            async with get_async_session_factory()() as db:
+                user_profile = await load_user_profile(db, request.user_id)
+                cache_key = response_cache_key(agent, request, await load_data_version(db, request.user_id))
+                request = await resolve_history(db, request)
+            response = await run_agent(agent, request, user_profile, cache_key)
+            await remember_exchange(request, response.output)
+        except SchedulerFull as e:
+            # Interactive traffic has the slots: back off without using up an attempt
+            await self._requeue(job.id, count_attempt=False)
+            await asyncio.sleep(e.retry_after)
+            return
+        except asyncio.CancelledError:
+            await asyncio.shield(self._requeue(job.id, count_attempt=False))
+            raise
+        except Exception as e:
+            finished = await self._finish(job.id, error=f"Error invoking agent: {str(e)}")
+        else:
+            finished = await self._finish(job.id, output=response.output, info=response.info)
+
+        if finished is not None and finished.callback_url:
+            await self._callback(finished)
+
+    async def _finish(self, job_id: str, **result: Any) -> Optional[AgentJob]:
+        async with get_async_session_factory()() as db:
+            return await async_crud.finish_agent_job(db, job_id, **result)
+
+    async def _requeue(self, job_id: str, count_attempt: bool) -> None:
+        async with get_async_session_factory()() as db:
+            await async_crud.requeue_agent_job(db, job_id, count_attempt)
+
+    async def _callback(self, job: AgentJob) -> None:
+        """POST the finished job to its callback URL. Failures are logged, not retried."""
+        import httpx  # Only needed once a job with a callback finishes
+
+        payload: Dict[str, Any] = job.model_dump(mode="json", exclude={"request", "callback_url"})
+        try:
+            async with httpx.AsyncClient(timeout=self.callback_timeout) as client:
+                response = await client.post(job.callback_url, json=payload)
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning("Error sending callback for agent job %s: %s", job.id, e, extra={"job_id": job.id, "callback_url": job.callback_url})
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get worker pool statistics.
+
+        Returns:
+            Dictionary with the configured and live worker counts
+        """
+        return {
+            "workers": self.workers,
+            "alive": sum(not task.done() for task in self._tasks)
+        }
+
+
+@lru_cache
+def get_job_workers() -> AgentJobWorkers:
+    """
+    Get the job worker pool, configured from settings on first call.
+
+    Returns:
+        AgentJobWorkers: The shared worker pool
+    """
+    settings = get_settings()
+    return AgentJobWorkers(
+        workers=settings.agent_job_workers,
+        poll_seconds=settings.agent_job_poll_seconds,
+        lease_seconds=settings.agent_job_lease_seconds,
+        max_attempts=settings.agent_job_max_attempts,
+        callback_timeout=settings.agent_job_callback_timeout_seconds
+    )
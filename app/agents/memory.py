@@ -0,0 +1,138 @@
+"""
+Server-side conversation memory for the agents.
+Each exchange is stored per user and older turns are folded into a rolling
+summary within settings.conversation_token_budget, so clients do not have to
+resend the chat history. Requests that send no history get the compacted
+window instead; requests that do send one keep using it.
+"""
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.db import async_crud
+from app.db.async_database import get_async_session_factory
+from app.db.models import Conversation
+from app.models.schemas import AgentRequest, ConversationStats
+
+
+def history_window(conversation: Conversation) -> List[Dict[str, Any]]:
+    """
+    Build the history agents receive from a stored conversation.
+
+    Args:
+        conversation: The user's conversation
+
+    Returns:
+        Chat messages: the summary as a system message, if any, then the recent turns
+    """
+    messages = []
+    if conversation.summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{conversation.summary}"})
+    messages.extend({"role": turn.role, "content": turn.content} for turn in conversation.turns)
+    return messages
+
+
+async def load_history(db: AsyncSession, user_id: str) -> List[Dict[str, Any]]:
+    """
+    Get a user's compacted history.
+
+    Args:
+        db: The request's database session
+        user_id: Telegram ID of the user
+
+    Returns:
+        The history window; empty if the memory is disabled or cannot be read
+    """
+    if get_settings().conversation_token_budget <= 0:
+        return []
+    conversation = await async_crud.get_conversation(db, user_id)
+    return history_window(conversation) if conversation is not None else []
+
+
+def with_history(request: AgentRequest, history: List[Dict[str, Any]]) -> AgentRequest:
+    """
+    Give a request the stored history, unless the client sent its own.
+
+    Args:
+        request: The agent request
+        history: The user's history window
+
+    Returns:
+        The request to run
+    """
+    if request.history or not history:
+        return request
+    return request.model_copy(update={"history": history})
+
+
+async def resolve_history(db: AsyncSession, request: AgentRequest) -> AgentRequest:
+    """
+    Load the user's history into a request that sent none.
+
+    Args:
+        db: The request's database session
+        request: The agent request
+
+    Returns:
+        The request to run
+    """
+    if request.history:
+        return request
+    return with_history(request, await load_history(db, request.user_id))
+
+
+async def remember_exchanges(exchanges: List[Tuple[AgentRequest, str]]) -> None:
+    """
+    Store requests' inputs and the agent's outputs as their users' newest turns, in order.
+    Uses its own short-lived session, so callers can release theirs before running
+    the agent. Failures are logged by async_crud and otherwise ignored.
+
+    Args:
+        exchanges: (agent request, agent output) pairs
+    """
+    settings = get_settings()
+    if settings.conversation_token_budget <= 0 or not exchanges:
+        return
+    async with get_async_session_factory()() as db:
+        for request, output in exchanges:
+            await async_crud.add_conversation_turns(
+                db,
+                request.user_id,
+                [("user", request.input), ("assistant", output)],
+                settings.conversation_token_budget,
+                settings.conversation_summary_tokens,
+                settings.conversation_min_recent_turns
+            )
+
+
+async def remember_exchange(request: AgentRequest, output: str) -> None:
+    """
+    Store a request's input and the agent's output as the user's newest turns.
+
+    Args:
+        request: The agent request
+        output: The agent's output
+    """
+    await remember_exchanges([(request, output)])
+
+
+def conversation_stats(conversation: Conversation) -> ConversationStats:
+    """
+    Summarize the size of a stored conversation.
+
+    Args:
+        conversation: The user's conversation
+
+    Returns:
+        Turn and token counts
+    """
+    turn_tokens = sum(turn.tokens for turn in conversation.turns)
+    return ConversationStats(
+        user_id=conversation.user_id,
+        turns=len(conversation.turns),
+        turn_tokens=turn_tokens,
+        summary_tokens=conversation.summary_tokens,
+        summarized_turns=conversation.summarized_turns,
+        total_tokens=turn_tokens + conversation.summary_tokens,
+        token_budget=get_settings().conversation_token_budget,
+        updated_at=conversation.updated_at
+    )
@@ -0,0 +1,104 @@
+"""
+Node instrumentation for LangGraph graphs.
+profile_graph_nodes wraps every node of an uncompiled graph so its runs are
+timed, its LLM token usage counted and its errors recorded in an AgentProfile.
+BaseAgent.build applies it to the graph _build_graph returns, before
+compiling it; other graphs in the process are left untouched.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.base import RunnableLike, coerce_to_runnable
+from langchain_core.tracers.context import register_configure_hook
+from langgraph.graph.graph import Graph
+from app.agents.profiling import AgentProfile
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """
+    Sums the token usage that LLMs report in llm_output (as OpenAI chat
+    models do for non-streaming calls).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+
+
+# Handler of the node currently running in this context. The configure hook
+# attaches it to every LangChain run started inside the node, including LLM
+# calls that do not pass the node's config on.
+_node_usage: ContextVar[Optional[TokenUsageHandler]] = ContextVar("node_token_usage", default=None)
+register_configure_hook(_node_usage, inheritable=True)
+
+
+def profiled_node(profile: AgentProfile, key: str, action: RunnableLike) -> RunnableLambda:
+    """
+    Wrap a node so each run is recorded in the profile.
+
+    Args:
+        profile: Profile to record into
+        key: Node name
+        action: The node as given to add_node (function or runnable)
+
+    Returns:
+        A runnable with the same sync and async behaviour as the node
+    """
+    node = coerce_to_runnable(action)
+
+    def run(state: Any, config: RunnableConfig) -> Any:
+        usage = TokenUsageHandler()
+        token = _node_usage.set(usage)
+        start = time.perf_counter()
+        error = None
+        try:
+            return node.invoke(state, config)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _node_usage.reset(token)
+            profile.record(key, time.perf_counter() - start, usage.prompt_tokens, usage.completion_tokens,
+                           usage.llm_calls, error)
+
+    async def arun(state: Any, config: RunnableConfig) -> Any:
+        usage = TokenUsageHandler()
+        token = _node_usage.set(usage)
+        start = time.perf_counter()
+        error = None
+        try:
+            return await node.ainvoke(state, config)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _node_usage.reset(token)
+            profile.record(key, time.perf_counter() - start, usage.prompt_tokens, usage.completion_tokens,
+                           usage.llm_calls, error)
+
+    return RunnableLambda(run, afunc=arun, name=key)
+
+
+def profile_graph_nodes(graph: Graph, profile: AgentProfile) -> None:
+    """
+    Wrap every node of an uncompiled graph (Graph or StateGraph) in place.
+
+    Args:
+        graph: The graph, with all its nodes added and not compiled yet
+        profile: Profile the nodes record into
+    """
+    for key, node in list(graph.nodes.items()):
+        graph.nodes[key] = profiled_node(profile, key, node)
@@ -0,0 +1,85 @@
+"""
+Per-node profile of an agent's graph: calls, wall time, LLM token usage
+and errors, aggregated since the process started.
+The nodes are wrapped by app.agents.node_hooks when BaseAgent.build compiles the graph.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+
+class NodeStats:
+    """Running totals for one graph node."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self.last_error: Optional[str] = None
+
+
+class AgentProfile:
+    """Thread-safe per-node statistics for one agent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, NodeStats] = {}
+
+    def record(
+        self,
+        node: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        llm_calls: int = 0,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Record one run of a node.
+
+        Args:
+            node: Node name as registered with add_node
+            seconds: Wall time of the run
+            prompt_tokens: Prompt tokens reported by LLM calls made inside the node
+            completion_tokens: Completion tokens reported by those calls
+            llm_calls: Number of LLM calls made inside the node
+            error: Exception the node raised, if any
+        """
+        with self._lock:
+            stats = self._nodes.setdefault(node, NodeStats())
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.llm_calls += llm_calls
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = f"{type(error).__name__}: {error}"[:500]
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the statistics of every node that has run.
+
+        Returns:
+            Dictionary of node name to calls, errors, wall times in seconds and token counts
+        """
+        with self._lock:
+            return {
+                node: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "total_seconds": round(stats.total_seconds, 6),
+                    "avg_seconds": round(stats.total_seconds / stats.calls, 6),
+                    "max_seconds": round(stats.max_seconds, 6),
+                    "llm_calls": stats.llm_calls,
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "total_tokens": stats.prompt_tokens + stats.completion_tokens,
+                    "last_error": stats.last_error
+                }
+                for node, stats in self._nodes.items()
+            }
@@ -0,0 +1,90 @@
+"""
+Compact prompt prefix rendered from the user profile.
+The same profile always renders to the same bytes (fixed field order, sorted
+preference keys, normalized whitespace), so an agent that puts the prefix
+right after its own fixed system prompt sends an identical prompt start on
+every message of a user, and provider-side prompt caching can reuse it.
+"""
+import json
+from functools import lru_cache
+from typing import List
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.db.models import UserProfile
+
+
+def _one_line(text: str) -> str:
+    return " ".join(text.split())
+
+
+def render_profile_prefix(profile: UserProfile) -> str:
+    """
+    Render the profile block: known facts about the user, then the user's
+    standing instructions (supervisor_prompt_override). Empty fields are left out.
+
+    Args:
+        profile: The user's profile
+
+    Returns:
+        The prefix, or an empty string if the profile has nothing to add
+    """
+    facts: List[str] = []
+    if profile.name:
+        facts.append(f"- Name: {_one_line(profile.name)}")
+    location = ", ".join(_one_line(part) for part in (profile.city, profile.state, profile.country) if part)
+    if location:
+        facts.append(f"- Location: {location}")
+    if profile.job:
+        facts.append(f"- Job: {_one_line(profile.job)}")
+    interests = [_one_line(interest) for interest in profile.interests if interest and interest.strip()]
+    if interests:
+        facts.append(f"- Interests: {', '.join(interests)}")
+    if profile.preferences:
+        preferences = json.dumps(profile.preferences, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        facts.append(f"- Preferences: {preferences}")
+
+    sections = []
+    if facts:
+        sections.append("About the user:\n" + "\n".join(facts))
+    override = (profile.supervisor_prompt_override or "").strip()
+    if override:
+        sections.append("Instructions from the user:\n" + "\n".join(line.rstrip() for line in override.splitlines()))
+    return "\n\n".join(sections)
+
+
+@lru_cache
+def get_prompt_prefix_cache() -> TTLCache:
+    """
+    Get the prompt prefix cache, sized like the profile cache on first call.
+    Keyed by (user ID, profile version), so a profile update makes older prefixes
+    unreachable while task and expense writes leave them alone.
+
+    Returns:
+        TTLCache: The shared prompt prefix cache
+    """
+    settings = get_settings()
+    return TTLCache(
+        name="prompt_prefixes",
+        maxsize=settings.profile_cache_size,
+        ttl=settings.profile_cache_ttl_seconds
+    )
+
+
+def profile_prompt_prefix(profile: UserProfile) -> str:
+    """
+    Get the rendered prefix of a profile, rendering it once per profile version.
+
+    Args:
+        profile: The user's profile
+
+    Returns:
+        The prefix (see render_profile_prefix)
+    """
+    cache = get_prompt_prefix_cache()
+    # The version is read from the same row as the fields, so it always matches them
+    key = (profile.id, profile.profile_version)
+    prefix = cache.get(key)
+    if prefix is None:
+        prefix = render_profile_prefix(profile)
+        cache.set(key, prefix)
+    return prefix
@@ -0,0 +1,129 @@
+"""
+Cache of agent outputs for repeated messages.
+Keys combine the agent name, the user, the user's data version and a hash of the
+normalized request, so any write to the user's data makes older answers unreachable.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+
+def normalize_input(text: str) -> str:
+    """
+    Normalize a message so trivially different repeats share a cache entry.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        Case-folded text with collapsed whitespace and no trailing punctuation
+    """
+    return " ".join(text.casefold().split()).rstrip(" ?!.")
+
+
+class AgentResponseCache:
+    """
+    TTL/LRU cache of agent outputs with per-agent hit and miss counters.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a response stays valid
+        """
+        self._cache = TTLCache(name="agent_responses", maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._per_agent: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(
+        agent_name: str,
+        user_id: str,
+        data_version: int,
+        input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[str, str, int, str]:
+        """
+        Build the cache key for a request.
+
+        Args:
+            agent_name: Name of the agent
+            user_id: Telegram ID of the user
+            data_version: The user's data version read before invoking the agent
+            input: The user's message
+            context: Extra context sent with the message
+            history: Chat history sent with the message
+
+        Returns:
+            Hashable cache key
+        """
+        payload = json.dumps(
+            [normalize_input(input), context or {}, history or []],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return agent_name, user_id, data_version, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, agent_name: str, key: Hashable) -> Optional[str]:
+        """
+        Look up a cached output.
+
+        Args:
+            agent_name: Name of the agent, for the per-agent counters
+            key: Key from AgentResponseCache.key
+
+        Returns:
+            The cached output, or None on a miss
+        """
+        output = self._cache.get(key)
+        with self._lock:
+            counters = self._per_agent.setdefault(agent_name, {"hits": 0, "misses": 0})
+            counters["hits" if output is not None else "misses"] += 1
+        return output
+
+    def set(self, key: Hashable, output: str) -> None:
+        """
+        Cache an agent output.
+
+        Args:
+            key: Key from AgentResponseCache.key
+            output: The agent's output
+        """
+        self._cache.set(key, output)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with the cache totals and hit/miss counts per agent
+        """
+        stats = self._cache.stats()
+        with self._lock:
+            stats["agents"] = {
+                name: {**counters, "hit_rate": round(counters["hits"] / (counters["hits"] + counters["misses"]), 4)}
+                for name, counters in self._per_agent.items()
+            }
+        return stats
+
+
+@lru_cache
+def get_agent_response_cache() -> AgentResponseCache:
+    """
+    Get the agent response cache, sized from settings on first call.
+
+    Returns:
+        AgentResponseCache: The shared response cache
+    """
+    settings = get_settings()
+    return AgentResponseCache(
+        maxsize=settings.agent_cache_size,
+        ttl=settings.agent_cache_ttl_seconds
+    )
@@ -0,0 +1,139 @@
+"""
+Running an agent for one request: profile lookup, response cache and scheduling.
+Shared by the agent routes and the background job workers.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.agents.base import BaseAgent
+from app.agents.prompt_prefix import profile_prompt_prefix
+from app.agents.response_cache import get_agent_response_cache
+from app.core.log import bind_log_context
+from app.core.metrics import AGENT_RUN_SECONDS
+from app.core.scheduler import get_scheduler
+from app.db import async_crud
+from app.db.models import UserProfile
+from app.db.timestamps import local_now
+from app.models.schemas import AgentRequest, AgentResponse
+
+
+async def load_user_profile(db: AsyncSession, user_id: str) -> UserProfile:
+    """
+    Get the user's profile, creating an empty one on first contact.
+
+    Args:
+        db: The request's database session
+        user_id: Telegram ID of the user
+
+    Returns:
+        The user's profile
+    """
+    bind_log_context(user_id=user_id)
+    user_profile = await async_crud.get_user_profile(db, user_id)
+    if not user_profile:
+        user_profile = UserProfile(id=user_id, created_at=local_now())
+        await async_crud.create_user_profile(db, user_profile)
+    return user_profile
+
+
+async def load_data_version(db: AsyncSession, user_id: str) -> int:
+    """
+    Get the user's data version from the database, so responses cached by any
+    process stop matching once any process writes the user's data.
+
+    Args:
+        db: The request's database session
+        user_id: Telegram ID of the user
+
+    Returns:
+        The version; 0 if the user has no profile yet
+    """
+    versions = await async_crud.get_data_versions(db, {user_id})
+    return versions.get(user_id, 0)
+
+
+def agent_input(request: AgentRequest, user_profile: UserProfile) -> Dict[str, Any]:
+    """
+    Build the input_data passed to BaseAgent.invoke / stream.
+
+    Args:
+        request: The agent request
+        user_profile: The requesting user's profile
+
+    Returns:
+        Input data for the agent. prompt_prefix is the rendered profile block
+        agents should place right after their fixed system prompt.
+    """
+    return {
+        "input": request.input,
+        "user_profile": user_profile.model_dump(),
+        "prompt_prefix": profile_prompt_prefix(user_profile),
+        "context": request.context,
+        "history": request.history
+    }
+
+
+def response_cache_key(agent: BaseAgent, request: AgentRequest, data_version: int) -> Optional[Tuple[str, str, int, str]]:
+    """
+    Build the response cache key. Read the data version before running the agent,
+    so a write during the run makes the result unreachable. Pass the request as the
+    client sent it, before resolve_history: the stored history changes with every
+    exchange, so hashing it would make repeated messages always miss.
+
+    Args:
+        agent: The agent to run
+        request: The agent request
+        data_version: The user's data version (see load_data_version)
+
+    Returns:
+        Cache key; None if the agent is not cacheable
+    """
+    if not agent.cacheable:
+        return None
+    return get_agent_response_cache().key(
+        agent.name, request.user_id, data_version,
+        request.input, request.context, request.history
+    )
+
+
+async def run_agent(
+    agent: BaseAgent,
+    request: AgentRequest,
+    user_profile: UserProfile,
+    cache_key: Optional[Tuple[str, str, int, str]]
+) -> AgentResponse:
+    """
+    Serve a request from the response cache, or run the agent under the scheduler.
+
+    Args:
+        agent: The agent to run
+        request: The agent request
+        user_profile: The requesting user's profile
+        cache_key: Response cache key (see response_cache_key)
+
+    Returns:
+        The agent's response
+
+    Raises:
+        SchedulerFull: If the scheduler's queues are full
+    """
+    if cache_key is not None:
+        output = get_agent_response_cache().get(agent.name, cache_key)
+        if output is not None:
+            return AgentResponse(output=output, info={"agent_name": agent.name, "cached": True})
+
+    async with get_scheduler().slot(request.user_id):
+        start, outcome = time.perf_counter(), "error"
+        try:
+            result = await agent.invoke(agent_input(request, user_profile))
+            outcome = "ok"
+        finally:
+            AGENT_RUN_SECONDS.labels(agent.name, outcome).observe(time.perf_counter() - start)
+    output = result.get("output", "")
+    if cache_key is not None:
+        get_agent_response_cache().set(cache_key, output)
+
+    return AgentResponse(
+        output=output,
+        info={"agent_name": agent.name, "cached": False}
+    )
@@ -0,0 +1,70 @@
+"""
+Streaming helpers for LangGraph agents.
+Merges node updates from graph.astream with LLM tokens from a callback handler
+into one ordered stream of events.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict
+from langchain_core.callbacks import AsyncCallbackHandler
+from langgraph.graph import END
+
+
+class TokenQueueHandler(AsyncCallbackHandler):
+    """
+    Callback handler that forwards every new LLM token to a queue.
+    Nodes only emit tokens if they pass their RunnableConfig on to the LLM call.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        await self.queue.put(("token", token))
+
+
+async def stream_graph(graph: Any, initial_state: Dict[str, Any], output_key: str = "output") -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a compiled graph and yield its progress as events.
+
+    Args:
+        graph: The compiled LangGraph graph
+        initial_state: State to start the graph with
+        output_key: State key holding the final answer
+
+    Yields:
+        {"event": "token", "data": str} for each LLM token,
+        {"event": "node", "data": {"node": name, "update": ...}} after each node,
+        and a final {"event": "output", "data": {"output": str}}
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    handler = TokenQueueHandler(queue)
+
+    async def run() -> None:
+        try:
+            async for chunk in graph.astream(initial_state, config={"callbacks": [handler]}):
+                await queue.put(("node", chunk))
+        finally:
+            await queue.put(("done", None))
+
+    task = asyncio.create_task(run())
+    state = dict(initial_state)
+    try:
+        while True:
+            kind, payload = await queue.get()
+            if kind == "done":
+                break
+            if kind == "token":
+                yield {"event": "token", "data": payload}
+                continue
+            for node, update in payload.items():
+                if isinstance(update, dict):
+                    state.update(update)
+                if node != END:
+                    yield {"event": "node", "data": {"node": node, "update": update}}
+        # Re-raise anything the graph raised
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+
+    yield {"event": "output", "data": {"output": state.get(output_key, "")}}
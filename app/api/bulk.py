@@ -0,0 +1,45 @@
+"""
+Shared handling for bulk create endpoints.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from app.models.schemas import BulkCreateResponse, BulkItemError
+
+
+def bulk_create(
+    items: List[Dict[str, Any]],
+    model: Type[BaseModel],
+    create: Callable[[List[Any]], Tuple[List[Optional[int]], Dict[int, str]]]
+) -> BulkCreateResponse:
+    """
+    Validates each item on its own and bulk-inserts the valid ones, so one bad
+    item is reported instead of rejecting the whole request.
+
+    Args:
+        items: Raw request items
+        model: Pydantic model each item must validate against
+        create: Bulk crud function returning (ids, errors by position)
+
+    Returns:
+        BulkCreateResponse: IDs in request order and per-item errors
+    """
+    ids: List[Optional[int]] = [None] * len(items)
+    errors: Dict[int, str] = {}
+    positions, valid = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append(model.model_validate(item))
+            positions.append(index)
+        except ValidationError as e:
+            errors[index] = str(e)
+    
+    created, failed = create(valid)
+    for index, new_id in zip(positions, created):
+        ids[index] = new_id
+    for position, error in failed.items():
+        errors[positions[position]] = error
+    
+    return BulkCreateResponse(
+        ids=ids,
+        errors=[BulkItemError(index=index, error=error) for index, error in sorted(errors.items())]
+    )
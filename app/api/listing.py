@@ -0,0 +1,36 @@
+"""
+JSON fast path for the list endpoints.
+
+Rows come from the database as column tuples (crud.list_task_rows and
+crud.list_expense_rows) and are written to JSON with orjson. No ORM object,
+domain model or response model is built per row, and FastAPI does not
+validate or encode the items. The routes keep their response_model for the
+OpenAPI schema. The selected columns are named and ordered like that model's
+fields, so the response body is the same as before.
+"""
+from typing import Optional, Sequence
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+from app.db.pagination import encode_cursor
+
+
+def page_response(rows: Sequence[Row], limit: Optional[int] = None) -> Response:
+    """
+    Writes a page of rows as {"items": [...], "next_cursor": ...}.
+
+    Args:
+        rows: Rows newest first. For a paged listing, fetch limit + 1 rows; the
+            extra row only tells whether there is a next page.
+        limit: Page size, or None when every matching row was fetched
+
+    Returns:
+        Response: The JSON response
+    """
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    fields = rows[0]._fields if rows else ()
+    body = {"items": [dict(zip(fields, row)) for row in rows], "next_cursor": next_cursor}
+    return Response(orjson.dumps(body), media_type="application/json")
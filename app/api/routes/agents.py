@@ -1,18 +1,49 @@
 """
 Agent endpoints for LangGraph agents.
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from app.models.schemas import AgentRequest, AgentResponse, UserProfileBase
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Dict, Any, Optional
+from pydantic import ValidationError
+from app.core.config import get_settings
+from app.models.schemas import (
+    AgentRequest, AgentResponse, AgentBatchResponse, BulkItemError, AgentJobRequest, AgentJobStatus, ConversationStats
+)
 from app.core.dependencies import get_agent, get_agent_names
-from app.db import crud
+from app.core.scheduler import SchedulerFull, get_scheduler
+from app.db import async_crud
+from app.db.async_database import get_async_db
+from app.agents.response_cache import get_agent_response_cache
+from app.agents.runner import load_user_profile, load_data_version, agent_input, response_cache_key, run_agent
+from app.agents.jobs import get_job_workers, new_job_id
+from app.agents.memory import conversation_stats, load_history, remember_exchange, remember_exchanges, resolve_history, with_history
 
 router = APIRouter()
 
+
+def _too_many_requests(e: SchedulerFull) -> HTTPException:
+    """429 telling the client when to retry."""
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/agents/{agent_name}/invoke", response_model=AgentResponse)
 async def invoke_agent(
     agent_name: str,
-    request: AgentRequest
+    request: AgentRequest,
+    db: AsyncSession = Depends(get_async_db)
 ) -> AgentResponse:
     """
     Invoke a specific LangGraph agent.
@@ -20,31 +51,28 @@ async def invoke_agent(
     Args:
         agent_name: Name of the agent to invoke
         request: Input data for the agent
+        db: The request's database session
         
     Returns:
         AgentResponse: Response from the agent
     """
     try:
         agent = get_agent(agent_name)
-        user_id = request.user_id
-        user_profile = crud.get_user_profile(user_id)
-        if not user_profile:
-            default_profile = UserProfileBase(id=user_id)
-            user_profile = crud.create_user_profile(default_profile)
-            output = await agent.invoke(request.input)
-        else:
-            extended_prompt = user_profile.preferences + request.input
-        
-        return AgentResponse(
-            agent_name=agent_name,
-            output=output,
-            metadata=request.config
-        )
+        user_profile = await load_user_profile(db, request.user_id)
+        cache_key = response_cache_key(agent, request, await load_data_version(db, request.user_id))
+        request = await resolve_history(db, request)
+        # Return the connection to the pool before queueing for a slot and running the LLM
+        await db.close()
+        response = await run_agent(agent, request, user_profile, cache_key)
+        await remember_exchange(request, response.output)
+        return response
     except KeyError as e:
         raise HTTPException(
             status_code=404,
             detail=str(e)
         )
+    except SchedulerFull as e:
+        raise _too_many_requests(e)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -52,6 +80,253 @@ async def invoke_agent(
         )
 
 
+@router.post("/agents/{agent_name}/batch", response_model=AgentBatchResponse)
+async def batch_invoke_agent(
+    agent_name: str,
+    items: List[Dict[str, Any]],
+    concurrency: Optional[int] = Query(default=None, ge=1, description="Items in flight at once (capped by the scheduler's concurrency)"),
+    db: AsyncSession = Depends(get_async_db)
+) -> AgentBatchResponse:
+    """
+    Invoke an agent over many inputs concurrently, e.g. a daily summary for every user.
+    Profiles are loaded once per distinct user; each item is validated, cached and
+    scheduled on its own, so one failure is reported instead of failing the batch.
+    
+    Args:
+        agent_name: Name of the agent to invoke
+        items: AgentRequest items
+        concurrency: Maximum items running at once
+        db: The request's database session
+        
+    Returns:
+        AgentBatchResponse: Responses in request order and per-item errors
+    """
+    try:
+        agent = get_agent(agent_name)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    settings = get_settings()
+    if len(items) > settings.agent_batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can have at most {settings.agent_batch_max_items} items"
+        )
+    
+    results: List[Optional[AgentResponse]] = [None] * len(items)
+    errors: Dict[int, str] = {}
+    requests: Dict[int, AgentRequest] = {}
+    for index, item in enumerate(items):
+        try:
+            requests[index] = AgentRequest.model_validate(item)
+        except ValidationError as e:
+            errors[index] = str(e)
+    
+    # Sessions are not safe for concurrent use: resolve every profile before fanning out
+    user_ids = {request.user_id for request in requests.values()}
+    profiles = await async_crud.get_user_profiles(db, user_ids)
+    for user_id in user_ids - profiles.keys():
+        profiles[user_id] = await load_user_profile(db, user_id)
+    data_versions = await async_crud.get_data_versions(db, user_ids)
+    cache_keys = {
+        index: response_cache_key(agent, request, data_versions.get(request.user_id, 0))
+        for index, request in requests.items()
+    }
+    histories = {
+        user_id: await load_history(db, user_id)
+        for user_id in {request.user_id for request in requests.values() if not request.history}
+    }
+    requests = {
+        index: with_history(request, histories.get(request.user_id, []))
+        for index, request in requests.items()
+    }
+    # Return the connection to the pool before queueing for slots and running the LLM
+    await db.close()
+    
+    semaphore = asyncio.Semaphore(min(concurrency or settings.agent_batch_concurrency, settings.agent_max_concurrency))
+    
+    async def run_item(index: int, request: AgentRequest) -> None:
+        async with semaphore:
+            try:
+                results[index] = await run_agent(agent, request, profiles[request.user_id], cache_keys[index])
+            except SchedulerFull as e:
+                errors[index] = str(e)
+            except Exception as e:
+                errors[index] = f"Error invoking agent: {str(e)}"
+    
+    await asyncio.gather(*(run_item(index, request) for index, request in requests.items()))
+    # Items of the same user all saw the same history; they are remembered in request order
+    await remember_exchanges([
+        (request, results[index].output) for index, request in requests.items() if results[index] is not None
+    ])
+    return AgentBatchResponse(
+        results=results,
+        errors=[BulkItemError(index=index, error=error) for index, error in sorted(errors.items())]
+    )
+
+
+@router.post("/agents/{agent_name}/stream")
+async def stream_agent(
+    agent_name: str,
+    request: AgentRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> StreamingResponse:
+    """
+    Invoke an agent and stream its progress as server-sent events.
+    Emits "node" events as graph nodes finish, "token" events as the LLM
+    produces tokens, then one "output" event (or an "error" event).
+    
+    Args:
+        agent_name: Name of the agent to invoke
+        request: Input data for the agent
+        db: The request's database session
+        
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+    try:
+        agent = get_agent(agent_name)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    user_profile = await load_user_profile(db, request.user_id)
+    cache_key = response_cache_key(agent, request, await load_data_version(db, request.user_id))
+    request = await resolve_history(db, request)
+    # The stream outlives the request's session dependency; release its connection now
+    await db.close()
+    cached = get_agent_response_cache().get(agent_name, cache_key) if cache_key is not None else None
+    
+    slot = None
+    if cached is None:
+        # Admit before the response starts so a full queue can still answer 429
+        try:
+            slot = await get_scheduler().acquire(request.user_id)
+        except SchedulerFull as e:
+            raise _too_many_requests(e)
+    
+    async def events() -> AsyncIterator[str]:
+        if cached is not None:
+            await remember_exchange(request, cached)
+            yield _sse("output", {"output": cached, "cached": True})
+            return
+        try:
+            async for event in agent.stream(agent_input(request, user_profile)):
+                if event["event"] == "output":
+                    if cache_key is not None:
+                        get_agent_response_cache().set(cache_key, event["data"].get("output", ""))
+                    await remember_exchange(request, event["data"].get("output", ""))
+                yield _sse(event["event"], event["data"])
+        except Exception as e:
+            yield _sse("error", {"detail": f"Error invoking agent: {str(e)}"})
+        finally:
+            slot.release()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also release if the stream is never iterated (client gone before the first byte)
+        background=BackgroundTask(slot.release) if slot is not None else None
+    )
+
+
+@router.post("/agents/{agent_name}/jobs", response_model=AgentJobStatus, status_code=202)
+async def submit_agent_job(
+    agent_name: str,
+    request: AgentJobRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> AgentJobStatus:
+    """
+    Queue an agent invocation and return at once, for callers that cannot wait.
+    Poll /api/agents/jobs/{id} or pass callback_url to be notified.
+    
+    Args:
+        agent_name: Name of the agent to invoke
+        request: Input data for the agent, plus an optional callback URL
+        db: The request's database session
+        
+    Returns:
+        AgentJobStatus: The queued job
+    """
+    try:
+        get_agent(agent_name)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    # The job row references the user's profile
+    await load_user_profile(db, request.user_id)
+    job = await async_crud.create_agent_job(
+        db,
+        new_job_id(),
+        agent_name,
+        request.model_dump(mode="json", exclude={"callback_url"}),
+        str(request.callback_url) if request.callback_url else None
+    )
+    if job is None:
+        raise HTTPException(status_code=500, detail="Failed to queue agent job")
+    get_job_workers().notify()
+    return job.model_dump()
+
+
+@router.get("/agents/jobs/{job_id}", response_model=AgentJobStatus)
+async def get_agent_job(job_id: str, db: AsyncSession = Depends(get_async_db)) -> AgentJobStatus:
+    """
+    Get the status and, once finished, the result of an agent job.
+    
+    Args:
+        job_id: ID returned when the job was submitted
+        db: The request's database session
+        
+    Returns:
+        AgentJobStatus: The job
+    """
+    job = await async_crud.get_agent_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Agent job not found")
+    return job.model_dump()
+
+
+@router.get("/agents/memory/{user_id}", response_model=ConversationStats)
+async def get_conversation_memory(user_id: str, db: AsyncSession = Depends(get_async_db)) -> ConversationStats:
+    """
+    Get the size of a user's server-side conversation history.
+    
+    Args:
+        user_id: Telegram ID of the user
+        db: The request's database session
+        
+    Returns:
+        ConversationStats: Turn and estimated token counts
+    """
+    conversation = await async_crud.get_conversation(db, user_id)
+    if conversation is None:
+        raise HTTPException(status_code=500, detail="Failed to read conversation memory")
+    return conversation_stats(conversation)
+
+
+@router.delete("/agents/memory/{user_id}", response_model=bool)
+async def clear_conversation_memory(user_id: str, db: AsyncSession = Depends(get_async_db)) -> bool:
+    """
+    Forget a user's server-side conversation history.
+    
+    Args:
+        user_id: Telegram ID of the user
+        db: The request's database session
+        
+    Returns:
+        True once the history is deleted
+    """
+    if not await async_crud.delete_conversation(db, user_id):
+        raise HTTPException(status_code=500, detail="Failed to delete conversation memory")
+    return True
+
+
 @router.get("/agents", response_model=List[str])
 async def list_agents() -> List[str]:
     """
@@ -1,38 +1,83 @@
-from typing import List
-from fastapi import APIRouter, HTTPException
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api.bulk import bulk_create
+from app.api.listing import page_response
 from app.db import crud
+from app.db.database import get_db
 from app.db.models import Expense
+from app.db.pagination import decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.db.queries import EXPENSE_SUMMARY_GROUPS
+from app.models.schemas import ExpensePage, ExpenseSummaryRow, BulkCreateResponse
 
 router = APIRouter(
     prefix="/expense",
     tags=["expense"]
 )
 
-@router.get("/", response_model=List[Expense])
-def list_expenses():
-    expenses = crud.list_expenses()
-    if expenses is None:
-        raise HTTPException(status_code=500, detail="Failed to fetch expenses")
-    return expenses
+@router.get("/", response_model=ExpensePage)
+def list_expenses(
+    user_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    unbounded: bool = Query(default=False, description="Return every matching expense in one response, ignoring limit and cursor"),
+    db: Session = Depends(get_db)
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if unbounded:
+        return page_response(crud.list_expense_rows(
+            db, user_id, category=category, type=type, created_from=created_from, created_to=created_to
+        ))
+    
+    # Fetch one extra row to know whether there is a next page
+    return page_response(crud.list_expense_rows(db, user_id, limit + 1, after, category, type, created_from, created_to), limit)
     
 
+@router.get("/summary", response_model=List[ExpenseSummaryRow])
+def summarize_expenses(
+    user_id: str,
+    group_by: str = Query(default="month,category", description="Comma-separated subset of month, category, type"),
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    groups = list(dict.fromkeys(group.strip() for group in group_by.split(",") if group.strip()))
+    invalid = [group for group in groups if group not in EXPENSE_SUMMARY_GROUPS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by fields: {', '.join(invalid)}")
+    return crud.summarize_expenses(db, user_id, groups, month_from, month_to)
+
 @router.get("/{expense_id}", response_model=Expense)
-def get_expense(expense_id: int):
-    expense = crud.get_expense(expense_id)
+def get_expense(expense_id: int, db: Session = Depends(get_db)):
+    expense = crud.get_expense(db, expense_id)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     return expense
 
 @router.post("/", response_model=int)
-def create_expense(expense: Expense):
-    expense_id = crud.create_expense(expense)
+def create_expense(expense: Expense, db: Session = Depends(get_db)):
+    expense_id = crud.create_expense(db, expense)
     if expense_id is None:
         raise HTTPException(status_code=500, detail="Failed to create expense")
     return expense_id
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_expenses(items: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    return bulk_create(items, Expense, partial(crud.bulk_create_expenses, db))
+
 @router.put("/{expense_id}", response_model=bool)
-def update_expense(expense_id: int, update_data: dict):
-    updated = crud.update_expense(expense_id, update_data)
+def update_expense(expense_id: int, update_data: dict, db: Session = Depends(get_db)):
+    updated = crud.update_expense(db, expense_id, update_data)
     if not updated:
         raise HTTPException(status_code=404, detail="Expense not found or update failed")
     return updated
@@ -1,38 +1,66 @@
-from typing import List
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import Task, TaskCreate, TaskUpdate
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.models.schemas import Task, TaskCreate, TaskUpdate, TaskPage, BulkCreateResponse
+from app.api.bulk import bulk_create
+from app.api.listing import page_response
 from app.db import crud
+from app.db.database import get_db
+from app.db.pagination import decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     prefix="/todo",
     tags=["todo", "task"]
 )
 
-@router.get("/", response_model=List[Task])
-def list_tasks(user_id: str):
-    tasks = crud.list_tasks(user_id)
-    if not tasks:
-        raise HTTPException(status_code=404, detail="No tasks found")
-    return tasks
+@router.get("/", response_model=TaskPage)
+def list_tasks(
+    user_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    unbounded: bool = Query(default=False, description="Return every matching task in one response, ignoring limit and cursor"),
+    db: Session = Depends(get_db)
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if unbounded:
+        return page_response(crud.list_task_rows(
+            db, user_id, status=status, created_from=created_from, created_to=created_to
+        ))
+    
+    # Fetch one extra row to know whether there is a next page
+    return page_response(crud.list_task_rows(db, user_id, limit + 1, after, status, created_from, created_to), limit)
 
 @router.get("/{task_id}", response_model=Task)
-def read_task(task_id: int):
-    task = crud.get_task(task_id)
+def read_task(task_id: int, db: Session = Depends(get_db)):
+    task = crud.get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.post("/", response_model=int)
-def create_task(task: TaskCreate):
-    task_id = crud.create_task(task)
+def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+    task_id = crud.create_task(db, task)
     task_id = 1
     if task_id is None:
         raise HTTPException(status_code=500, detail="Failed to create task")
     return task_id
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_tasks(items: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    return bulk_create(items, TaskCreate, partial(crud.bulk_create_tasks, db))
+
 @router.put("/{task_id}", response_model=bool)
-def update_task(task_id: int, task_update: TaskUpdate):
-    updated = crud.update_task(task_id, task_update)
+def update_task(task_id: int, task_update: TaskUpdate, db: Session = Depends(get_db)):
+    updated = crud.update_task(db, task_id, task_update)
     if not updated:
         raise HTTPException(status_code=404, detail="Task not found or update failed")
     return updated
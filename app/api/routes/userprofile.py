@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 from app.models.schemas import UserProfile, UserProfileCreate, UserProfileUpdate
 from app.db import crud
+from app.db.database import get_db
 
 router = APIRouter(
     prefix="/userprofile",
@@ -8,29 +12,39 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=list[UserProfile])
-def list_user_profiles():
-    profiles = crud.list_user_profiles()
+def list_user_profiles(
+    preferences: Optional[str] = Query(default=None, description='JSON object the preferences must contain, e.g. {"language": "es"}'),
+    db: Session = Depends(get_db)
+):
+    try:
+        preference_filter = json.loads(preferences) if preferences else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="preferences must be a JSON object")
+    if preference_filter is not None and not isinstance(preference_filter, dict):
+        raise HTTPException(status_code=400, detail="preferences must be a JSON object")
+    
+    profiles = crud.list_user_profiles(db, preference_filter)
     if not profiles:
         raise HTTPException(status_code=404, detail="No user profiles found")
     return profiles
 
 @router.get("/{user_id}", response_model=UserProfile)
-def read_user_profile(user_id: int):
-    profile = crud.get_user_profile(user_id)
+def read_user_profile(user_id: str, db: Session = Depends(get_db)):
+    profile = crud.get_user_profile(db, user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
     return profile
 
 @router.post("/", response_model=int)
-def create_user_profile(profile: UserProfileCreate):
-    user_id = crud.create_user_profile(profile)
+def create_user_profile(profile: UserProfileCreate, db: Session = Depends(get_db)):
+    user_id = crud.create_user_profile(db, profile)
     if user_id is None:
         raise HTTPException(status_code=500, detail="Failed to create user profile")
     return user_id
 
 @router.put("/{user_id}", response_model=bool)
-def update_user_profile(user_id: int, profile_update: UserProfileUpdate):
-    updated = crud.update_user_profile(user_id, profile_update.dict(exclude_unset=True))
+def update_user_profile(user_id: str, profile_update: UserProfileUpdate, db: Session = Depends(get_db)):
+    updated = crud.update_user_profile(db, user_id, profile_update.dict(exclude_unset=True))
     if not updated:
         raise HTTPException(status_code=404, detail="User profile not found or update failed")
     return updated
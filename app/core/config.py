@@ -1,8 +1,9 @@
 """
 Application configuration.
 """
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +14,10 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     debug: bool = True
     
+    # Logging (JSON lines on stdout, written by a background thread)
+    log_level: str = "INFO"
+    log_levels: str = ""  # Per-logger overrides, e.g. "app.db=WARNING,app.agents.jobs=DEBUG"
+    
     # LangGraph/LLM Settings
     openai_api_key: Optional[str] = None
     langchain_api_key: Optional[str] = None
@@ -21,6 +26,28 @@ class Settings(BaseSettings):
     # Agent Settings
     default_model: str = "gpt-4.1-nano"
     default_temperature: float = 0.5
+    # "lazy" compiles each agent's graph on first use; "warmup" compiles all of them
+    # in parallel at startup and pre-connects the DB pools and LLM clients
+    agent_build_mode: Literal["lazy", "warmup"] = "lazy"
+    
+    # Agent Scheduling (admission control; excess requests get 429 with Retry-After)
+    agent_max_concurrency: int = 8
+    agent_max_queue: int = 64
+    agent_max_queue_per_user: int = 4
+    agent_batch_concurrency: int = 4  # Default items in flight per batch request
+    agent_batch_max_items: int = 500
+    
+    # Agent Jobs (background invocations stored in agent_jobs, run by in-process workers)
+    agent_job_workers: int = 2  # 0 disables the workers in this process
+    agent_job_poll_seconds: float = 2.0
+    agent_job_lease_seconds: float = 600.0  # Running jobs older than this are assumed abandoned
+    agent_job_max_attempts: int = 3
+    agent_job_callback_timeout_seconds: float = 10.0
+    
+    # Conversation Memory (server-side history for requests that send none)
+    conversation_token_budget: int = 2000  # Estimated tokens of summary plus recent turns; 0 disables the memory
+    conversation_summary_tokens: int = 500  # Part of the budget reserved for the rolling summary of older turns
+    conversation_min_recent_turns: int = 4  # Newest turns always kept verbatim, even over budget
     
     # Database Settings (required from .env file)
     db_host: str
@@ -29,16 +56,48 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
     
+    # Connection Pool Settings (shared by the sync and async engines)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 disables the server-side statement timeout
+    
+    # Query Instrumentation
+    db_slow_query_ms: int = 500  # Log statements slower than this; 0 disables the slow-query log
+    db_repeated_query_threshold: int = 5  # In debug mode, warn when a request runs one statement shape this often
+    
+    # Cache Settings
+    profile_cache_size: int = 1024
+    profile_cache_ttl_seconds: float = 300.0
+    agent_cache_size: int = 512  # Only agents with cacheable = True use it
+    agent_cache_ttl_seconds: float = 600.0
+    
     @property
     def database_url(self) -> str:
         """Build database URL from individual components."""
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
+    @property
+    def async_database_url(self) -> str:
+        """Build asyncpg database URL from individual components."""
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading the environment on first call.
+    Deferred so importing the app does not require a complete .env.
+    
+    Returns:
+        Settings: The shared settings instance
+    """
+    return Settings()
 
@@ -1,15 +1,17 @@
 """
 FastAPI dependencies.
 """
-from typing import Dict, List
-from app.agents.base import BaseAgent
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from app.agents.base import BaseAgent
 
 
 # Registry to store all available agents
-_agent_registry: Dict[str, BaseAgent] = {}
+_agent_registry: Dict[str, "BaseAgent"] = {}
 
 
-def register_agent(agent: BaseAgent) -> None:
+def register_agent(agent: "BaseAgent") -> None:
     """
     Register an agent in the registry.
     
@@ -19,7 +21,7 @@ def register_agent(agent: BaseAgent) -> None:
     _agent_registry[agent.name] = agent
 
 
-def get_agent(agent_name: str) -> BaseAgent:
+def get_agent(agent_name: str) -> "BaseAgent":
     """
     Get an agent from the registry.
     
@@ -37,7 +39,7 @@ def get_agent(agent_name: str) -> BaseAgent:
     return _agent_registry[agent_name]
 
 
-def list_all_agents() -> Dict[str, BaseAgent]:
+def list_all_agents() -> Dict[str, "BaseAgent"]:
     """
     Get all registered agents.
     
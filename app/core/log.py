@@ -0,0 +1,202 @@
+"""
+Structured, non-blocking logging.
+
+Records are put on an unbounded queue by a QueueHandler and written as one
+JSON object per line by a background QueueListener thread, so logging on
+the request path never waits for stdout. Each record carries the request
+ID and user ID bound to the current request (see RequestContextMiddleware
+and bind_log_context) plus any fields passed with extra={...}.
+"""
+import json
+import logging
+import queue
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import get_settings
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+_listener: Optional[QueueListener] = None
+
+
+def bind_log_context(**fields: Any) -> None:
+    """
+    Add fields (e.g. user_id) to every record logged for the rest of the current request.
+
+    Args:
+        fields: Field names and values
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that adds the request context while still on the logging
+    thread (context variables are not visible to the listener thread) and
+    leaves formatting to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.__dict__.update((key, value) for key, value in _log_context.get().items() if key not in record.__dict__)
+        # Resolve arguments and tracebacks now: they may not be picklable or thread-safe later
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_log_levels(value: str) -> Dict[str, str]:
+    """
+    Parse per-module levels in the form "app.db=WARNING,app.agents.jobs=DEBUG".
+
+    Args:
+        value: Comma-separated logger=level pairs
+
+    Returns:
+        Dictionary of logger name to level name
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown level
+    """
+    levels = {}
+    for pair in filter(None, (part.strip() for part in value.split(","))):
+        name, _, level = pair.partition("=")
+        level = level.strip().upper()
+        if not name.strip() or not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Invalid log level setting: {pair!r}")
+        levels[name.strip()] = level
+    return levels
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through the queue to a JSON writer thread on stdout,
+    with the root level from settings.log_level and per-logger overrides from
+    settings.log_levels. Safe to call more than once.
+    """
+    global _listener
+    settings = get_settings()
+    if _listener is not None:
+        _listener.stop()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    writer = logging.StreamHandler(sys.stdout)
+    writer.setFormatter(JsonFormatter())
+    _listener = QueueListener(log_queue, writer, respect_handler_level=False)
+
+    root = logging.getLogger()
+    root.handlers = [ContextQueueHandler(log_queue)]
+    root.setLevel(settings.log_level.upper())
+    for name, level in parse_log_levels(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level)
+    # Uvicorn's access log is replaced by the request records below
+    logging.getLogger("uvicorn.access").disabled = True
+    for name in ("uvicorn", "uvicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+request_logger = logging.getLogger("app.request")
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that assigns each request an ID (the X-Request-ID header
+    if the client sent one), binds it and any user_id query parameter to the
+    log context, returns it in the X-Request-ID response header, and logs one
+    record per request with its status, duration and user.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        context = {"request_id": request_id}
+        user_id = _query_user_id(scope)
+        if user_id:
+            context["user_id"] = user_id
+        token = _log_context.set(context)
+        status = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            # Path parameters are only known once the router has matched the request
+            user_id = scope.get("path_params", {}).get("user_id") or _log_context.get().get("user_id")
+            fields: Dict[str, Any] = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+            }
+            if user_id:
+                fields["user_id"] = user_id
+            queries = scope.get("state", {}).get("query_stats")
+            if queries is not None:
+                fields["db_queries"] = queries.count
+                fields["db_ms"] = round(queries.total_seconds * 1000, 3)
+                if queries.count:
+                    fields["db_slowest_ms"] = round(queries.slowest_seconds * 1000, 3)
+                    fields["db_slowest_statement"] = " ".join(queries.slowest_statement.split())[:1000]
+            request_logger.info("%s %s %s", scope["method"], scope["path"], status, extra=fields)
+            _log_context.reset(token)
+
+
+def _query_user_id(scope: Scope) -> Optional[str]:
+    """Get the user_id query parameter, if any."""
+    values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("user_id")
+    return values[0] if values else None
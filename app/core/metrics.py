@@ -0,0 +1,180 @@
+"""
+Prometheus metrics: per-route HTTP latency, status codes and in-flight
+requests, SQL statements per request, agent run times, and the pool, cache
+and scheduler statistics already reported under /health.
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, Tuple
+from prometheus_client import Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from starlette.routing import Match
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import get_settings
+from app.core.dependencies import get_agent_names
+from app.db.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+# Agent calls take seconds, so extend the default buckets upwards
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is fully sent",
+    ["method", "route", "status", "agent"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method", "route", "agent"]
+)
+AGENT_RUN_SECONDS = Histogram(
+    "agent_run_duration_seconds",
+    "Time spent inside agent.invoke (graph and LLM), excluding scheduler queueing",
+    ["agent", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements run while handling a request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_query_duration_seconds_per_request",
+    "Total time spent executing SQL while handling a request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+DB_SLOWEST_SECONDS_PER_REQUEST = Histogram(
+    "db_slowest_query_duration_seconds_per_request",
+    "Time of the slowest SQL statement run while handling a request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+
+
+def _match_route(app: Any, scope: Scope) -> Tuple[str, Dict[str, Any]]:
+    """Find the route template and path parameters for a request, e.g. /api/agents/{agent_name}/invoke."""
+    for route in getattr(app, "routes", []):
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route.path, child_scope.get("path_params", {})
+    # Unmatched paths share one label so arbitrary URLs cannot explode cardinality
+    return "unmatched", {}
+
+
+def _server_timing(stats: QueryStats) -> str:
+    """Server-Timing header value with the database time so far, shown in browser dev tools."""
+    return f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+def _warn_repeated_queries(method: str, path: str, stats: QueryStats) -> None:
+    """Log a warning for each statement shape a request ran suspiciously often (likely N+1 lazy loads)."""
+    for shape, count in stats.repeated(get_settings().db_repeated_query_threshold):
+        logger.warning(
+            "%s %s ran the same statement %d times (possible N+1)", method, path, count,
+            extra={"statement": shape[:300], "executions": count}
+        )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, in-flight count and SQL
+    statements per route. Labels use the route template, not the raw path,
+    plus the agent name on agent routes. In debug mode responses carry a
+    Server-Timing header with the database time, and requests that repeat
+    a statement shape are reported.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route, path_params = _match_route(scope["app"], scope)
+        method, agent = scope["method"], path_params.get("agent_name", "")
+        if agent and agent not in get_agent_names():
+            agent = "unknown"
+        status = 500
+        debug = get_settings().debug
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if debug:
+                    MutableHeaders(scope=message).append("Server-Timing", _server_timing(queries))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route, agent)
+        in_progress.inc()
+        start = time.perf_counter()
+        with track_queries() as queries:
+            # Read by RequestContextMiddleware for the request log record
+            scope.setdefault("state", {})["query_stats"] = queries
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                HTTP_REQUEST_SECONDS.labels(method, route, str(status), agent).observe(time.perf_counter() - start)
+                in_progress.dec()
+                DB_QUERIES_PER_REQUEST.labels(method, route).observe(queries.count)
+                DB_SECONDS_PER_REQUEST.labels(method, route).observe(queries.total_seconds)
+                if queries.count:
+                    DB_SLOWEST_SECONDS_PER_REQUEST.labels(method, route).observe(queries.slowest_seconds)
+                if debug:
+                    _warn_repeated_queries(method, scope["path"], queries)
+
+
+class HealthStatsCollector:
+    """
+    Exposes the numeric values of the /health statistics as gauges, read at
+    scrape time, e.g. app_db_pool_checked_out{source="sync"}.
+    """
+
+    def __init__(self, sources: Dict[str, Callable[[], Dict[str, Dict[str, Any]]]]):
+        """
+        Args:
+            sources: Metric prefix -> callable returning stats dictionaries keyed by source label
+        """
+        self.sources = sources
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        # Without describe() the registry calls collect() on register, which
+        # would create the database engines while app.main is being imported
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        for prefix, read in self.sources.items():
+            try:
+                stats = read()
+            except Exception as e:
+                logger.warning("Error collecting %s metrics: %s: %s", prefix, type(e).__name__,
+                               str(e).splitlines()[0] if str(e) else "")
+                continue
+            families: Dict[str, GaugeMetricFamily] = {}
+            for source, values in stats.items():
+                for key, value in values.items():
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        continue
+                    name = f"app_{prefix}_{key}"
+                    if name not in families:
+                        families[name] = GaugeMetricFamily(name, f"{key} from /health ({prefix})", labels=["source"])
+                    families[name].add_metric([source], value)
+            yield from families.values()
+
+
+def register_health_stats(sources: Dict[str, Callable[[], Dict[str, Dict[str, Any]]]]) -> None:
+    """
+    Register the /health statistics with the default Prometheus registry.
+
+    Args:
+        sources: Metric prefix -> callable returning stats dictionaries keyed by source label
+    """
+    REGISTRY.register(HealthStatsCollector(sources))
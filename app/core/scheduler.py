@@ -0,0 +1,210 @@
+"""
+Admission control and per-user fair scheduling for agent invocations.
+Caps how many agents run at once; requests over the cap wait in per-user
+queues that are served round-robin, so one busy user cannot starve the rest.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict
+from app.core.config import get_settings
+
+
+class SchedulerFull(Exception):
+    """Raised when a request cannot be queued; maps to HTTP 429."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class SchedulerSlot:
+    """A granted run slot. release() is idempotent."""
+
+    def __init__(self, scheduler: "AgentScheduler"):
+        self._scheduler = scheduler
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        """Give the slot back and start the next queued request."""
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._release(time.perf_counter() - self._started)
+
+
+class AgentScheduler:
+    """
+    Global concurrency cap with bounded per-user FIFO queues served round-robin.
+    Not thread-safe: use it from the event loop only.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, max_queue_per_user: int):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Agent invocations allowed to run at once
+            max_queue: Requests allowed to wait across all users
+            max_queue_per_user: Requests allowed to wait for a single user
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.running = 0
+        self.queued = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._rotation: Deque[str] = deque()  # Users with waiting requests, in serving order
+        self.admitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average run time and the queue ahead."""
+        average_run = self.total_run / self.completed if self.completed else 1.0
+        return max(1, math.ceil(average_run * (self.queued + 1) / self.max_concurrency))
+
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        raise SchedulerFull(reason, self._retry_after())
+
+    def _admit(self, wait: float) -> SchedulerSlot:
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return SchedulerSlot(self)
+
+    async def acquire(self, user_id: str) -> SchedulerSlot:
+        """
+        Wait for a run slot.
+
+        Args:
+            user_id: Telegram ID of the user the invocation is for
+
+        Returns:
+            SchedulerSlot: Release it when the invocation finishes
+
+        Raises:
+            SchedulerFull: If the global or the user's queue is full
+        """
+        if self.running < self.max_concurrency and not self.queued:
+            self.running += 1
+            return self._admit(0.0)
+        if self.queued >= self.max_queue:
+            self._reject("Agent queue is full")
+        user_queue = self._queues.get(user_id)
+        if user_queue is not None and len(user_queue) >= self.max_queue_per_user:
+            self._reject("Too many queued agent requests for this user")
+
+        future = asyncio.get_running_loop().create_future()
+        if user_queue is None:
+            user_queue = self._queues[user_id] = deque()
+            self._rotation.append(user_id)
+        user_queue.append(future)
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot after the caller gave up: pass it on
+                self._release(0.0, completed=False)
+            else:
+                self._remove(user_id, future)
+            raise
+        return self._admit(time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def slot(self, user_id: str) -> AsyncIterator[None]:
+        """
+        Hold a run slot for the duration of the block.
+
+        Args:
+            user_id: Telegram ID of the user the invocation is for
+
+        Raises:
+            SchedulerFull: If the global or the user's queue is full
+        """
+        slot = await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            slot.release()
+
+    def _remove(self, user_id: str, future: asyncio.Future) -> None:
+        """Drop a cancelled waiter from its queue."""
+        user_queue = self._queues.get(user_id)
+        if user_queue is None or future not in user_queue:
+            return
+        user_queue.remove(future)
+        self.queued -= 1
+        if not user_queue:
+            del self._queues[user_id]
+            self._rotation.remove(user_id)
+
+    def _release(self, run_seconds: float, completed: bool = True) -> None:
+        """Free a slot and hand free slots to waiting users in round-robin order."""
+        self.running -= 1
+        if completed:
+            self.completed += 1
+            self.total_run += run_seconds
+        while self.running < self.max_concurrency and self._rotation:
+            user_id = self._rotation.popleft()
+            user_queue = self._queues[user_id]
+            future = user_queue.popleft()
+            self.queued -= 1
+            if user_queue:
+                self._rotation.append(user_id)
+            else:
+                del self._queues[user_id]
+            if future.done():
+                # Cancelled before its task could leave the queue: the slot goes to the next waiter
+                continue
+            self.running += 1
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dictionary with running and queued counts, limits, admissions, rejections and wait times
+        """
+        return {
+            "running": self.running,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "max_queue_per_user": self.max_queue_per_user,
+            "users_queued": len(self._queues),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "wait_total_seconds": round(self.total_wait, 6),
+            "wait_avg_seconds": round(self.total_wait / self.admitted, 6) if self.admitted else 0.0,
+            "wait_max_seconds": round(self.max_wait, 6),
+            "run_avg_seconds": round(self.total_run / self.completed, 6) if self.completed else 0.0
+        }
+
+
+@lru_cache
+def get_scheduler() -> AgentScheduler:
+    """
+    Get the agent scheduler, sized from settings on first call.
+
+    Returns:
+        AgentScheduler: The shared scheduler
+    """
+    settings = get_settings()
+    return AgentScheduler(
+        max_concurrency=settings.agent_max_concurrency,
+        max_queue=settings.agent_max_queue,
+        max_queue_per_user=settings.agent_max_queue_per_user
+    )
@@ -2,19 +2,49 @@
 Application startup configuration.
 This module handles initialization tasks like registering agents.
 """
-from app.core.dependencies import register_agent
-# Import agents here as you create them
-# from app.agents.example_agent import ExampleAgent
+import asyncio
+import logging
+import time
+from app.core.config import get_settings
+from app.core.dependencies import register_agent, list_all_agents
+from app.db.database import get_engine
+from app.db.async_database import get_async_engine
+from app.db.pool import prewarm_pool, prewarm_async_pool
+
+logger = logging.getLogger(__name__)
 
 
 def register_all_agents() -> None:
     """
     Register all available agents.
     Add agent registrations here as you create new agents.
+    Import agents inside this function, not at module level, so importing
+    app.main does not pull in LangGraph and LangChain.
     """
     # Example: Register the example agent
+    # from app.agents.example_agent import ExampleAgent
     # example_agent = ExampleAgent()
     # register_agent(example_agent)
     
     pass
 
+
+async def warm_up() -> None:
+    """
+    Compile every registered agent's graph in parallel, pre-connect the sync and
+    async database pools, then let each agent warm its LLM clients.
+    Used when settings.agent_build_mode is "warmup".
+    """
+    settings = get_settings()
+    start = time.perf_counter()
+    agents = list(list_all_agents().values())
+    await asyncio.gather(
+        *(asyncio.to_thread(agent.build) for agent in agents),
+        asyncio.to_thread(prewarm_pool, get_engine(), settings.db_pool_size),
+        prewarm_async_pool(get_async_engine(), settings.db_pool_size)
+    )
+    await asyncio.gather(*(asyncio.to_thread(agent.warm_up) for agent in agents))
+    logger.info(
+        "Warm-up finished in %.3fs", time.perf_counter() - start,
+        extra={"build_seconds": {agent.name: round(agent.build_seconds, 6) for agent in agents}}
+    )
@@ -0,0 +1,856 @@
+"""
+Async CRUD operations using SQLAlchemy's asyncio extension.
+Mirrors app.db.crud for use from async routes without blocking the event loop.
+Every function takes the request's AsyncSession (see app.db.async_database.get_async_db).
+Agent jobs are only run from the event loop, so their functions exist only here.
+"""
+import logging
+from typing import Optional, List, Dict, Any, Set, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB, AgentJobDB, ConversationDB, ConversationTurnDB
+from app.db.models import Task, Expense, UserProfile, AgentJob, Conversation
+from app.db.profile_cache import get_profile_cache
+from app.db.timestamps import local_now, as_local
+from app.db.converters import (
+    user_profile_from_db, task_from_db, expense_from_db, agent_job_from_db, conversation_from_db
+)
+from app.db.conversations import estimate_tokens, fold_into_summary
+from app.db.queries import (
+    tasks_query, expenses_query, expense_rollup_key, expense_rollup_upsert, expense_rollups_upsert,
+    expense_rollup_deltas, expense_summary_query, existing_user_ids_query, tasks_bulk_insert, task_insert_row,
+    expenses_bulk_insert, expense_insert_row, user_profiles_query, data_versions_query, data_versions_bump, claim_agent_job_query, conversation_insert,
+    conversation_lock_query, conversation_turns_query
+)
+from datetime import date, datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Colombia timezone (UTC-5, no daylight saving)
+COLOMBIA_TZ = timezone(timedelta(hours=-5))
+
+
+async def list_tasks(
+    db: AsyncSession,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Task]:
+    """
+    Retrieves Tasks from the database for a specific user, newest first.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of tasks. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        status (str, optional): Only tasks with this status.
+        created_from (datetime, optional): Only tasks created at or after this time.
+        created_to (datetime, optional): Only tasks created before this time.
+
+    Returns:
+        List[Task]: A list of Task objects.
+    """
+    try:
+        # Load the owner once and share it across all tasks
+        profile_db = await db.get(UserProfileDB, user_id)
+        if not profile_db:
+            return []
+        user = user_profile_from_db(profile_db)
+
+        result = await db.execute(tasks_query(user_id, limit, after, status, created_from, created_to))
+        return [task_from_db(task_db, user) for task_db in result.scalars()]
+    except Exception:
+        logger.exception("Error retrieving tasks", extra={"user_id": user_id})
+        return []
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
+    """
+    Retrieves a Task from the database by its ID.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        task_id (int): The ID of the task to retrieve.
+
+    Returns:
+        Task or None: A Task object if found, else None.
+    """
+    try:
+        result = await db.execute(
+            select(TaskDB).options(joinedload(TaskDB.user)).where(TaskDB.id == task_id)
+        )
+        task_db = result.scalars().first()
+        if not task_db:
+            return None
+
+        return task_from_db(task_db, user_profile_from_db(task_db.user))
+    except Exception:
+        logger.exception("Error retrieving task", extra={"task_id": task_id})
+        return None
+
+
+async def update_task(db: AsyncSession, task_id: int, updated_task: Task) -> bool:
+    """
+    Updates a Task in the database by its ID.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        task_id (int): The ID of the task to update.
+        updated_task (Task): A Task object containing new values.
+
+    Returns:
+        bool: True if the update was successful, False otherwise.
+    """
+    try:
+        task_db = await db.get(TaskDB, task_id)
+        if not task_db:
+            logger.warning("Update failed: Task not found.", extra={"task_id": task_id})
+            return False
+
+        task_db.title = updated_task.title
+        task_db.time_to_complete = updated_task.time_to_complete
+        task_db.deadline = updated_task.deadline
+        task_db.status = updated_task.status
+        task_db.solutions = updated_task.solutions
+        task_db.updated_at = local_now()
+
+        await db.execute(data_versions_bump({task_db.user_id}))
+        await db.commit()
+        logger.info("Task with ID %s updated.", task_id, extra={"task_id": task_id})
+        return True
+    except Exception:
+        logger.exception("Error updating task", extra={"task_id": task_id})
+        await db.rollback()
+        return False
+
+
+async def create_task(db: AsyncSession, task: Task) -> Optional[int]:
+    """
+    Inserts a Task into the database.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        task (Task): The Task object to insert.
+
+    Returns:
+        int or None: The new task's ID if successful, else None.
+    """
+    try:
+        task_db = TaskDB(
+            title=task.title,
+            time_to_complete=task.time_to_complete,
+            deadline=task.deadline,
+            status=task.status,
+            solutions=task.solutions or [],
+            user_id=task.user_id,
+            created_at=as_local(getattr(task, "created_at", None)) or local_now(),
+            updated_at=as_local(getattr(task, "updated_at", None)) or local_now()
+        )
+        db.add(task_db)
+        await db.execute(data_versions_bump({task_db.user_id}))
+        await db.commit()
+        logger.info("Task created with ID: %s", task_db.id, extra={"task_id": task_db.id, "user_id": task.user_id})
+        return task_db.id
+    except Exception:
+        logger.exception("Error inserting task", extra={"user_id": task.user_id})
+        await db.rollback()
+        return None
+
+
+async def list_expenses(
+    db: AsyncSession,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Expense]:
+    """
+    Retrieves Expenses from the database for a specific user, newest first.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of expenses. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        category (str, optional): Only expenses in this category.
+        type (str, optional): Only expenses of this type (Personal or Shared).
+        created_from (datetime, optional): Only expenses created at or after this time.
+        created_to (datetime, optional): Only expenses created before this time.
+
+    Returns:
+        List[Expense]: A list of Expense objects.
+    """
+    try:
+        result = await db.execute(
+            expenses_query(user_id, limit, after, category, type, created_from, created_to)
+        )
+        return [expense_from_db(expense_db) for expense_db in result.scalars()]
+    except Exception:
+        logger.exception("Error retrieving expenses", extra={"user_id": user_id})
+        return []
+
+
+async def bulk_create_tasks(db: AsyncSession, tasks: List[Task]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Inserts many Tasks with a single multi-row INSERT ... RETURNING id.
+    Items whose user profile does not exist are reported as failed; the rest
+    are inserted together in one transaction.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        tasks (List[Task]): The Task objects to insert.
+
+    Returns:
+        tuple: The new ID for each task in input order (None where it failed),
+            and error messages keyed by the position of each failed task.
+    """
+    ids: List[Optional[int]] = [None] * len(tasks)
+    errors: Dict[int, str] = {}
+    if not tasks:
+        return ids, errors
+
+    try:
+        result = await db.execute(existing_user_ids_query({item.user_id for item in tasks}))
+        known_users = set(result.scalars())
+        now = local_now()
+        positions, rows = [], []
+        for position, item in enumerate(tasks):
+            if item.user_id in known_users:
+                positions.append(position)
+                rows.append(task_insert_row(item, now))
+            else:
+                errors[position] = f"User profile {item.user_id} not found"
+
+        if rows:
+            result = await db.execute(tasks_bulk_insert(), rows)
+            for position, new_id in zip(positions, result.scalars()):
+                ids[position] = new_id
+            await db.execute(data_versions_bump({row["user_id"] for row in rows}))
+            await db.commit()
+        logger.info("Bulk inserted %d tasks, %d failed.", len(rows), len(errors), extra={"inserted": len(rows), "failed": len(errors)})
+        return ids, errors
+    except Exception as e:
+        logger.exception("Error bulk inserting tasks", extra={"items": len(tasks)})
+        await db.rollback()
+        return [None] * len(tasks), {position: str(e) for position in range(len(tasks))}
+
+
+async def get_expense(db: AsyncSession, expense_id: int) -> Optional[Expense]:
+    """
+    Retrieves an Expense from the database by its ID.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        expense_id (int): The ID of the expense to retrieve.
+
+    Returns:
+        Expense or None: An Expense object if found, else None.
+    """
+    try:
+        expense_db = await db.get(ExpenseDB, expense_id)
+        if not expense_db:
+            return None
+
+        return expense_from_db(expense_db)
+    except Exception:
+        logger.exception("Error retrieving expense", extra={"expense_id": expense_id})
+        return None
+
+
+async def create_expense(db: AsyncSession, expense: Expense) -> Optional[int]:
+    """
+    Inserts an Expense into the database.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        expense (Expense): The Expense object to insert.
+
+    Returns:
+        int or None: The new expense's ID if successful, else None.
+    """
+    try:
+        expense_db = ExpenseDB(
+            description=expense.description,
+            amount=expense.amount,
+            category=expense.category,
+            type=expense.type,
+            user_id=expense.user_id,
+            created_at=as_local(expense.created_at) or local_now(),
+            updated_at=as_local(expense.updated_at) or local_now()
+        )
+        db.add(expense_db)
+        await db.execute(expense_rollup_upsert(expense_rollup_key(expense_db), expense_db.amount, 1))
+        await db.execute(data_versions_bump({expense_db.user_id}))
+        await db.commit()
+        logger.info("Expense created with ID: %s", expense_db.id, extra={"expense_id": expense_db.id, "user_id": expense.user_id})
+        return expense_db.id
+    except Exception:
+        logger.exception("Error inserting expense", extra={"user_id": expense.user_id})
+        await db.rollback()
+        return None
+
+
+async def bulk_create_expenses(db: AsyncSession, expenses: List[Expense]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Inserts many Expenses with a single multi-row INSERT ... RETURNING id.
+    Items whose user profile does not exist are reported as failed; the rest
+    are inserted together in one transaction.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        expenses (List[Expense]): The Expense objects to insert.
+
+    Returns:
+        tuple: The new ID for each expense in input order (None where it failed),
+            and error messages keyed by the position of each failed expense.
+    """
+    ids: List[Optional[int]] = [None] * len(expenses)
+    errors: Dict[int, str] = {}
+    if not expenses:
+        return ids, errors
+
+    try:
+        result = await db.execute(existing_user_ids_query({item.user_id for item in expenses}))
+        known_users = set(result.scalars())
+        now = local_now()
+        positions, rows = [], []
+        for position, item in enumerate(expenses):
+            if item.user_id in known_users:
+                positions.append(position)
+                rows.append(expense_insert_row(item, now))
+            else:
+                errors[position] = f"User profile {item.user_id} not found"
+
+        if rows:
+            result = await db.execute(expenses_bulk_insert(), rows)
+            for position, new_id in zip(positions, result.scalars()):
+                ids[position] = new_id
+            # Keep the monthly rollup current in the same transaction
+            await db.execute(expense_rollups_upsert(expense_rollup_deltas(rows)))
+            await db.execute(data_versions_bump({row["user_id"] for row in rows}))
+            await db.commit()
+        logger.info("Bulk inserted %d expenses, %d failed.", len(rows), len(errors), extra={"inserted": len(rows), "failed": len(errors)})
+        return ids, errors
+    except Exception as e:
+        logger.exception("Error bulk inserting expenses", extra={"items": len(expenses)})
+        await db.rollback()
+        return [None] * len(expenses), {position: str(e) for position in range(len(expenses))}
+
+
+async def update_expense(db: AsyncSession, expense_id: int, update_data: Dict[str, Any]) -> bool:
+    """
+    Updates an Expense in the database.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        expense_id (int): The ID of the expense to update.
+        update_data (dict): The fields to update with their new values.
+
+    Returns:
+        bool: True if update was successful, False otherwise.
+    """
+    try:
+        expense_db = await db.get(ExpenseDB, expense_id)
+        if not expense_db:
+            logger.warning("Expense not found.", extra={"expense_id": expense_id})
+            return False
+
+        old_key, old_amount = expense_rollup_key(expense_db), expense_db.amount
+        for key, value in update_data.items():
+            if hasattr(expense_db, key):
+                setattr(expense_db, key, as_local(value) if isinstance(value, datetime) else value)
+
+        # Move the expense between rollup buckets if its amount or bucket changed
+        new_key = expense_rollup_key(expense_db)
+        if (old_key, old_amount) != (new_key, expense_db.amount):
+            await db.execute(expense_rollup_upsert(old_key, -old_amount, -1))
+            await db.execute(expense_rollup_upsert(new_key, expense_db.amount, 1))
+
+        expense_db.updated_at = local_now()
+        await db.execute(data_versions_bump({old_key[0], new_key[0]}))
+        await db.commit()
+        logger.info("Expense %s updated.", expense_id, extra={"expense_id": expense_id})
+        return True
+    except Exception:
+        logger.exception("Error updating expense", extra={"expense_id": expense_id})
+        await db.rollback()
+        return False
+
+
+async def summarize_expenses(
+    db: AsyncSession,
+    user_id: str,
+    group_by: List[str],
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Summarizes a user's expenses from the rollup table, grouped in SQL.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        group_by (list): Any of "month", "category" and "type".
+        month_from (date, optional): Only months starting at or after this date.
+        month_to (date, optional): Only months starting before this date.
+
+    Returns:
+        List[dict]: One row per bucket with the grouped fields, total and count.
+    """
+    try:
+        result = await db.execute(expense_summary_query(user_id, group_by, month_from, month_to))
+        return [dict(row) for row in result.mappings()]
+    except Exception:
+        logger.exception("Error summarizing expenses", extra={"user_id": user_id})
+        return []
+
+
+async def list_user_profiles(db: AsyncSession, preferences: Optional[Dict[str, Any]] = None) -> List[UserProfile]:
+    """
+    Retrieves all UserProfiles from the database.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        preferences (dict, optional): Only profiles whose preferences contain these key/value pairs.
+
+    Returns:
+        List[UserProfile]: A list of UserProfile objects.
+    """
+    try:
+        result = await db.execute(user_profiles_query(preferences))
+        return [user_profile_from_db(profile) for profile in result.scalars()]
+    except Exception:
+        logger.exception("Error retrieving user profiles")
+        return []
+
+
+async def get_user_profile(db: AsyncSession, user_id: str) -> Optional[UserProfile]:
+    """
+    Retrieves a UserProfile by its ID, served from the profile cache when possible.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+
+    Returns:
+        UserProfile or None: The user profile if found, else None.
+    """
+    cached = get_profile_cache().get(user_id)
+    if cached is not None:
+        return cached
+
+    try:
+        profile_db = await db.get(UserProfileDB, user_id)
+        if not profile_db:
+            return None
+
+        profile = user_profile_from_db(profile_db)
+        get_profile_cache().set(user_id, profile)
+        return profile
+    except Exception:
+        logger.exception("Error retrieving user profile", extra={"user_id": user_id})
+        return None
+
+
+async def get_user_profiles(db: AsyncSession, user_ids: Set[str]) -> Dict[str, UserProfile]:
+    """
+    Retrieves several UserProfiles at once: cached profiles are served from the
+    profile cache and the rest are loaded with a single query.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_ids (set): The Telegram IDs of the users.
+
+    Returns:
+        dict: UserProfile by user ID, for the users that exist.
+    """
+    profiles: Dict[str, UserProfile] = {}
+    for user_id in user_ids:
+        cached = get_profile_cache().get(user_id)
+        if cached is not None:
+            profiles[user_id] = cached
+    missing = set(user_ids) - profiles.keys()
+    if not missing:
+        return profiles
+
+    try:
+        result = await db.execute(user_profiles_query(user_ids=missing))
+        for profile_db in result.scalars():
+            profile = user_profile_from_db(profile_db)
+            get_profile_cache().set(profile.id, profile)
+            profiles[profile.id] = profile
+        return profiles
+    except Exception:
+        logger.exception("Error retrieving user profiles")
+        return profiles
+
+
+async def get_data_versions(db: AsyncSession, user_ids: Set[str]) -> Dict[str, int]:
+    """
+    Retrieves the data versions of several users, always from the database so
+    writes made by other processes are seen. Every write to a user's profile,
+    tasks or expenses bumps the version in the same transaction.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_ids (set): The Telegram IDs of the users.
+
+    Returns:
+        dict: Data version by user ID; users without a profile are left out.
+    """
+    try:
+        result = await db.execute(data_versions_query(set(user_ids)))
+        return {user_id: version for user_id, version in result.all()}
+    except Exception:
+        logger.exception("Error retrieving data versions", extra={"users": len(user_ids)})
+        return {}
+
+
+async def create_user_profile(db: AsyncSession, profile: UserProfile) -> Optional[str]:
+    """
+    Inserts a UserProfile into the database.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        profile (UserProfile): The UserProfile object to insert.
+
+    Returns:
+        str or None: The user's ID if successful, else None.
+    """
+    try:
+        profile_db = UserProfileDB(
+            id=profile.id,
+            name=profile.name,
+            city=profile.city,
+            state=profile.state,
+            country=profile.country,
+            job=profile.job,
+            preferences=profile.preferences,
+            interests=profile.interests or [],
+            supervisor_prompt_override=profile.supervisor_prompt_override,
+            created_at=as_local(profile.created_at) or local_now()
+        )
+        db.add(profile_db)
+        await db.commit()
+        get_profile_cache().invalidate(profile_db.id)
+        logger.info("UserProfile created with ID: %s", profile_db.id, extra={"user_id": profile_db.id})
+        return profile_db.id
+    except Exception:
+        logger.exception("Error inserting user profile", extra={"user_id": profile.id})
+        await db.rollback()
+        return None
+
+
+async def update_user_profile(db: AsyncSession, user_id: str, update_data: Dict[str, Any]) -> bool:
+    """
+    Updates a UserProfile in the database by user ID.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        update_data (dict): The fields to update.
+
+    Returns:
+        bool: True if update was successful, False otherwise.
+    """
+    try:
+        profile_db = await db.get(UserProfileDB, user_id)
+        if not profile_db:
+            logger.warning("UserProfile not found.", extra={"user_id": user_id})
+            return False
+
+        for key, value in update_data.items():
+            if hasattr(profile_db, key):
+                setattr(profile_db, key, value)
+        # Incremented in SQL, so concurrent updates from several processes never share versions
+        profile_db.profile_version = UserProfileDB.profile_version + 1
+        profile_db.data_version = UserProfileDB.data_version + 1
+
+        await db.commit()
+        get_profile_cache().invalidate(user_id)
+        logger.info("UserProfile %s updated.", user_id, extra={"user_id": user_id})
+        return True
+    except Exception:
+        logger.exception("Error updating user profile", extra={"user_id": user_id})
+        await db.rollback()
+        return False
+
+
+async def create_agent_job(
+    db: AsyncSession,
+    job_id: str,
+    agent_name: str,
+    request: Dict[str, Any],
+    callback_url: Optional[str] = None
+) -> Optional[AgentJob]:
+    """
+    Queues an agent job.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        job_id (str): The new job's ID.
+        agent_name (str): The agent to run.
+        request (dict): The AgentRequest to run it with.
+        callback_url (str, optional): URL to POST the job to when it finishes.
+
+    Returns:
+        AgentJob or None: The queued job if successful, else None.
+    """
+    try:
+        job_db = AgentJobDB(
+            id=job_id,
+            agent_name=agent_name,
+            user_id=request["user_id"],
+            request=request,
+            callback_url=callback_url,
+            status="queued",
+            attempts=0,
+            created_at=local_now()
+        )
+        db.add(job_db)
+        await db.commit()
+        logger.info("Agent job %s queued for %s.", job_id, agent_name, extra={"job_id": job_id, "agent_name": agent_name, "user_id": request["user_id"]})
+        return agent_job_from_db(job_db)
+    except Exception:
+        logger.exception("Error queuing agent job", extra={"job_id": job_id, "agent_name": agent_name})
+        await db.rollback()
+        return None
+
+
+async def get_agent_job(db: AsyncSession, job_id: str) -> Optional[AgentJob]:
+    """
+    Retrieves an agent job by its ID.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        job_id (str): The ID of the job.
+
+    Returns:
+        AgentJob or None: The job if found, else None.
+    """
+    try:
+        job_db = await db.get(AgentJobDB, job_id)
+        if not job_db:
+            return None
+        return agent_job_from_db(job_db)
+    except Exception:
+        logger.exception("Error retrieving agent job", extra={"job_id": job_id})
+        return None
+
+
+async def claim_agent_job(db: AsyncSession, lease_seconds: float, max_attempts: int) -> Optional[AgentJob]:
+    """
+    Claims the oldest runnable job and marks it running. Abandoned jobs that
+    already used max_attempts are failed instead of being run again.
+
+    Args:
+        db (AsyncSession): The worker's database session.
+        lease_seconds (float): How long a running job may go unfinished before it is reclaimed.
+        max_attempts (int): How many times a job may be started.
+
+    Returns:
+        AgentJob or None: The claimed job, or None if nothing is runnable.
+    """
+    try:
+        while True:
+            now = local_now()
+            result = await db.execute(claim_agent_job_query(now - timedelta(seconds=lease_seconds)))
+            job_db = result.scalars().first()
+            if not job_db:
+                await db.rollback()
+                return None
+
+            if job_db.attempts >= max_attempts:
+                job_db.status = "failed"
+                job_db.error = f"Abandoned after {job_db.attempts} attempts"
+                job_db.finished_at = now
+                await db.commit()
+                continue
+
+            job_db.status = "running"
+            job_db.attempts += 1
+            job_db.started_at = now
+            await db.commit()
+            return agent_job_from_db(job_db)
+    except Exception:
+        logger.exception("Error claiming agent job")
+        await db.rollback()
+        return None
+
+
+async def finish_agent_job(
+    db: AsyncSession,
+    job_id: str,
+    output: Optional[str] = None,
+    info: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None
+) -> Optional[AgentJob]:
+    """
+    Records a job's result: succeeded with output, or failed with error.
+
+    Args:
+        db (AsyncSession): The worker's database session.
+        job_id (str): The ID of the job.
+        output (str, optional): The agent's output.
+        info (dict, optional): The agent's response metadata.
+        error (str, optional): Why the job failed. Marks the job failed when set.
+
+    Returns:
+        AgentJob or None: The finished job if successful, else None.
+    """
+    try:
+        job_db = await db.get(AgentJobDB, job_id)
+        if not job_db:
+            logger.warning("Agent job not found.", extra={"job_id": job_id})
+            return None
+
+        job_db.status = "failed" if error is not None else "succeeded"
+        job_db.output = output
+        job_db.info = info
+        job_db.error = error
+        job_db.finished_at = local_now()
+        await db.commit()
+        logger.info("Agent job %s %s.", job_id, job_db.status, extra={"job_id": job_id, "status": job_db.status})
+        return agent_job_from_db(job_db)
+    except Exception:
+        logger.exception("Error finishing agent job", extra={"job_id": job_id})
+        await db.rollback()
+        return None
+
+
+async def requeue_agent_job(db: AsyncSession, job_id: str, count_attempt: bool = False) -> bool:
+    """
+    Puts a claimed job back in the queue, e.g. on shutdown or when the scheduler is full.
+
+    Args:
+        db (AsyncSession): The worker's database session.
+        job_id (str): The ID of the job.
+        count_attempt (bool): Whether the interrupted run counts towards max_attempts.
+
+    Returns:
+        bool: True if the job was requeued, False otherwise.
+    """
+    try:
+        job_db = await db.get(AgentJobDB, job_id)
+        if not job_db:
+            return False
+
+        job_db.status = "queued"
+        job_db.started_at = None
+        if not count_attempt:
+            job_db.attempts = max(job_db.attempts - 1, 0)
+        await db.commit()
+        return True
+    except Exception:
+        logger.exception("Error requeuing agent job", extra={"job_id": job_id})
+        await db.rollback()
+        return False
+
+
+async def get_conversation(db: AsyncSession, user_id: str) -> Optional[Conversation]:
+    """
+    Retrieves a user's conversation memory: the rolling summary and the recent turns.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+
+    Returns:
+        Conversation or None: The conversation (empty if nothing was recorded yet), or None on error.
+    """
+    try:
+        conversation_db = await db.get(ConversationDB, user_id)
+        turns_db = (await db.execute(conversation_turns_query(user_id))).scalars().all()
+        return conversation_from_db(user_id, conversation_db, turns_db)
+    except Exception:
+        logger.exception("Error retrieving conversation", extra={"user_id": user_id})
+        return None
+
+
+async def add_conversation_turns(
+    db: AsyncSession,
+    user_id: str,
+    turns: List[Tuple[str, str]],
+    token_budget: int,
+    summary_tokens: int,
+    min_recent_turns: int
+) -> bool:
+    """
+    Appends turns to a user's conversation, then folds the oldest turns into
+    the rolling summary until the recent turns fit the part of the budget the
+    summary does not reserve. The newest min_recent_turns are always kept verbatim.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user. The user profile must exist.
+        turns (list): (role, content) of the new turns, oldest first.
+        token_budget (int): Estimated tokens of summary plus recent turns.
+        summary_tokens (int): Estimated tokens reserved for the summary.
+        min_recent_turns (int): Turns never folded into the summary.
+
+    Returns:
+        bool: True if the turns were recorded, False otherwise.
+    """
+    try:
+        now = local_now()
+        await db.execute(conversation_insert(user_id, now))
+        conversation_db = (await db.execute(conversation_lock_query(user_id))).scalar_one()
+        db.add_all(
+            ConversationTurnDB(user_id=user_id, role=role, content=content, tokens=estimate_tokens(content), created_at=now)
+            for role, content in turns
+        )
+        await db.flush()
+
+        turns_db = (await db.execute(conversation_turns_query(user_id))).scalars().all()
+        turn_tokens = sum(turn_db.tokens for turn_db in turns_db)
+        folded = 0
+        while turn_tokens > token_budget - summary_tokens and len(turns_db) - folded > min_recent_turns:
+            turn_tokens -= turns_db[folded].tokens
+            folded += 1
+        if folded:
+            summary = fold_into_summary(
+                conversation_db.summary, ((turn_db.role, turn_db.content) for turn_db in turns_db[:folded]), summary_tokens
+            )
+            conversation_db.summary = summary
+            conversation_db.summary_tokens = estimate_tokens(summary)
+            conversation_db.summarized_turns += folded
+            await db.execute(delete(ConversationTurnDB).where(
+                ConversationTurnDB.id.in_([turn_db.id for turn_db in turns_db[:folded]])
+            ))
+        conversation_db.updated_at = now
+        await db.commit()
+        return True
+    except Exception:
+        logger.exception("Error recording conversation turns", extra={"user_id": user_id})
+        await db.rollback()
+        return False
+
+
+async def delete_conversation(db: AsyncSession, user_id: str) -> bool:
+    """
+    Forgets a user's conversation memory.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        user_id (str): The Telegram ID of the user.
+
+    Returns:
+        bool: True if the conversation was deleted, False otherwise.
+    """
+    try:
+        await db.execute(delete(ConversationTurnDB).where(ConversationTurnDB.user_id == user_id))
+        await db.execute(delete(ConversationDB).where(ConversationDB.user_id == user_id))
+        await db.commit()
+        return True
+    except Exception:
+        logger.exception("Error deleting conversation", extra={"user_id": user_id})
+        await db.rollback()
+        return False
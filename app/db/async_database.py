@@ -0,0 +1,57 @@
+"""
+Async database connection and session management.
+"""
+from functools import lru_cache
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from app.core.config import get_settings
+from app.db.database import instrument_engine
+from app.db.pool import TimedAsyncAdaptedQueuePool, pool_options
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async SQLAlchemy engine (asyncpg driver), creating it on first call.
+
+    Returns:
+        AsyncEngine: The shared async engine
+    """
+    settings = get_settings()
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=connect_args,
+        **pool_options()
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+@lru_cache
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Get the async session factory, creating it on first call.
+
+    Returns:
+        async_sessionmaker: Factory for sessions bound to the async engine
+    """
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Get async database session (dependency for async FastAPI routes).
+
+    Yields:
+        AsyncSession: Async database session
+    """
+    async with get_async_session_factory()() as db:
+        yield db
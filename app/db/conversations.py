@@ -0,0 +1,48 @@
+"""
+Token accounting and summary folding for the server-side conversation memory.
+Pure functions shared by async_crud (which stores the conversation) and the
+agents (which receive it).
+"""
+from typing import Iterable, List, Tuple
+
+# Characters kept of each turn folded into the summary
+SUMMARY_LINE_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the tokens of a text without loading a tokenizer.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: About one token per four characters, the usual ratio for English and Spanish prose.
+    """
+    return (len(text) + 3) // 4
+
+
+def fold_into_summary(summary: str, turns: Iterable[Tuple[str, str]], max_tokens: int) -> str:
+    """
+    Appends turns to a rolling summary, one clipped "role: message" line each,
+    then drops the oldest lines until the summary fits max_tokens. The result
+    only depends on its arguments, so the same history always gives the same
+    summary.
+
+    Args:
+        summary (str): The current summary.
+        turns (iterable): (role, content) of the turns to fold in, oldest first.
+        max_tokens (int): Estimated token cap of the summary.
+
+    Returns:
+        str: The new summary.
+    """
+    lines: List[str] = summary.splitlines()
+    for role, content in turns:
+        text = " ".join(content.split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+        lines.append(f"{role}: {text}")
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
@@ -0,0 +1,134 @@
+"""
+Conversions from SQLAlchemy ORM rows to Pydantic models.
+Shared by the sync and async CRUD modules.
+"""
+from typing import List, Optional
+from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB, AgentJobDB, ConversationDB, ConversationTurnDB
+from app.db.models import Task, Expense, UserProfile, AgentJob, Conversation, ConversationTurn
+
+
+def user_profile_from_db(profile_db: UserProfileDB) -> UserProfile:
+    """
+    Builds a UserProfile from its ORM row.
+
+    Args:
+        profile_db (UserProfileDB): The user profile row.
+
+    Returns:
+        UserProfile: The user profile model.
+    """
+    return UserProfile(
+        id=profile_db.id,
+        name=profile_db.name,
+        city=profile_db.city,
+        state=profile_db.state,
+        country=profile_db.country,
+        job=profile_db.job,
+        preferences=profile_db.preferences or {},
+        interests=profile_db.interests or [],
+        supervisor_prompt_override=profile_db.supervisor_prompt_override,
+        profile_version=profile_db.profile_version or 0,
+        created_at=profile_db.created_at
+    )
+
+
+def task_from_db(task_db: TaskDB, user: UserProfile) -> Task:
+    """
+    Builds a Task from its ORM row.
+
+    Args:
+        task_db (TaskDB): The task row.
+        user (UserProfile): The owner of the task, already built.
+
+    Returns:
+        Task: The task model.
+    """
+    return Task(
+        id=task_db.id,
+        title=task_db.title,
+        time_to_complete=task_db.time_to_complete,
+        deadline=task_db.deadline,
+        status=task_db.status,
+        solutions=task_db.solutions or [],
+        user_id=task_db.user_id,
+        user=user,
+        created_at=task_db.created_at,
+        updated_at=task_db.updated_at
+    )
+
+
+def expense_from_db(expense_db: ExpenseDB) -> Expense:
+    """
+    Builds an Expense from its ORM row.
+
+    Args:
+        expense_db (ExpenseDB): The expense row.
+
+    Returns:
+        Expense: The expense model.
+    """
+    return Expense(
+        id=expense_db.id,
+        description=expense_db.description,
+        amount=expense_db.amount,
+        category=expense_db.category,
+        type=expense_db.type,
+        user_id=expense_db.user_id,
+        created_at=expense_db.created_at,
+        updated_at=expense_db.updated_at
+    )
+
+
+def agent_job_from_db(job_db: AgentJobDB) -> AgentJob:
+    """
+    Builds an AgentJob from its ORM row.
+
+    Args:
+        job_db (AgentJobDB): The agent job row.
+
+    Returns:
+        AgentJob: The agent job model.
+    """
+    return AgentJob(
+        id=job_db.id,
+        agent_name=job_db.agent_name,
+        user_id=job_db.user_id,
+        request=job_db.request,
+        callback_url=job_db.callback_url,
+        status=job_db.status,
+        output=job_db.output,
+        info=job_db.info,
+        error=job_db.error,
+        attempts=job_db.attempts,
+        created_at=job_db.created_at,
+        started_at=job_db.started_at,
+        finished_at=job_db.finished_at
+    )
+
+
+def conversation_from_db(user_id: str, conversation_db: Optional[ConversationDB], turns_db: List[ConversationTurnDB]) -> Conversation:
+    """
+    Builds a Conversation from its summary row and turn rows.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+        conversation_db (ConversationDB): The summary row, or None if nothing was recorded yet.
+        turns_db (list): The turn rows, oldest first.
+
+    Returns:
+        Conversation: The conversation model.
+    """
+    turns = [
+        ConversationTurn(role=turn_db.role, content=turn_db.content, tokens=turn_db.tokens, created_at=turn_db.created_at)
+        for turn_db in turns_db
+    ]
+    if conversation_db is None:
+        return Conversation(user_id=user_id, turns=turns)
+    return Conversation(
+        user_id=user_id,
+        summary=conversation_db.summary,
+        summary_tokens=conversation_db.summary_tokens,
+        summarized_turns=conversation_db.summarized_turns,
+        turns=turns,
+        updated_at=conversation_db.updated_at
+    )
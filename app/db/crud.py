@@ -1,116 +1,142 @@
 """
 CRUD operations using SQLAlchemy ORM.
+Every function takes the request's Session (see app.db.database.get_db), so one
+HTTP request uses a single connection and transaction.
 """
-from typing import Optional, List, Dict, Any
+import logging
+from typing import Optional, List, Dict, Any, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, exc
-from app.db.database import SessionLocal
+from sqlalchemy import Row, and_, exc
 from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB
 from app.db.models import Task, Expense, UserProfile
-from datetime import datetime, timezone, timedelta
+from app.db.profile_cache import get_profile_cache
+from app.db.converters import user_profile_from_db, task_from_db, expense_from_db
+from app.db.queries import (
+    tasks_query, expenses_query, TASK_LIST_COLUMNS, EXPENSE_LIST_COLUMNS, expense_rollup_key, expense_rollup_upsert, expense_rollups_upsert,
+    expense_rollup_deltas, expense_summary_query, existing_user_ids_query, tasks_bulk_insert, task_insert_row,
+    expenses_bulk_insert, expense_insert_row, user_profiles_query, data_versions_bump
+)
+from datetime import date, datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
 
 # Colombia timezone (UTC-5, no daylight saving)
 COLOMBIA_TZ = timezone(timedelta(hours=-5))
-import json
 
 
-def get_db_session() -> Session:
-    """Get a database session."""
-    return SessionLocal()
+def list_tasks(
+    db: Session,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Task]:
+    """
+    Retrieves Tasks from the database for a specific user, newest first.
 
+    Args:
+        db (Session): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of tasks. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        status (str, optional): Only tasks with this status.
+        created_from (datetime, optional): Only tasks created at or after this time.
+        created_to (datetime, optional): Only tasks created before this time.
 
-def list_tasks(user_id: str) -> List[Task]:
+    Returns:
+        List[Task]: A list of Task objects.
     """
-    Retrieves all Tasks from the database for a specific user.
+    try:
+        # Every task belongs to the same user: load the owner once and share it,
+        # instead of lazy-loading task_db.user for each row (N+1 queries).
+        profile_db = db.query(UserProfileDB).filter(UserProfileDB.id == user_id).first()
+        if not profile_db:
+            return []
+        user = user_profile_from_db(profile_db)
+        
+        tasks_db = db.execute(
+            tasks_query(user_id, limit, after, status, created_from, created_to)
+        ).scalars().all()
+        return [task_from_db(task_db, user) for task_db in tasks_db]
+    except Exception:
+        logger.exception("Error retrieving tasks", extra={"user_id": user_id})
+        return []
+
+
+def list_task_rows(
+    db: Session,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Row]:
+    """
+    Retrieves a user's tasks as plain column tuples, newest first, without
+    building ORM objects or models. Used by the list endpoint's JSON fast path.
 
     Args:
+        db (Session): The request's database session.
         user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of tasks. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        status (str, optional): Only tasks with this status.
+        created_from (datetime, optional): Only tasks created at or after this time.
+        created_to (datetime, optional): Only tasks created before this time.
 
     Returns:
-        List[Task]: A list of Task objects.
+        List[Row]: Rows of TASK_LIST_COLUMNS.
     """
-    db = get_db_session()
     try:
-        tasks_db = db.query(TaskDB).filter(TaskDB.user_id == user_id).all()
-        tasks = []
-        for task_db in tasks_db:
-            tasks.append(Task(
-                title=task_db.title,
-                time_to_complete=task_db.time_to_complete,
-                deadline=task_db.deadline,
-                status=task_db.status,
-                solutions=task_db.solutions or [],
-                user_id=task_db.user_id,
-                user=UserProfile(id=task_db.user.id, name=task_db.user.name, city=task_db.user.city,
-                                state=task_db.user.state, country=task_db.user.country, job=task_db.user.job,
-                                preferences=json.loads(task_db.user.preferences) if task_db.user.preferences else {},
-                                interests=task_db.user.interests or [],
-                                created_at=task_db.user.created_at),
-                created_at=task_db.created_at,
-                updated_at=task_db.updated_at
-            ))
-        return tasks
-    except Exception as e:
-        print(f"Error retrieving tasks: {e}")
+        return db.execute(
+            tasks_query(user_id, limit, after, status, created_from, created_to).with_only_columns(*TASK_LIST_COLUMNS)
+        ).all()
+    except Exception:
+        logger.exception("Error retrieving task rows", extra={"user_id": user_id})
         return []
-    finally:
-        db.close()
 
 
-def get_task(task_id: int) -> Optional[Task]:
+def get_task(db: Session, task_id: int) -> Optional[Task]:
     """
     Retrieves a Task from the database by its ID.
 
     Args:
+        db (Session): The request's database session.
         task_id (int): The ID of the task to retrieve.
 
     Returns:
         Task or None: A Task object if found, else None.
     """
-    db = get_db_session()
     try:
         task_db = db.query(TaskDB).filter(TaskDB.id == task_id).first()
         if not task_db:
             return None
         
-        return Task(
-            title=task_db.title,
-            time_to_complete=task_db.time_to_complete,
-            deadline=task_db.deadline,
-            status=task_db.status,
-            solutions=task_db.solutions or [],
-            user_id=task_db.user_id,
-            user=UserProfile(id=task_db.user.id, name=task_db.user.name, city=task_db.user.city,
-                            state=task_db.user.state, country=task_db.user.country, job=task_db.user.job,
-                            preferences=json.loads(task_db.user.preferences) if task_db.user.preferences else {},
-                            interests=task_db.user.interests or [],
-                            created_at=task_db.user.created_at),
-            created_at=task_db.created_at,
-            updated_at=task_db.updated_at
-        )
-    except Exception as e:
-        print(f"Error retrieving task: {e}")
+        return task_from_db(task_db, user_profile_from_db(task_db.user))
+    except Exception:
+        logger.exception("Error retrieving task", extra={"task_id": task_id})
         return None
-    finally:
-        db.close()
 
 
-def update_task(task_id: int, updated_task: Task) -> bool:
+def update_task(db: Session, task_id: int, updated_task: Task) -> bool:
     """
     Updates a Task in the database by its ID.
 
     Args:
+        db (Session): The request's database session.
         task_id (int): The ID of the task to update.
         updated_task (Task): A Task object containing new values.
 
     Returns:
         bool: True if the update was successful, False otherwise.
     """
-    db = get_db_session()
     try:
         task_db = db.query(TaskDB).filter(TaskDB.id == task_id).first()
         if not task_db:
-            print("Update failed: Task not found.")
+            logger.warning("Update failed: Task not found.", extra={"task_id": task_id})
             return False
         
         task_db.title = updated_task.title
@@ -120,28 +146,27 @@ def update_task(task_id: int, updated_task: Task) -> bool:
         task_db.solutions = updated_task.solutions
         task_db.updated_at = datetime.now(COLOMBIA_TZ)
         
+        db.execute(data_versions_bump({task_db.user_id}))
         db.commit()
-        print(f"Task with ID {task_id} updated.")
+        logger.info("Task with ID %s updated.", task_id, extra={"task_id": task_id})
         return True
-    except Exception as e:
-        print(f"Error updating task: {e}")
+    except Exception:
+        logger.exception("Error updating task", extra={"task_id": task_id})
         db.rollback()
         return False
-    finally:
-        db.close()
 
 
-def create_task(task: Task) -> Optional[int]:
+def create_task(db: Session, task: Task) -> Optional[int]:
     """
     Inserts a Task into the database.
 
     Args:
+        db (Session): The request's database session.
         task (Task): The Task object to insert.
 
     Returns:
         int or None: The new task's ID if successful, else None.
     """
-    db = get_db_session()
     try:
         task_db = TaskDB(
             title=task.title,
@@ -150,65 +175,171 @@ def create_task(task: Task) -> Optional[int]:
             status=task.status,
             solutions=task.solutions or [],
             user_id=task.user_id,
-            created_at=task.created_at or datetime.now(COLOMBIA_TZ),
-            updated_at=task.updated_at or datetime.now(COLOMBIA_TZ)
+            created_at=getattr(task, "created_at", None) or datetime.now(COLOMBIA_TZ),
+            updated_at=getattr(task, "updated_at", None) or datetime.now(COLOMBIA_TZ)
         )
         db.add(task_db)
+        db.execute(data_versions_bump({task_db.user_id}))
         db.commit()
-        db.refresh(task_db)
-        print(f"Task created with ID: {task_db.id}")
+        logger.info("Task created with ID: %s", task_db.id, extra={"task_id": task_db.id, "user_id": task.user_id})
         return task_db.id
-    except Exception as e:
-        print(f"Error inserting task: {e}")
+    except Exception:
+        logger.exception("Error inserting task", extra={"user_id": task.user_id})
         db.rollback()
         return None
-    finally:
-        db.close()
 
 
-def get_expense(expense_id: int) -> Optional[Expense]:
+def list_expenses(
+    db: Session,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Expense]:
+    """
+    Retrieves Expenses from the database for a specific user, newest first.
+
+    Args:
+        db (Session): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of expenses. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        category (str, optional): Only expenses in this category.
+        type (str, optional): Only expenses of this type (Personal or Shared).
+        created_from (datetime, optional): Only expenses created at or after this time.
+        created_to (datetime, optional): Only expenses created before this time.
+
+    Returns:
+        List[Expense]: A list of Expense objects.
+    """
+    try:
+        expenses_db = db.execute(
+            expenses_query(user_id, limit, after, category, type, created_from, created_to)
+        ).scalars().all()
+        return [expense_from_db(expense_db) for expense_db in expenses_db]
+    except Exception:
+        logger.exception("Error retrieving expenses", extra={"user_id": user_id})
+        return []
+
+
+def list_expense_rows(
+    db: Session,
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> List[Row]:
+    """
+    Retrieves a user's expenses as plain column tuples, newest first, without
+    building ORM objects or models. Used by the list endpoint's JSON fast path.
+
+    Args:
+        db (Session): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum number of expenses. None returns all of them.
+        after (tuple, optional): (created_at, id) keyset position to continue after.
+        category (str, optional): Only expenses in this category.
+        type (str, optional): Only expenses of this type (Personal or Shared).
+        created_from (datetime, optional): Only expenses created at or after this time.
+        created_to (datetime, optional): Only expenses created before this time.
+
+    Returns:
+        List[Row]: Rows of EXPENSE_LIST_COLUMNS.
+    """
+    try:
+        return db.execute(
+            expenses_query(user_id, limit, after, category, type, created_from, created_to)
+            .with_only_columns(*EXPENSE_LIST_COLUMNS)
+        ).all()
+    except Exception:
+        logger.exception("Error retrieving expense rows", extra={"user_id": user_id})
+        return []
+
+
+def bulk_create_tasks(db: Session, tasks: List[Task]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Inserts many Tasks with a single multi-row INSERT ... RETURNING id.
+    Items whose user profile does not exist are reported as failed; the rest
+    are inserted together in one transaction.
+
+    Args:
+        db (Session): The request's database session.
+        tasks (List[Task]): The Task objects to insert.
+
+    Returns:
+        tuple: The new ID for each task in input order (None where it failed),
+            and error messages keyed by the position of each failed task.
+    """
+    ids: List[Optional[int]] = [None] * len(tasks)
+    errors: Dict[int, str] = {}
+    if not tasks:
+        return ids, errors
+    
+    try:
+        result = db.execute(existing_user_ids_query({item.user_id for item in tasks}))
+        known_users = set(result.scalars())
+        now = datetime.now(COLOMBIA_TZ)
+        positions, rows = [], []
+        for position, item in enumerate(tasks):
+            if item.user_id in known_users:
+                positions.append(position)
+                rows.append(task_insert_row(item, now))
+            else:
+                errors[position] = f"User profile {item.user_id} not found"
+        
+        if rows:
+            result = db.execute(tasks_bulk_insert(), rows)
+            for position, new_id in zip(positions, result.scalars()):
+                ids[position] = new_id
+            db.execute(data_versions_bump({row["user_id"] for row in rows}))
+            db.commit()
+        logger.info("Bulk inserted %d tasks, %d failed.", len(rows), len(errors), extra={"inserted": len(rows), "failed": len(errors)})
+        return ids, errors
+    except Exception as e:
+        logger.exception("Error bulk inserting tasks", extra={"items": len(tasks)})
+        db.rollback()
+        return [None] * len(tasks), {position: str(e) for position in range(len(tasks))}
+
+
+def get_expense(db: Session, expense_id: int) -> Optional[Expense]:
     """
     Retrieves an Expense from the database by its ID.
 
     Args:
+        db (Session): The request's database session.
         expense_id (int): The ID of the expense to retrieve.
 
     Returns:
         Expense or None: An Expense object if found, else None.
     """
-    db = get_db_session()
     try:
         expense_db = db.query(ExpenseDB).filter(ExpenseDB.id == expense_id).first()
         if not expense_db:
             return None
         
-        return Expense(
-            description=expense_db.description,
-            amount=expense_db.amount,
-            category=expense_db.category,
-            type=expense_db.type,
-            user_id=expense_db.user_id,
-            created_at=expense_db.created_at,
-            updated_at=expense_db.updated_at
-        )
-    except Exception as e:
-        print(f"Error retrieving expense: {e}")
+        return expense_from_db(expense_db)
+    except Exception:
+        logger.exception("Error retrieving expense", extra={"expense_id": expense_id})
         return None
-    finally:
-        db.close()
 
 
-def create_expense(expense: Expense) -> Optional[int]:
+def create_expense(db: Session, expense: Expense) -> Optional[int]:
     """
     Inserts an Expense into the database.
 
     Args:
+        db (Session): The request's database session.
         expense (Expense): The Expense object to insert.
 
     Returns:
         int or None: The new expense's ID if successful, else None.
     """
-    db = get_db_session()
     try:
         expense_db = ExpenseDB(
             description=expense.description,
@@ -220,135 +351,226 @@ def create_expense(expense: Expense) -> Optional[int]:
             updated_at=expense.updated_at or datetime.now(COLOMBIA_TZ)
         )
         db.add(expense_db)
+        # Keep the monthly rollup current in the same transaction
+        db.execute(expense_rollup_upsert(expense_rollup_key(expense_db), expense_db.amount, 1))
+        db.execute(data_versions_bump({expense_db.user_id}))
         db.commit()
-        db.refresh(expense_db)
-        print(f"Expense created with ID: {expense_db.id}")
+        logger.info("Expense created with ID: %s", expense_db.id, extra={"expense_id": expense_db.id, "user_id": expense.user_id})
         return expense_db.id
-    except Exception as e:
-        print(f"Error inserting expense: {e}")
+    except Exception:
+        logger.exception("Error inserting expense", extra={"user_id": expense.user_id})
         db.rollback()
         return None
-    finally:
-        db.close()
 
 
-def update_expense(expense_id: int, update_data: Dict[str, Any]) -> bool:
+def bulk_create_expenses(db: Session, expenses: List[Expense]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Inserts many Expenses with a single multi-row INSERT ... RETURNING id.
+    Items whose user profile does not exist are reported as failed; the rest
+    are inserted together in one transaction.
+
+    Args:
+        db (Session): The request's database session.
+        expenses (List[Expense]): The Expense objects to insert.
+
+    Returns:
+        tuple: The new ID for each expense in input order (None where it failed),
+            and error messages keyed by the position of each failed expense.
+    """
+    ids: List[Optional[int]] = [None] * len(expenses)
+    errors: Dict[int, str] = {}
+    if not expenses:
+        return ids, errors
+    
+    try:
+        result = db.execute(existing_user_ids_query({item.user_id for item in expenses}))
+        known_users = set(result.scalars())
+        now = datetime.now(COLOMBIA_TZ)
+        positions, rows = [], []
+        for position, item in enumerate(expenses):
+            if item.user_id in known_users:
+                positions.append(position)
+                rows.append(expense_insert_row(item, now))
+            else:
+                errors[position] = f"User profile {item.user_id} not found"
+        
+        if rows:
+            result = db.execute(expenses_bulk_insert(), rows)
+            for position, new_id in zip(positions, result.scalars()):
+                ids[position] = new_id
+            # Keep the monthly rollup current in the same transaction
+            db.execute(expense_rollups_upsert(expense_rollup_deltas(rows)))
+            db.execute(data_versions_bump({row["user_id"] for row in rows}))
+            db.commit()
+        logger.info("Bulk inserted %d expenses, %d failed.", len(rows), len(errors), extra={"inserted": len(rows), "failed": len(errors)})
+        return ids, errors
+    except Exception as e:
+        logger.exception("Error bulk inserting expenses", extra={"items": len(expenses)})
+        db.rollback()
+        return [None] * len(expenses), {position: str(e) for position in range(len(expenses))}
+
+
+def update_expense(db: Session, expense_id: int, update_data: Dict[str, Any]) -> bool:
     """
     Updates an Expense in the database.
 
     Args:
+        db (Session): The request's database session.
         expense_id (int): The ID of the expense to update.
         update_data (dict): The fields to update with their new values.
 
     Returns:
         bool: True if update was successful, False otherwise.
     """
-    db = get_db_session()
     try:
         expense_db = db.query(ExpenseDB).filter(ExpenseDB.id == expense_id).first()
         if not expense_db:
-            print("Expense not found.")
+            logger.warning("Expense not found.", extra={"expense_id": expense_id})
             return False
         
+        old_key, old_amount = expense_rollup_key(expense_db), expense_db.amount
         for key, value in update_data.items():
             if hasattr(expense_db, key):
                 setattr(expense_db, key, value)
         
+        # Move the expense between rollup buckets if its amount or bucket changed
+        new_key = expense_rollup_key(expense_db)
+        if (old_key, old_amount) != (new_key, expense_db.amount):
+            db.execute(expense_rollup_upsert(old_key, -old_amount, -1))
+            db.execute(expense_rollup_upsert(new_key, expense_db.amount, 1))
+        
         expense_db.updated_at = datetime.now(COLOMBIA_TZ)
+        db.execute(data_versions_bump({old_key[0], new_key[0]}))
         db.commit()
-        print(f"Expense {expense_id} updated.")
+        logger.info("Expense %s updated.", expense_id, extra={"expense_id": expense_id})
         return True
-    except Exception as e:
-        print(f"Error updating expense: {e}")
+    except Exception:
+        logger.exception("Error updating expense", extra={"expense_id": expense_id})
         db.rollback()
         return False
-    finally:
-        db.close()
 
 
-def list_user_profiles() -> List[UserProfile]:
+def summarize_expenses(
+    db: Session,
+    user_id: str,
+    group_by: List[str],
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Summarizes a user's expenses from the rollup table, grouped in SQL.
+
+    Args:
+        db (Session): The request's database session.
+        user_id (str): The Telegram ID of the user.
+        group_by (list): Any of "month", "category" and "type".
+        month_from (date, optional): Only months starting at or after this date.
+        month_to (date, optional): Only months starting before this date.
+
+    Returns:
+        List[dict]: One row per bucket with the grouped fields, total and count.
+    """
+    try:
+        rows = db.execute(expense_summary_query(user_id, group_by, month_from, month_to)).mappings()
+        return [dict(row) for row in rows]
+    except Exception:
+        logger.exception("Error summarizing expenses", extra={"user_id": user_id})
+        return []
+
+
+def list_user_profiles(db: Session, preferences: Optional[Dict[str, Any]] = None) -> List[UserProfile]:
     """
     Retrieves all UserProfiles from the database.
 
+    Args:
+        db (Session): The request's database session.
+        preferences (dict, optional): Only profiles whose preferences contain these key/value pairs.
+
     Returns:
         List[UserProfile]: A list of UserProfile objects.
     """
-    db = get_db_session()
     try:
-        profiles_db = db.query(UserProfileDB).all()
+        profiles_db = db.execute(user_profiles_query(preferences)).scalars().all()
         if not profiles_db:
             return []
         
-        profiles = []
-        for profile in profiles_db:
-            profiles.append(
-                UserProfile(
-                    id=profile.id,
-                    name=profile.name,
-                    city=profile.city,
-                    state=profile.state,
-                    country=profile.country,
-                    job=profile.job,
-                    interestes=profile.interests,
-                    preferences=profile.preferences
-                )
-            )
-        
-        return profiles
-    except Exception as e:
-        print(f"Error retrieving user profiles: {e}")
+        return [user_profile_from_db(profile) for profile in profiles_db]
+    except Exception:
+        logger.exception("Error retrieving user profiles")
         return []
-    finally:
-        db.close()
 
 
-def get_user_profile(user_id: str) -> Optional[UserProfile]:
+def get_user_profile(db: Session, user_id: str) -> Optional[UserProfile]:
     """
-    Retrieves a UserProfile from the database by its ID.
+    Retrieves a UserProfile by its ID, served from the profile cache when possible.
 
     Args:
+        db (Session): The request's database session.
         user_id (str): The Telegram ID of the user.
 
     Returns:
         UserProfile or None: The user profile if found, else None.
     """
-    db = get_db_session()
+    cached = get_profile_cache().get(user_id)
+    if cached is not None:
+        return cached
+    
     try:
         profile_db = db.query(UserProfileDB).filter(UserProfileDB.id == user_id).first()
         if not profile_db:
             return None
         
-        preferences = json.loads(profile_db.preferences) if profile_db.preferences else {}
-        
-        return UserProfile(
-            id=profile_db.id,
-            name=profile_db.name,
-            city=profile_db.city,
-            state=profile_db.state,
-            country=profile_db.country,
-            job=profile_db.job,
-            preferences=preferences,
-            interests=profile_db.interests or [],
-            created_at=profile_db.created_at
-        )
-    except Exception as e:
-        print(f"Error retrieving user profile: {e}")
+        profile = user_profile_from_db(profile_db)
+        get_profile_cache().set(user_id, profile)
+        return profile
+    except Exception:
+        logger.exception("Error retrieving user profile", extra={"user_id": user_id})
         return None
-    finally:
-        db.close()
 
 
-def create_user_profile(profile: UserProfile) -> Optional[str]:
+def get_user_profiles(db: Session, user_ids: Set[str]) -> Dict[str, UserProfile]:
+    """
+    Retrieves several UserProfiles at once: cached profiles are served from the
+    profile cache and the rest are loaded with a single query.
+
+    Args:
+        db (Session): The request's database session.
+        user_ids (set): The Telegram IDs of the users.
+
+    Returns:
+        dict: UserProfile by user ID, for the users that exist.
+    """
+    profiles: Dict[str, UserProfile] = {}
+    for user_id in user_ids:
+        cached = get_profile_cache().get(user_id)
+        if cached is not None:
+            profiles[user_id] = cached
+    missing = set(user_ids) - profiles.keys()
+    if not missing:
+        return profiles
+    
+    try:
+        for profile_db in db.execute(user_profiles_query(user_ids=missing)).scalars():
+            profile = user_profile_from_db(profile_db)
+            get_profile_cache().set(profile.id, profile)
+            profiles[profile.id] = profile
+        return profiles
+    except Exception:
+        logger.exception("Error retrieving user profiles")
+        return profiles
+
+
+def create_user_profile(db: Session, profile: UserProfile) -> Optional[str]:
     """
     Inserts a UserProfile into the database.
 
     Args:
+        db (Session): The request's database session.
         profile (UserProfile): The UserProfile object to insert.
 
     Returns:
         str or None: The user's ID if successful, else None.
     """
-    db = get_db_session()
     try:
         profile_db = UserProfileDB(
             id=profile.id,
@@ -357,57 +579,52 @@ def create_user_profile(profile: UserProfile) -> Optional[str]:
             state=profile.state,
             country=profile.country,
             job=profile.job,
-            preferences=json.dumps(profile.preferences) if isinstance(profile.preferences, dict) else profile.preferences,
+            preferences=profile.preferences,
             interests=profile.interests or [],
+            supervisor_prompt_override=profile.supervisor_prompt_override,
             created_at=profile.created_at or datetime.now(COLOMBIA_TZ)
         )
         db.add(profile_db)
         db.commit()
-        db.refresh(profile_db)
-        print(f"UserProfile created with ID: {profile_db.id}")
+        get_profile_cache().invalidate(profile_db.id)
+        logger.info("UserProfile created with ID: %s", profile_db.id, extra={"user_id": profile_db.id})
         return profile_db.id
-    except Exception as e:
-        print(f"Error inserting user profile: {e}")
+    except Exception:
+        logger.exception("Error inserting user profile", extra={"user_id": profile.id})
         db.rollback()
         return None
-    finally:
-        db.close()
 
 
-def update_user_profile(user_id: str, update_data: Dict[str, Any]) -> bool:
+def update_user_profile(db: Session, user_id: str, update_data: Dict[str, Any]) -> bool:
     """
     Updates a UserProfile in the database by user ID.
 
     Args:
+        db (Session): The request's database session.
         user_id (str): The Telegram ID of the user.
         update_data (dict): The fields to update.
 
     Returns:
         bool: True if update was successful, False otherwise.
     """
-    db = get_db_session()
     try:
         profile_db = db.query(UserProfileDB).filter(UserProfileDB.id == user_id).first()
         if not profile_db:
-            print("UserProfile not found.")
+            logger.warning("UserProfile not found.", extra={"user_id": user_id})
             return False
         
         for key, value in update_data.items():
             if hasattr(profile_db, key):
-                # For JSON fields, serialize them
-                if key in ["preferences"]:
-                    setattr(profile_db, key, json.dumps(value) if isinstance(value, dict) else value)
-                elif key in ["interests"]:
-                    setattr(profile_db, key, value)
-                else:
-                    setattr(profile_db, key, value)
+                setattr(profile_db, key, value)
+        # Incremented in SQL, so concurrent updates from several processes never share versions
+        profile_db.profile_version = UserProfileDB.profile_version + 1
+        profile_db.data_version = UserProfileDB.data_version + 1
         
         db.commit()
-        print(f"UserProfile {user_id} updated.")
+        get_profile_cache().invalidate(user_id)
+        logger.info("UserProfile %s updated.", user_id, extra={"user_id": user_id})
         return True
-    except Exception as e:
-        print(f"Error updating user profile: {e}")
+    except Exception:
+        logger.exception("Error updating user profile", extra={"user_id": user_id})
         db.rollback()
         return False
-    finally:
-        db.close()
@@ -1,26 +1,93 @@
 """
 Database connection and session management.
 """
-from sqlalchemy import create_engine
+import logging
+import time
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from app.core.config import settings
+from app.core.config import get_settings
 from app.db.orm_models import Base
+from app.db.pool import TimedQueuePool, pool_options
+from app.db.query_stats import current_query_stats
 
-# Create SQLAlchemy engine
-engine = create_engine(settings.database_url)
+logger = logging.getLogger(__name__)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    slow_query_ms = get_settings().db_slow_query_ms
+    if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms)", elapsed * 1000,
+            extra={"duration_ms": round(elapsed * 1000, 3), "statement": " ".join(statement.split())[:1000]}
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement the engine runs: record it in the current request's
+    QueryStats and log it if it exceeds db_slow_query_ms.
+    
+    Args:
+        engine: Sync engine (for async engines pass engine.sync_engine)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """
+    Get the SQLAlchemy engine, creating it on first call.
+    
+    Returns:
+        Engine: The shared sync engine
+    """
+    settings = get_settings()
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    engine = create_engine(
+        settings.database_url,
+        poolclass=TimedQueuePool,
+        connect_args=connect_args,
+        **pool_options()
+    )
+    instrument_engine(engine)
+    return engine
+
+
+@lru_cache
+def get_session_factory() -> sessionmaker:
+    """
+    Get the session factory, creating it on first call. Objects stay loaded
+    after commit so a request can read them back without checking out
+    another connection.
+    
+    Returns:
+        sessionmaker: Factory for sessions bound to the sync engine
+    """
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=get_engine())
 
 
 def get_db() -> Session:
     """
     Get database session (dependency for FastAPI routes).
+    One session per request: crud calls share its connection and transaction.
     
     Yields:
         Session: Database session
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
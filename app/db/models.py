@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Literal, TypedDict, Optional
+from typing import Any, Dict, List, Literal, TypedDict, Optional
 from datetime import datetime
 
 class UserProfile(BaseModel):
@@ -9,11 +9,14 @@ class UserProfile(BaseModel):
     state: Optional[str] = Field(default=None, description="The state of the user")
     country: Optional[str] = Field(default=None, description="The country of the user")
     job: Optional[str] = Field(default=None, description="The job of the user")
-    preferences: Optional[str] = Field(default=None, description="The preferences of the user")
+    preferences: Optional[Dict[str, Any]] = Field(default=None, description="The preferences of the user")
     interests: list[str] = Field(default_factory=list, description="The interests of the user")
+    supervisor_prompt_override: Optional[str] = Field(default=None, description="Standing instructions from the user for the agents")
+    profile_version: int = Field(default=0, description="Number of updates to the profile, read from the same row as the fields")
     created_at: datetime
 
 class Task(BaseModel):
+    id: Optional[int] = Field(default=None, description="Database identifier of the task")
     title: str = Field(description="The title of the task")
     time_to_complete: Optional[int] = Field(default=None, description="The time to complete the task in minutes")
     deadline: Optional[datetime] = Field(default=None, description="The deadline of the task")
@@ -23,7 +26,6 @@ class Task(BaseModel):
     )
     solutions: list[str] = Field(
         description="List of specific, actionable solutions (e.g., specific ideas, service providers, or concrete options relevant to completing the task)",
-        min_items=1,
         default_factory=list
     )
     user_id: str = Field(description="The Telegram ID of the user associated with the task")
@@ -32,6 +34,7 @@ class Task(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now, description="The last update date of the task")
 
 class Expense(BaseModel):
+    id: Optional[int] = Field(default=None, description="Database identifier of the expense")
     description: str = Field(description="The description of the expense")
     amount: float = Field(description="The amount of the expense")
     category: Literal["food", "transport", "housing", "utilities", "entertainment", "other"] = Field(
@@ -46,5 +49,34 @@ class Expense(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now, description="The creation date of the expense")
     updated_at: datetime = Field(default_factory=datetime.now, description="The last update date of the expense")
 
+class AgentJob(BaseModel):
+    id: str = Field(description="Identifier of the job")
+    agent_name: str = Field(description="The agent the job runs")
+    user_id: str = Field(description="The Telegram ID of the user the job runs for")
+    request: Dict[str, Any] = Field(description="The AgentRequest to run")
+    callback_url: Optional[str] = Field(default=None, description="URL that receives the job when it finishes")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(description="Current status of the job")
+    output: Optional[str] = Field(default=None, description="The agent's output, once succeeded")
+    info: Optional[Dict[str, Any]] = Field(default=None, description="The agent's response metadata, once succeeded")
+    error: Optional[str] = Field(default=None, description="Why the job failed")
+    attempts: int = Field(default=0, description="Times a worker has started the job")
+    created_at: Optional[datetime] = Field(default=None, description="When the job was submitted")
+    started_at: Optional[datetime] = Field(default=None, description="When the latest attempt started")
+    finished_at: Optional[datetime] = Field(default=None, description="When the job succeeded or failed")
+
+class ConversationTurn(BaseModel):
+    role: Literal["user", "assistant"] = Field(description="Who sent the message")
+    content: str = Field(description="The message")
+    tokens: int = Field(description="Estimated tokens of the message")
+    created_at: Optional[datetime] = Field(default=None, description="When the message was sent")
+
+class Conversation(BaseModel):
+    user_id: str = Field(description="The Telegram ID of the user")
+    summary: str = Field(default="", description="Rolling summary of the turns that no longer fit the token budget")
+    summary_tokens: int = Field(default=0, description="Estimated tokens of the summary")
+    summarized_turns: int = Field(default=0, description="Turns folded into the summary so far")
+    turns: List[ConversationTurn] = Field(default_factory=list, description="Recent turns, oldest first")
+    updated_at: Optional[datetime] = Field(default=None, description="When a turn was last added")
+
 class UpdateMemory(TypedDict):
     update_type: Literal["task", "expense", "user_profile"]
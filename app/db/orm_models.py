@@ -2,7 +2,8 @@
 SQLAlchemy ORM models for database tables.
 These are separate from Pydantic models which are used for API validation.
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ARRAY, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Text, ARRAY, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone, timedelta
@@ -12,10 +13,22 @@ COLOMBIA_TZ = timezone(timedelta(hours=-5))
 
 Base = declarative_base()
 
+# Postgres types, stored as JSON on SQLite so the schema can be created
+# there for the offline benchmark suite (benchmarks/suite.py)
+JSONDocument = JSONB().with_variant(JSON(), "sqlite")
+StringList = ARRAY(String).with_variant(JSON(), "sqlite")
+
 
 class UserProfileDB(Base):
     """User profile database table."""
     __tablename__ = "user_profiles"
+    __table_args__ = (
+        # jsonb_path_ops serves containment (@>) filters on preferences
+        Index(
+            "ix_user_profiles_preferences", "preferences",
+            postgresql_using="gin", postgresql_ops={"preferences": "jsonb_path_ops"}
+        ),
+    )
     
     id = Column(String, primary_key=True, index=True)  # Telegram ID
     name = Column(String, nullable=True)
@@ -23,9 +36,11 @@ class UserProfileDB(Base):
     state = Column(String, nullable=True)
     country = Column(String, nullable=True)
     job = Column(String, nullable=True)
-    preferences = Column(Text, nullable=True)
+    preferences = Column(JSONDocument, nullable=True)
     supervisor_prompt_override = Column(Text, nullable=True)
-    interests = Column(ARRAY(String), default=[])
+    interests = Column(StringList, default=[])
+    profile_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every profile update
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every write to the profile, tasks or expenses
     created_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ))
     
     # Relationships
@@ -36,13 +51,17 @@ class UserProfileDB(Base):
 class TaskDB(Base):
     """Task database table."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_status_deadline", "user_id", "status", "deadline"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String, nullable=False)
     time_to_complete = Column(Integer, nullable=True)
     deadline = Column(DateTime, nullable=True)
     status = Column(String, default="not started")
-    solutions = Column(ARRAY(String), default=[])
+    solutions = Column(StringList, default=[])
     user_id = Column(String, ForeignKey("user_profiles.id"), nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ))
     updated_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ), onupdate=lambda: datetime.now(COLOMBIA_TZ))
@@ -54,6 +73,9 @@ class TaskDB(Base):
 class ExpenseDB(Base):
     """Expense database table."""
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     description = Column(String, nullable=False)
@@ -67,3 +89,73 @@ class ExpenseDB(Base):
     # Relationship
     user = relationship("UserProfileDB", back_populates="expenses")
 
+
+class ExpenseRollupDB(Base):
+    """
+    Per-user monthly expense totals by category and type.
+    Kept current by the crud layer in the same transaction as expense writes,
+    so summaries cost O(buckets) instead of O(expenses).
+    """
+    __tablename__ = "expense_rollups"
+    
+    user_id = Column(String, ForeignKey("user_profiles.id"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    category = Column(String, primary_key=True)
+    type = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AgentJobDB(Base):
+    """
+    Agent invocation run in the background. Workers claim queued jobs (or
+    running jobs whose lease expired) with SELECT ... FOR UPDATE SKIP LOCKED,
+    so jobs survive restarts without an external broker.
+    """
+    __tablename__ = "agent_jobs"
+    __table_args__ = (
+        Index("ix_agent_jobs_status_created_at", "status", "created_at"),
+    )
+    
+    id = Column(String, primary_key=True)  # uuid4 hex
+    agent_name = Column(String, nullable=False)
+    user_id = Column(String, ForeignKey("user_profiles.id"), nullable=False)
+    request = Column(JSONDocument, nullable=False)  # The AgentRequest
+    callback_url = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    output = Column(Text, nullable=True)
+    info = Column(JSONDocument, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ConversationDB(Base):
+    """
+    Rolling summary of a user's conversation with the agents. Turns that no
+    longer fit the token budget are folded into the summary and deleted.
+    """
+    __tablename__ = "conversations"
+    
+    user_id = Column(String, ForeignKey("user_profiles.id"), primary_key=True)
+    summary = Column(Text, nullable=False, default="")
+    summary_tokens = Column(Integer, nullable=False, default=0)
+    summarized_turns = Column(Integer, nullable=False, default=0)  # Turns folded into the summary so far
+    updated_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ))
+
+
+class ConversationTurnDB(Base):
+    """Recent conversation turn kept verbatim."""
+    __tablename__ = "conversation_turns"
+    __table_args__ = (
+        Index("ix_conversation_turns_user_id_id", "user_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, ForeignKey("user_profiles.id"), nullable=False)
+    role = Column(String, nullable=False)  # user or assistant
+    content = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False)  # Estimated, see app.db.conversations.estimate_tokens
+    created_at = Column(DateTime, default=lambda: datetime.now(COLOMBIA_TZ))
@@ -0,0 +1,47 @@
+"""
+Opaque keyset cursors for paginated list endpoints.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+# Page size bounds for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encodes the (created_at, id) keyset position of a row as an opaque cursor.
+
+    Args:
+        created_at (datetime): Creation date of the last row on the page.
+        id (int): ID of the last row on the page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The cursor string.
+
+    Returns:
+        tuple: The (created_at, id) keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,160 @@
+"""
+Connection pool classes that record checkout wait times, and pool statistics.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core.config import get_settings
+
+
+def pool_options() -> Dict[str, Any]:
+    """
+    Get the pool keyword arguments for create_engine from settings.
+
+    Returns:
+        Dictionary of pool options
+    """
+    settings = get_settings()
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping
+    }
+
+
+class PoolWaitStats:
+    """Running totals of how long checkouts waited for a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool) -> None:
+        """
+        Record one checkout attempt.
+
+        Args:
+            wait: Seconds spent waiting for (or opening) a connection
+            timed_out: Whether the attempt hit pool_timeout
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the current totals.
+
+        Returns:
+            Dictionary of checkout count, timeouts and wait times in seconds
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_seconds": round(self.total_wait, 6),
+                "wait_avg_seconds": round(self.total_wait / attempts, 6) if attempts else 0.0,
+                "wait_max_seconds": round(self.max_wait, 6)
+            }
+
+
+class TimedPoolMixin:
+    """Times every checkout from the underlying queue pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start, timed_out=False)
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """QueuePool with checkout wait statistics."""
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait statistics."""
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Get live statistics for a connection pool.
+
+    Args:
+        pool: The engine's pool
+
+    Returns:
+        Dictionary with checked-out, idle and overflow connections plus wait times
+    """
+    status: Dict[str, Any] = {"pool_class": pool.__class__.__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout()
+        })
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.as_dict())
+    return status
+
+
+def prewarm_pool(engine: Engine, connections: int) -> None:
+    """
+    Open connections up front so the first requests do not pay for connecting.
+    They are returned to the pool and stay idle until used.
+
+    Args:
+        engine: Sync engine whose pool to fill
+        connections: Number of connections to open (at most pool_size are kept)
+    """
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+async def prewarm_async_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open async connections concurrently and return them to the pool.
+
+    Args:
+        engine: Async engine whose pool to fill
+        connections: Number of connections to open (at most pool_size are kept)
+    """
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)), return_exceptions=True)
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+    errors = [connection for connection in opened if isinstance(connection, BaseException)]
+    if errors:
+        raise errors[0]
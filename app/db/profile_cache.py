@@ -0,0 +1,24 @@
+"""
+Read-through cache of UserProfile objects, shared by the sync and async CRUD modules.
+Profiles change rarely but are read on every agent message.
+"""
+from functools import lru_cache
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_profile_cache() -> TTLCache:
+    """
+    Get the profile cache, sized from settings on first call.
+    Keyed by user ID. crud.create_user_profile / update_user_profile invalidate entries.
+
+    Returns:
+        TTLCache: The shared profile cache
+    """
+    settings = get_settings()
+    return TTLCache(
+        name="user_profiles",
+        maxsize=settings.profile_cache_size,
+        ttl=settings.profile_cache_ttl_seconds
+    )
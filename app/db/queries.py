@@ -0,0 +1,420 @@
+"""
+SQLAlchemy statement builders shared by the sync and async CRUD modules.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import Insert, Select, Update, and_, func, literal, or_, select, tuple_, update
+from sqlalchemy import insert as core_insert
+from sqlalchemy.dialects.postgresql import insert
+from app.db.orm_models import (
+    UserProfileDB, TaskDB, ExpenseDB, ExpenseRollupDB, AgentJobDB, ConversationDB, ConversationTurnDB
+)
+from app.db.models import Task, Expense
+from app.db.timestamps import as_local
+
+# Columns an expense summary can be grouped by
+EXPENSE_SUMMARY_GROUPS = ("month", "category", "type")
+
+# (user_id, month, category, type) bucket of the expense rollup table
+RollupKey = Tuple[str, date, str, str]
+
+# Columns of the list endpoints' column-tuple fast path, named and ordered
+# like the fields of the response models (schemas.Task and schemas.Expense)
+TASK_LIST_COLUMNS = (
+    TaskDB.title, TaskDB.time_to_complete, TaskDB.deadline, TaskDB.status,
+    func.coalesce(TaskDB.solutions, literal([], TaskDB.solutions.type)).label("solutions"),
+    TaskDB.user_id, TaskDB.id, TaskDB.created_at, TaskDB.updated_at
+)
+EXPENSE_LIST_COLUMNS = (
+    ExpenseDB.description, ExpenseDB.amount, ExpenseDB.category, ExpenseDB.type,
+    ExpenseDB.id, ExpenseDB.user_id, ExpenseDB.created_at, ExpenseDB.updated_at
+)
+
+
+def tasks_query(
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Select:
+    """
+    Builds the keyset-paginated task listing for a user, newest first.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum rows to return. None returns every row.
+        after (tuple, optional): (created_at, id) of the last row of the previous page.
+        status (str, optional): Only tasks with this status.
+        created_from (datetime, optional): Only tasks created at or after this time.
+        created_to (datetime, optional): Only tasks created before this time.
+
+    Returns:
+        Select: The statement, ordered by (created_at, id) descending.
+    """
+    stmt = select(TaskDB).where(TaskDB.user_id == user_id)
+    if status is not None:
+        stmt = stmt.where(TaskDB.status == status)
+    if created_from is not None:
+        stmt = stmt.where(TaskDB.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(TaskDB.created_at < created_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(TaskDB.created_at, TaskDB.id) < tuple_(*after))
+    stmt = stmt.order_by(TaskDB.created_at.desc(), TaskDB.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def expenses_query(
+    user_id: str,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Select:
+    """
+    Builds the keyset-paginated expense listing for a user, newest first.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+        limit (int, optional): Maximum rows to return. None returns every row.
+        after (tuple, optional): (created_at, id) of the last row of the previous page.
+        category (str, optional): Only expenses in this category.
+        type (str, optional): Only expenses of this type (Personal or Shared).
+        created_from (datetime, optional): Only expenses created at or after this time.
+        created_to (datetime, optional): Only expenses created before this time.
+
+    Returns:
+        Select: The statement, ordered by (created_at, id) descending.
+    """
+    stmt = select(ExpenseDB).where(ExpenseDB.user_id == user_id)
+    if category is not None:
+        stmt = stmt.where(ExpenseDB.category == category)
+    if type is not None:
+        stmt = stmt.where(ExpenseDB.type == type)
+    if created_from is not None:
+        stmt = stmt.where(ExpenseDB.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(ExpenseDB.created_at < created_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(ExpenseDB.created_at, ExpenseDB.id) < tuple_(*after))
+    stmt = stmt.order_by(ExpenseDB.created_at.desc(), ExpenseDB.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def expense_rollup_key(expense_db: ExpenseDB) -> RollupKey:
+    """
+    Returns the rollup bucket an expense row counts towards.
+
+    Args:
+        expense_db (ExpenseDB): The expense row.
+
+    Returns:
+        RollupKey: The (user_id, month, category, type) bucket.
+    """
+    return _rollup_key(expense_db.user_id, expense_db.created_at, expense_db.category, expense_db.type)
+
+
+def expense_rollup_deltas(rows: List[Dict[str, Any]]) -> Dict[RollupKey, Tuple[float, int]]:
+    """
+    Aggregates expense_insert_row() dicts into per-bucket (amount, count) deltas.
+
+    Args:
+        rows (list): Expense column values about to be inserted.
+
+    Returns:
+        dict: (amount, count) to add, keyed by bucket.
+    """
+    deltas: Dict[RollupKey, Tuple[float, int]] = {}
+    for row in rows:
+        key = _rollup_key(row["user_id"], row["created_at"], row["category"], row["type"])
+        amount, count = deltas.get(key, (0.0, 0))
+        deltas[key] = (amount + row["amount"], count + 1)
+    return deltas
+
+
+def _rollup_key(user_id: str, created_at: Any, category: Optional[str], type: Optional[str]) -> RollupKey:
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return (user_id, created_at.date().replace(day=1), category or "other", type or "Personal")
+
+
+def expense_rollup_upsert(key: RollupKey, amount: float, count: int) -> Insert:
+    """
+    Builds an upsert that adds amount and count to a rollup bucket.
+    Pass negative values to take an expense out of a bucket.
+
+    Args:
+        key (RollupKey): The bucket to adjust.
+        amount (float): Amount to add to the bucket total.
+        count (int): Number to add to the bucket's expense count.
+
+    Returns:
+        Insert: INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    return expense_rollups_upsert({key: (amount, count)})
+
+
+def expense_rollups_upsert(deltas: Dict[RollupKey, Tuple[float, int]]) -> Insert:
+    """
+    Builds a single multi-row upsert adjusting several rollup buckets.
+
+    Args:
+        deltas (dict): (amount, count) to add, keyed by bucket. Keys must be unique,
+            since one statement cannot update the same row twice.
+
+    Returns:
+        Insert: INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    stmt = insert(ExpenseRollupDB).values([
+        {"user_id": user_id, "month": month, "category": category, "type": type, "total": amount, "count": count}
+        for (user_id, month, category, type), (amount, count) in deltas.items()
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[ExpenseRollupDB.user_id, ExpenseRollupDB.month, ExpenseRollupDB.category, ExpenseRollupDB.type],
+        set_={
+            "total": ExpenseRollupDB.total + stmt.excluded.total,
+            "count": ExpenseRollupDB.count + stmt.excluded.count
+        }
+    )
+
+
+def expense_summary_query(
+    user_id: str,
+    group_by: List[str],
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None
+) -> Select:
+    """
+    Builds an expense summary over the rollup table with SQL GROUP BY.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+        group_by (list): Any of EXPENSE_SUMMARY_GROUPS. Empty gives a single grand total.
+        month_from (date, optional): Only months starting at or after this date.
+        month_to (date, optional): Only months starting before this date.
+
+    Returns:
+        Select: Rows of the grouped columns followed by total and count.
+    """
+    columns = [getattr(ExpenseRollupDB, key) for key in group_by]
+    stmt = select(
+        *columns,
+        func.sum(ExpenseRollupDB.total).label("total"),
+        func.sum(ExpenseRollupDB.count).label("count")
+    ).where(ExpenseRollupDB.user_id == user_id)
+    if month_from is not None:
+        stmt = stmt.where(ExpenseRollupDB.month >= month_from)
+    if month_to is not None:
+        stmt = stmt.where(ExpenseRollupDB.month < month_to)
+    return stmt.group_by(*columns).having(func.sum(ExpenseRollupDB.count) > 0).order_by(*columns)
+
+
+def user_profiles_query(
+    preferences: Optional[Dict[str, Any]] = None,
+    user_ids: Optional[Set[str]] = None
+) -> Select:
+    """
+    Builds the user profile listing, optionally filtered by preferences or IDs.
+
+    Args:
+        preferences (dict, optional): Only profiles whose preferences contain these
+            key/value pairs (JSONB @>, served by ix_user_profiles_preferences).
+        user_ids (set, optional): Only profiles with these Telegram IDs.
+
+    Returns:
+        Select: The statement.
+    """
+    stmt = select(UserProfileDB)
+    if preferences:
+        stmt = stmt.where(UserProfileDB.preferences.contains(preferences))
+    if user_ids is not None:
+        stmt = stmt.where(UserProfileDB.id.in_(user_ids))
+    return stmt
+
+
+def existing_user_ids_query(user_ids: Set[str]) -> Select:
+    """
+    Builds a lookup of which of the given user IDs have a profile.
+
+    Args:
+        user_ids (set): Telegram IDs to check.
+
+    Returns:
+        Select: Statement yielding the IDs that exist.
+    """
+    return select(UserProfileDB.id).where(UserProfileDB.id.in_(user_ids))
+
+
+def data_versions_query(user_ids: Set[str]) -> Select:
+    """
+    Builds a lookup of the data versions of the given users.
+
+    Args:
+        user_ids (set): Telegram IDs of the users.
+
+    Returns:
+        Select: Statement yielding (id, data_version) rows for the users that exist.
+    """
+    return select(UserProfileDB.id, UserProfileDB.data_version).where(UserProfileDB.id.in_(user_ids))
+
+
+def data_versions_bump(user_ids: Set[str]) -> Update:
+    """
+    Builds an increment of the data versions of the given users. Executed in the
+    same transaction as the write it stamps, so every process sees both at once.
+
+    Args:
+        user_ids (set): Telegram IDs of the users whose data was written.
+
+    Returns:
+        Update: UPDATE statement; the ORM session is left untouched.
+    """
+    return (
+        update(UserProfileDB)
+        .where(UserProfileDB.id.in_(user_ids))
+        .values(data_version=UserProfileDB.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def tasks_bulk_insert() -> Insert:
+    """
+    Builds a multi-row task INSERT ... RETURNING id.
+    Execute it with a list of task_insert_row() dicts; ids come back in input order.
+
+    Returns:
+        Insert: The insert statement.
+    """
+    return core_insert(TaskDB).returning(TaskDB.id, sort_by_parameter_order=True)
+
+
+def task_insert_row(task: Task, now: datetime) -> Dict[str, Any]:
+    """
+    Column values for inserting a task with tasks_bulk_insert().
+
+    Args:
+        task (Task): The task to insert.
+        now (datetime): Naive local timestamp for missing creation/update dates.
+
+    Returns:
+        dict: Column values keyed by column name.
+    """
+    return {
+        "title": task.title,
+        "time_to_complete": task.time_to_complete,
+        "deadline": task.deadline,
+        "status": task.status or "not started",
+        "solutions": task.solutions or [],
+        "user_id": task.user_id,
+        "created_at": as_local(getattr(task, "created_at", None)) or now,
+        "updated_at": as_local(getattr(task, "updated_at", None)) or now
+    }
+
+
+def expenses_bulk_insert() -> Insert:
+    """
+    Builds a multi-row expense INSERT ... RETURNING id.
+    Execute it with a list of expense_insert_row() dicts; ids come back in input order.
+
+    Returns:
+        Insert: The insert statement.
+    """
+    return core_insert(ExpenseDB).returning(ExpenseDB.id, sort_by_parameter_order=True)
+
+
+def expense_insert_row(expense: Expense, now: datetime) -> Dict[str, Any]:
+    """
+    Column values for inserting an expense with expenses_bulk_insert().
+
+    Args:
+        expense (Expense): The expense to insert.
+        now (datetime): Naive local timestamp for missing creation/update dates.
+
+    Returns:
+        dict: Column values keyed by column name.
+    """
+    return {
+        "description": expense.description,
+        "amount": expense.amount,
+        "category": expense.category or "other",
+        "type": expense.type or "Personal",
+        "user_id": expense.user_id,
+        "created_at": as_local(expense.created_at) or now,
+        "updated_at": as_local(expense.updated_at) or now
+    }
+
+
+def claim_agent_job_query(lease_expired_before: datetime) -> Select:
+    """
+    Builds the lookup of the oldest job a worker may run: a queued job, or a
+    running job whose lease expired because its worker crashed or was restarted.
+    Locked rows are skipped so concurrent workers never claim the same job.
+
+    Args:
+        lease_expired_before (datetime): Running jobs started before this are considered abandoned.
+
+    Returns:
+        Select: Statement locking at most one job row.
+    """
+    return (
+        select(AgentJobDB)
+        .where(or_(
+            AgentJobDB.status == "queued",
+            and_(AgentJobDB.status == "running", AgentJobDB.started_at < lease_expired_before)
+        ))
+        .order_by(AgentJobDB.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def conversation_insert(user_id: str, now: datetime) -> Insert:
+    """
+    Builds an insert of an empty conversation summary row that does nothing
+    if the user already has one.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+        now (datetime): Creation timestamp.
+
+    Returns:
+        Insert: INSERT ... ON CONFLICT DO NOTHING statement.
+    """
+    return insert(ConversationDB).values(
+        user_id=user_id, summary="", summary_tokens=0, summarized_turns=0, updated_at=now
+    ).on_conflict_do_nothing(index_elements=[ConversationDB.user_id])
+
+
+def conversation_lock_query(user_id: str) -> Select:
+    """
+    Builds the lookup of a user's conversation summary row, locking it so
+    concurrent requests of the same user add and fold turns one at a time.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+
+    Returns:
+        Select: Statement locking the summary row.
+    """
+    return select(ConversationDB).where(ConversationDB.user_id == user_id).with_for_update()
+
+
+def conversation_turns_query(user_id: str) -> Select:
+    """
+    Builds the listing of a user's recent conversation turns, oldest first.
+
+    Args:
+        user_id (str): The Telegram ID of the user.
+
+    Returns:
+        Select: The statement, served by ix_conversation_turns_user_id_id.
+    """
+    return select(ConversationTurnDB).where(ConversationTurnDB.user_id == user_id).order_by(ConversationTurnDB.id)
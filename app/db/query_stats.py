@@ -0,0 +1,109 @@
+"""
+Per-request SQL statistics: statement count, total time, the slowest
+statement, and how often each statement shape repeats (an N+1 pattern
+shows up as one shape run once per row).
+
+The engine event listeners in app.db.database record into whichever
+QueryStats is active in the current context; MetricsMiddleware opens one
+per HTTP request.
+"""
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in bound values
+    (including the length of an expanded IN list) compare equal.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        The statement with placeholders replaced by ? and whitespace collapsed
+    """
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements run within one request (or any other tracked block)."""
+
+    def __init__(self):
+        # Sync routes run their dependencies and handler in different threadpool workers
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None  # As sent to the driver, not its shape
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        """
+        Record one executed statement.
+
+        Args:
+            statement: SQL as sent to the driver
+            seconds: Time the driver took to execute it
+        """
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.shapes[shape] += 1
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Get statement shapes run at least threshold times, most frequent first.
+
+        Args:
+            threshold: Minimum number of executions
+
+        Returns:
+            List of (shape, count) pairs
+        """
+        with self._lock:
+            return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    Get the statistics being collected in this context.
+
+    Returns:
+        The active QueryStats, or None outside a tracked block
+    """
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect statistics for every statement run in this context while the
+    block is active. Threadpool workers and async DB greenlets started from
+    it inherit the context, so they record into the same object.
+
+    Yields:
+        QueryStats: Statistics for the block
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
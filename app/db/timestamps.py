@@ -0,0 +1,34 @@
+"""
+Timestamps for the database, shared by the sync and async CRUD modules.
+The timestamp columns have no time zone and hold Colombia local time. asyncpg
+refuses timezone-aware datetimes for such columns (psycopg2 let Postgres drop
+the offset), so every value written goes through these helpers.
+"""
+from datetime import datetime
+from typing import Optional
+from app.db.orm_models import COLOMBIA_TZ
+
+
+def local_now() -> datetime:
+    """
+    Get the current Colombia local time as a naive datetime.
+
+    Returns:
+        datetime: Now, without tzinfo
+    """
+    return datetime.now(COLOMBIA_TZ).replace(tzinfo=None)
+
+
+def as_local(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a datetime to the naive Colombia local time stored in the database.
+
+    Args:
+        value: A datetime from a client or caller; naive values are assumed to be local already
+
+    Returns:
+        datetime or None: The naive local time, or None if value is None
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(COLOMBIA_TZ).replace(tzinfo=None)
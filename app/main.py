@@ -1,10 +1,21 @@
 """
 FastAPI main application file.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api.routes import agents, expense, task, userprofile
-from app.core.config import settings
-from app.core.startup import register_all_agents
+from app.core.config import get_settings
+from app.agents.jobs import get_job_workers
+from app.core.scheduler import get_scheduler
+from app.core.startup import register_all_agents, warm_up
+from app.db.database import get_engine
+from app.db.async_database import get_async_engine
+from app.db.pool import pool_status
+from app.db.profile_cache import get_profile_cache
+from app.agents.prompt_prefix import get_prompt_prefix_cache
+from app.agents.response_cache import get_agent_response_cache
+from app.core.metrics import MetricsMiddleware, register_health_stats
+from app.core.log import RequestContextMiddleware, configure_logging, shutdown_logging
 
 app = FastAPI(
     title="Personal Assistant API",
@@ -12,11 +23,27 @@ app = FastAPI(
     version="1.0.0"
 )
 
+app.add_middleware(MetricsMiddleware)
+# Added last so it runs first: records logged by the metrics middleware carry the request ID
+app.add_middleware(RequestContextMiddleware)
+
 # Register all agents on startup
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
+    configure_logging()
     register_all_agents()
+    if get_settings().agent_build_mode == "warmup":
+        await warm_up()
+    if get_settings().agent_job_workers > 0:
+        get_job_workers().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the agent job workers, returning their running jobs to the queue, then flush the logs."""
+    await get_job_workers().stop()
+    shutdown_logging()
 
 # Include routers
 app.include_router(agents.router, prefix="/api", tags=["agents"])
@@ -40,3 +67,54 @@ async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+def pool_stats():
+    """Connection pool statistics for the sync and async database engines."""
+    return {
+        "sync": pool_status(get_engine().pool),
+        "async": pool_status(get_async_engine().pool)
+    }
+
+
+def cache_stats():
+    """Hit rate and size of the in-process caches."""
+    return {
+        "user_profiles": get_profile_cache().stats(),
+        "agent_responses": get_agent_response_cache().stats(),
+        "prompt_prefixes": get_prompt_prefix_cache().stats()
+    }
+
+
+# Also export the /health statistics as Prometheus gauges
+register_health_stats({
+    "db_pool": pool_stats,
+    "cache": cache_stats,
+    "scheduler": lambda: {"agents": get_scheduler().stats(), "job_workers": get_job_workers().stats()}
+})
+
+
+@app.get("/health/db")
+async def database_health():
+    """Connection pool statistics for the sync and async database engines."""
+    return pool_stats()
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """Hit rate and size of the in-process caches."""
+    return cache_stats()
+
+
+@app.get("/health/scheduler")
+async def scheduler_health():
+    """Running and queued agent invocations, rejections and queue wait times."""
+    return {
+        **get_scheduler().stats(),
+        "job_workers": get_job_workers().stats()
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-route latency histograms, in-flight requests, agent run times and /health statistics."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
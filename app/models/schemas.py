@@ -1,9 +1,9 @@
 """
 Pydantic schemas for API requests and responses.
 """
-from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date, datetime
 
 
 class TaskBase(BaseModel):
@@ -22,6 +22,7 @@ class TaskUpdate(TaskBase):
     pass
 
 class Task(TaskBase):
+    id: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -42,6 +43,8 @@ class ExpenseUpdate(ExpenseBase):
     pass
 
 class Expense(ExpenseBase):
+    id: Optional[int] = None
+    user_id: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -49,6 +52,34 @@ class Expense(ExpenseBase):
         orm_mode = True
 
 
+class TaskPage(BaseModel):
+    items: List[Task] = Field(description="Tasks on this page, newest first")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, or None on the last page")
+
+
+class ExpensePage(BaseModel):
+    items: List[Expense] = Field(description="Expenses on this page, newest first")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, or None on the last page")
+
+
+class ExpenseSummaryRow(BaseModel):
+    month: Optional[date] = Field(default=None, description="First day of the month, when grouped by month")
+    category: Optional[str] = Field(default=None, description="Expense category, when grouped by category")
+    type: Optional[str] = Field(default=None, description="Expense type, when grouped by type")
+    total: float = Field(description="Sum of expense amounts in the bucket")
+    count: int = Field(description="Number of expenses in the bucket")
+
+
+class BulkItemError(BaseModel):
+    index: int = Field(description="Position of the failed item in the request")
+    error: str = Field(description="Why the item was not created")
+
+
+class BulkCreateResponse(BaseModel):
+    ids: List[Optional[int]] = Field(description="Created ID for each item in request order, or None if it failed")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Items that were not created")
+
+
 class UserProfileBase(BaseModel):
     id: str = Field(description="Unique Telegram identifier for the user")
     name: str
@@ -56,8 +87,9 @@ class UserProfileBase(BaseModel):
     state: Optional[str] = None
     country: Optional[str] = None
     job: Optional[str] = None
-    preferences: Optional[str] = None
+    preferences: Optional[Dict[str, Any]] = None
     interests: Optional[List[str]] = []
+    supervisor_prompt_override: Optional[str] = Field(default=None, description="Standing instructions for the agents, added to every prompt")
 
 class UserProfileCreate(UserProfileBase):
     pass
@@ -82,3 +114,37 @@ class AgentResponse(BaseModel):
     output: str = Field(description="The main output text from the agent")
     actions: Optional[List[Dict[str, Any]]] = Field(default_factory=list, description="List of actions the agent took or recommends, if any")
     info: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Any additional agent information or metadata")
+
+
+class AgentBatchResponse(BaseModel):
+    results: List[Optional[AgentResponse]] = Field(description="Response for each item in request order, or None if it failed")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Items that failed")
+
+
+class AgentJobRequest(AgentRequest):
+    callback_url: Optional[HttpUrl] = Field(default=None, description="URL that receives a POST with the job once it succeeds or fails")
+
+
+class ConversationStats(BaseModel):
+    user_id: str
+    turns: int = Field(description="Recent turns kept verbatim")
+    turn_tokens: int = Field(description="Estimated tokens of the recent turns")
+    summary_tokens: int = Field(description="Estimated tokens of the rolling summary")
+    summarized_turns: int = Field(description="Turns folded into the summary so far")
+    total_tokens: int = Field(description="Estimated tokens of the history agents receive")
+    token_budget: int = Field(description="Configured budget for summary plus recent turns")
+    updated_at: Optional[datetime] = None
+
+
+class AgentJobStatus(BaseModel):
+    id: str = Field(description="Identifier of the job; poll /api/agents/jobs/{id}")
+    agent_name: str
+    user_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    output: Optional[str] = Field(default=None, description="The agent's output, once succeeded")
+    info: Optional[Dict[str, Any]] = Field(default=None, description="The agent's response metadata, once succeeded")
+    error: Optional[str] = Field(default=None, description="Why the job failed")
+    attempts: int = Field(default=0, description="Times a worker has started the job")
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
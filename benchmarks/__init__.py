@@ -0,0 +1,4 @@
+"""
+Benchmarks for the database layer, routes and agents.
+"""
+
@@ -0,0 +1,82 @@
+"""
+Concurrent throughput of the sync vs async database layer.
+
+Simulates N concurrent agent requests on a single event loop, each of which
+looks up a user profile. The "sync" path calls app.db.crud from a coroutine
+(what invoke_agent used to do), so every query blocks the loop; the "async"
+path awaits app.db.async_crud.
+
+Usage:
+    python -m benchmarks.async_db_throughput --requests 200 --concurrency 50 --delay 0.02
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+from sqlalchemy import text
+from app.db import crud, async_crud
+from app.db.database import get_session_factory
+from app.db.async_database import get_async_session_factory, get_async_engine
+
+
+async def sync_request(user_id: str, delay: float) -> None:
+    """One request through the blocking crud module."""
+    with get_session_factory()() as db:
+        if delay:
+            db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        crud.get_user_profile(db, user_id)
+
+
+async def async_request(user_id: str, delay: float) -> None:
+    """One request through the non-blocking async_crud module."""
+    async with get_async_session_factory()() as db:
+        if delay:
+            await db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        await async_crud.get_user_profile(db, user_id)
+
+
+async def run(
+    request: Callable[[str, float], Awaitable[None]],
+    requests: int,
+    concurrency: int,
+    user_id: str,
+    delay: float
+) -> float:
+    """
+    Runs `requests` calls with at most `concurrency` in flight.
+
+    Returns:
+        float: Elapsed wall time in seconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await request(user_id, delay)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.02, help="Simulated server-side query latency in seconds")
+    parser.add_argument("--user-id", default="benchmark-user")
+    args = parser.parse_args()
+
+    # Warm up both pools so connection setup is not measured
+    await run(sync_request, 5, 5, args.user_id, 0)
+    await run(async_request, 5, 5, args.user_id, 0)
+
+    for label, request in (("sync crud", sync_request), ("async crud", async_request)):
+        elapsed = await run(request, args.requests, args.concurrency, args.user_id, args.delay)
+        print(f"{label:>10}: {args.requests} requests in {elapsed:.3f}s -> {args.requests / elapsed:.1f} req/s")
+
+    await get_async_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Per-item vs bulk expense and task inserts.
+
+Inserts the same rows once through crud.create_expense / crud.create_task
+(INSERT and COMMIT per row) and once through
+crud.bulk_create_expenses / crud.bulk_create_tasks (one multi-row
+INSERT ... RETURNING id). Uses a throwaway user that is removed afterwards.
+
+Usage:
+    python -m benchmarks.bulk_insert --rows 1000
+"""
+import argparse
+import time
+import uuid
+from app.db import crud
+from app.db.database import get_session_factory
+from app.db.models import Expense
+from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB, ExpenseRollupDB
+from app.models.schemas import TaskCreate
+
+
+def timed(label: str, rows: int, fn) -> float:
+    """Runs fn once and prints rows per second."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {rows} rows in {elapsed:.3f}s -> {rows / elapsed:.1f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    user_id = f"bulk-bench-{uuid.uuid4().hex[:8]}"
+    db = get_session_factory()()
+    db.add(UserProfileDB(id=user_id, name="Bulk insert benchmark"))
+    db.commit()
+
+    expenses = [
+        Expense(description=f"Expense {i}", amount=float(i % 100), category="food", user_id=user_id)
+        for i in range(args.rows)
+    ]
+    tasks = [TaskCreate(title=f"Task {i}", user_id=user_id) for i in range(args.rows)]
+
+    try:
+        per_item = timed("per-item expenses", args.rows, lambda: [crud.create_expense(db, e) for e in expenses])
+        bulk = timed("bulk expenses", args.rows, lambda: crud.bulk_create_expenses(db, expenses))
+        print(f"{'speedup':>22}: {per_item / bulk:.1f}x")
+
+        per_item = timed("per-item tasks", args.rows, lambda: [crud.create_task(db, t) for t in tasks])
+        bulk = timed("bulk tasks", args.rows, lambda: crud.bulk_create_tasks(db, tasks))
+        print(f"{'speedup':>22}: {per_item / bulk:.1f}x")
+    finally:
+        db.query(TaskDB).filter(TaskDB.user_id == user_id).delete()
+        db.query(ExpenseDB).filter(ExpenseDB.user_id == user_id).delete()
+        db.query(ExpenseRollupDB).filter(ExpenseRollupDB.user_id == user_id).delete()
+        db.query(UserProfileDB).filter(UserProfileDB.id == user_id).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
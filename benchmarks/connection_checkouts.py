@@ -0,0 +1,60 @@
+"""
+Pool connection checkouts per HTTP request.
+
+Sends requests to the routers through FastAPI's TestClient and counts how
+many times each one checks a connection out of the sync engine's pool. With a
+request-scoped session every route should check out exactly one connection.
+Uses a throwaway user that is removed afterwards.
+
+Usage:
+    python -m benchmarks.connection_checkouts
+"""
+import uuid
+from typing import List
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.db.database import get_engine, get_session_factory
+from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB, ExpenseRollupDB
+
+
+def main() -> None:
+    user_id = f"checkout-bench-{uuid.uuid4().hex[:8]}"
+    engine, SessionLocal = get_engine(), get_session_factory()
+    checkouts: List[int] = [0]
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts[0] += 1
+
+    requests = [
+        ("POST", "/api/todo/", {"json": {"title": "Checkout benchmark", "user_id": user_id}}),
+        ("GET", "/api/todo/", {"params": {"user_id": user_id}}),
+        ("POST", "/api/expense/", {"json": {"description": "Coffee", "amount": 3.5, "user_id": user_id}}),
+        ("POST", "/api/expense/bulk", {"json": [{"description": "Lunch", "amount": 12.0, "user_id": user_id}] * 10}),
+        ("GET", "/api/expense/", {"params": {"user_id": user_id}}),
+        ("GET", "/api/expense/summary", {"params": {"user_id": user_id}}),
+    ]
+
+    with SessionLocal() as db:
+        db.add(UserProfileDB(id=user_id, name="Checkout benchmark"))
+        db.commit()
+
+    client = TestClient(app)
+    event.listen(engine, "checkout", on_checkout)
+    try:
+        for method, path, kwargs in requests:
+            checkouts[0] = 0
+            response = client.request(method, path, **kwargs)
+            print(f"{method:>5} {path:<22} {response.status_code}  checkouts: {checkouts[0]}")
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+        with SessionLocal() as db:
+            db.query(TaskDB).filter(TaskDB.user_id == user_id).delete()
+            db.query(ExpenseDB).filter(ExpenseDB.user_id == user_id).delete()
+            db.query(ExpenseRollupDB).filter(ExpenseRollupDB.user_id == user_id).delete()
+            db.query(UserProfileDB).filter(UserProfileDB.id == user_id).delete()
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
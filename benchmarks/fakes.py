@@ -0,0 +1,88 @@
+"""
+Fake chat model and agent for benchmarking the agent path offline.
+
+FakeChatModel answers after a fixed delay and reports token usage like the
+OpenAI chat models do, so agent benchmarks exercise LangGraph, callbacks,
+node profiling, the scheduler and the routes without network calls.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, TypedDict
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import StateGraph, END
+from app.agents.base import BaseAgent
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that echoes the last message after `latency` seconds."""
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = " ".join(str(message.content) for message in messages)
+        answer = f"Echo: {messages[-1].content}"
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=answer))],
+            llm_output={"token_usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(answer.split())
+            }}
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                  **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                         **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+class FakeAgentState(TypedDict):
+    """State schema for the fake agent."""
+    messages: list
+    input: str
+    prompt_prefix: str
+    output: str
+
+
+class FakeLLMAgent(BaseAgent):
+    """Two-node agent (build the prompt, call the fake LLM) with a configurable LLM latency."""
+
+    def __init__(self, latency: float = 0.0, name: str = "benchmark_agent"):
+        super().__init__(name=name)
+        self.llm = FakeChatModel(latency=latency)
+
+    def _build_graph(self) -> StateGraph:
+        workflow = StateGraph(FakeAgentState)
+        workflow.add_node("build_prompt", self._build_prompt)
+        workflow.add_node("call_llm", self._call_llm)
+        workflow.set_entry_point("build_prompt")
+        workflow.add_edge("build_prompt", "call_llm")
+        workflow.add_edge("call_llm", END)
+        return workflow
+
+    def _build_prompt(self, state: FakeAgentState) -> Dict[str, Any]:
+        system = "\n\n".join(filter(None, ["You are a benchmark.", state["prompt_prefix"]]))
+        return {"messages": [SystemMessage(content=system), HumanMessage(content=state["input"])]}
+
+    async def _call_llm(self, state: FakeAgentState) -> Dict[str, Any]:
+        message = await self.llm.ainvoke(state["messages"])
+        return {"output": message.content}
+
+    async def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.graph.ainvoke({
+            "messages": [],
+            "input": input_data.get("input", ""),
+            "prompt_prefix": input_data.get("prompt_prefix", ""),
+            "output": ""
+        })
+        return {"output": result.get("output", ""), "state": result}
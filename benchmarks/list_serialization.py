@@ -0,0 +1,118 @@
+"""
+Model path vs column-tuple fast path for the list endpoints.
+
+Lists one user's tasks and expenses (every row, as the unbounded listing
+does, and a 50-row page) two ways and times each from query to response
+body:
+
+    models  crud.list_tasks / crud.list_expenses, then FastAPI's own
+            response_model validation and JSON encoding (what the routes
+            did before app.api.listing)
+    rows    crud.list_task_rows / crud.list_expense_rows written by
+            app.api.listing.page_response with orjson
+
+Both bodies are checked to hold the same JSON. Seeds a SQLite file by
+default, or a throwaway user in the Postgres from .env with --postgres.
+
+Usage:
+    python -m benchmarks.list_serialization --rows 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List
+from benchmarks.suite import SQLITE_SETTINGS, latency_stats, open_database, remove_users, seed
+
+
+async def model_body(field: Any, items: List[Any]) -> bytes:
+    """Encodes items the way FastAPI does for a route with response_model."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    content = await serialize_response(field=field, response_content={"items": items})
+    return JSONResponse(content).body
+
+
+def timed(iterations: int, run: Callable[[], bytes]) -> Dict[str, Any]:
+    """Runs `run` `iterations` times and summarizes the latencies and body size."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = run()
+        samples.append(time.perf_counter() - start)
+    return {**latency_stats(samples), "bytes": len(body)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postgres", action="store_true", help="Use the database from .env instead of a SQLite file")
+    parser.add_argument("--rows", type=int, default=10000, help="Tasks and expenses seeded for the user")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not args.postgres:
+        for key, value in SQLITE_SETTINGS.items():
+            os.environ.setdefault(key, value)
+
+    from fastapi.utils import create_response_field
+    from app.api.listing import page_response
+    from app.db import crud
+    from app.models.schemas import ExpensePage, TaskPage
+
+    task_field = create_response_field("Response_list_tasks", TaskPage)
+    expense_field = create_response_field("Response_list_expenses", ExpensePage)
+    loop = asyncio.new_event_loop()
+    SessionLocal, _, close = open_database(args.postgres)
+    user_ids: List[str] = []
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        user_ids, _, _ = seed(SessionLocal, 1, args.rows)
+        user_id = user_ids[0]
+        cases = {
+            "tasks (all)": (
+                lambda db: loop.run_until_complete(model_body(task_field, crud.list_tasks(db, user_id))),
+                lambda db: page_response(crud.list_task_rows(db, user_id)).body
+            ),
+            "tasks (page of 50)": (
+                lambda db: loop.run_until_complete(model_body(task_field, crud.list_tasks(db, user_id, 50))),
+                lambda db: page_response(crud.list_task_rows(db, user_id, 51), 50).body
+            ),
+            "expenses (all)": (
+                lambda db: loop.run_until_complete(model_body(expense_field, crud.list_expenses(db, user_id))),
+                lambda db: page_response(crud.list_expense_rows(db, user_id)).body
+            ),
+            "expenses (page of 50)": (
+                lambda db: loop.run_until_complete(model_body(expense_field, crud.list_expenses(db, user_id, 50))),
+                lambda db: page_response(crud.list_expense_rows(db, user_id, 51), 50).body
+            )
+        }
+        with SessionLocal() as db:
+            for name, (models, rows) in cases.items():
+                expected, actual = json.loads(models(db)), json.loads(rows(db))
+                # The model path has no cursor to give; only the items must match
+                if expected["items"] != actual["items"]:
+                    raise SystemExit(f"{name}: the fast path returned different items")
+                results[name] = {
+                    "models": timed(args.iterations, lambda: models(db)),
+                    "rows": timed(args.iterations, lambda: rows(db))
+                }
+    finally:
+        if args.postgres and user_ids:
+            remove_users(SessionLocal, user_ids)
+        close()
+        loop.close()
+
+    for name, result in results.items():
+        models, rows = result["models"], result["rows"]
+        print(f"{name:>22}: models {models['mean_ms']:>9.3f} ms   rows {rows['mean_ms']:>9.3f} ms   "
+              f"-> {models['mean_ms'] / rows['mean_ms']:.1f}x ({rows['bytes']} bytes)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Offline benchmark suite: crud latency, route throughput and agent latency.
+
+Seeds a throwaway database (a SQLite file by default, or the Postgres from
+.env with --postgres) with users, tasks and expenses, then measures:
+
+    crud    latency of app.db.crud functions called directly
+    routes  requests per second through the ASGI app (httpx ASGITransport)
+            at a fixed concurrency, rotating over the seeded users
+    agents  invoke latency of benchmarks.fakes.FakeLLMAgent at several
+            concurrency levels, plus its per-node profile
+
+Agents use a fake chat model with a fixed latency, so no API key or network
+is needed. Results are printed and written as JSON; pass --baseline with an
+earlier results file to print the change per measurement.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --postgres --iterations 500 --baseline results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# SQLite runs do not connect to Postgres, but Settings requires the DB_* fields
+SQLITE_SETTINGS = {"DB_HOST": "unused", "DB_PORT": "5432", "DB_NAME": "unused", "DB_USER": "unused", "DB_PASSWORD": "unused"}
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """Summarizes latencies in seconds as milliseconds."""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def open_database(postgres: bool) -> Tuple[Any, Any, Callable[[], None]]:
+    """
+    Opens the database to benchmark against.
+
+    Returns:
+        tuple: Sync session factory, async session factory and a function releasing
+            the sync side (the async engine is disposed by measure_async).
+    """
+    if postgres:
+        from app.db.database import get_session_factory
+        from app.db.async_database import get_async_session_factory
+        return get_session_factory(), get_async_session_factory(), lambda: None
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import instrument_engine
+    from app.db.orm_models import Base
+
+    directory = tempfile.mkdtemp(prefix="benchmark-")
+    path = os.path.join(directory, "benchmark.db")
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    Base.metadata.create_all(engine)
+
+    def close() -> None:
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return (
+        sessionmaker(autoflush=False, expire_on_commit=False, bind=engine),
+        async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False),
+        close
+    )
+
+
+def seed(SessionLocal: Any, users: int, rows: int) -> Tuple[List[str], Dict[str, List[int]], Dict[str, List[int]]]:
+    """
+    Creates users with `rows` tasks and expenses each.
+
+    Returns:
+        tuple: The user IDs, and the task and expense IDs per user.
+    """
+    from app.db import crud
+    from app.db.models import Expense
+    from app.db.orm_models import UserProfileDB
+    from app.models.schemas import TaskCreate
+
+    run = uuid.uuid4().hex[:8]
+    user_ids = [f"bench-{run}-{i}" for i in range(users)]
+    task_ids: Dict[str, List[int]] = {}
+    expense_ids: Dict[str, List[int]] = {}
+    with SessionLocal() as db:
+        db.add_all(UserProfileDB(id=user_id, name="Benchmark user", preferences={}, interests=[]) for user_id in user_ids)
+        db.commit()
+        for user_id in user_ids:
+            ids, _ = crud.bulk_create_tasks(db, [
+                TaskCreate(title=f"Task {i}", solutions=["Benchmark"], user_id=user_id) for i in range(rows)
+            ])
+            task_ids[user_id] = [task_id for task_id in ids if task_id is not None]
+            ids, _ = crud.bulk_create_expenses(db, [
+                Expense(description=f"Expense {i}", amount=float(i % 50), category="food", user_id=user_id)
+                for i in range(rows)
+            ])
+            expense_ids[user_id] = [expense_id for expense_id in ids if expense_id is not None]
+    return user_ids, task_ids, expense_ids
+
+
+def remove_users(SessionLocal: Any, user_ids: List[str]) -> None:
+    """Deletes everything the seeded users own."""
+    from app.db.orm_models import (
+        UserProfileDB, TaskDB, ExpenseDB, ExpenseRollupDB, AgentJobDB, ConversationDB, ConversationTurnDB
+    )
+
+    with SessionLocal() as db:
+        # Agent routes store conversation turns, and jobs reference the profile too
+        for model in (TaskDB, ExpenseDB, ExpenseRollupDB, AgentJobDB, ConversationTurnDB, ConversationDB):
+            db.query(model).filter(model.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(UserProfileDB).filter(UserProfileDB.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+def bench_crud(
+    SessionLocal: Any,
+    user_ids: List[str],
+    task_ids: Dict[str, List[int]],
+    expense_ids: Dict[str, List[int]],
+    iterations: int
+) -> Dict[str, Any]:
+    """Times each crud function over `iterations` calls, each in a fresh session like a request."""
+    from app.db import crud
+    from app.db.models import Expense
+    from app.db.profile_cache import get_profile_cache
+    from app.models.schemas import TaskCreate
+
+    user_id = user_ids[0]
+    tasks, expenses = task_ids[user_id], expense_ids[user_id]
+
+    def uncached_profile(db, i):
+        get_profile_cache().invalidate(user_id)
+        return crud.get_user_profile(db, user_id)
+
+    cases = {
+        "get_user_profile": lambda db, i: crud.get_user_profile(db, user_id),
+        "get_user_profile_uncached": uncached_profile,
+        "get_user_profiles": lambda db, i: crud.get_user_profiles(db, set(user_ids)),
+        "get_task": lambda db, i: crud.get_task(db, tasks[i % len(tasks)]),
+        "list_tasks_page": lambda db, i: crud.list_tasks(db, user_id, 51),
+        "list_tasks_all": lambda db, i: crud.list_tasks(db, user_id),
+        "list_expenses_page": lambda db, i: crud.list_expenses(db, user_id, 51),
+        "summarize_expenses": lambda db, i: crud.summarize_expenses(db, user_id, ["month", "category"]),
+        "create_task": lambda db, i: crud.create_task(db, TaskCreate(title=f"New {i}", solutions=["Benchmark"], user_id=user_id)),
+        "create_expense": lambda db, i: crud.create_expense(db, Expense(description=f"New {i}", amount=1.0, user_id=user_id)),
+        "update_expense": lambda db, i: crud.update_expense(db, expenses[i % len(expenses)], {"amount": float(i)})
+    }
+
+    results = {}
+    for name, call in cases.items():
+        samples = []
+        for i in range(iterations):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                call(db, i)
+                samples.append(time.perf_counter() - start)
+        results[name] = latency_stats(samples)
+    return results
+
+
+async def bench_routes(
+    SessionLocal: Any,
+    AsyncSessionLocal: Any,
+    postgres: bool,
+    user_ids: List[str],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Sends `requests` requests per route through the ASGI app with `concurrency` in flight."""
+    import httpx
+    from app.main import app
+    from app.agents import memory
+    from app.db.database import get_db
+    from app.db.async_database import get_async_db, get_async_session_factory
+
+    if not postgres:
+        def sqlite_db():
+            with SessionLocal() as db:
+                yield db
+
+        async def sqlite_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = sqlite_db
+        app.dependency_overrides[get_async_db] = sqlite_async_db
+        # Conversation turns are written outside the request's session
+        memory.get_async_session_factory = lambda: AsyncSessionLocal
+
+    routes = {
+        "GET /api/todo/": lambda user_id: ("GET", "/api/todo/", {"params": {"user_id": user_id}}),
+        "GET /api/expense/": lambda user_id: ("GET", "/api/expense/", {"params": {"user_id": user_id}}),
+        "GET /api/expense/summary": lambda user_id: ("GET", "/api/expense/summary", {"params": {"user_id": user_id}}),
+        "GET /api/userprofile/{user_id}": lambda user_id: ("GET", f"/api/userprofile/{user_id}", {}),
+        "POST /api/agents/{agent_name}/invoke": lambda user_id: (
+            "POST", "/api/agents/benchmark_agent/invoke", {"json": {"user_id": user_id, "input": "How is my week?"}}
+        )
+    }
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, build in routes.items():
+                semaphore = asyncio.Semaphore(concurrency)
+                samples: List[float] = []
+                statuses: Dict[str, int] = {}
+
+                async def send(i: int) -> None:
+                    method, path, kwargs = build(user_ids[i % len(user_ids)])
+                    async with semaphore:
+                        start = time.perf_counter()
+                        response = await client.request(method, path, **kwargs)
+                        samples.append(time.perf_counter() - start)
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+                start = time.perf_counter()
+                await asyncio.gather(*(send(i) for i in range(requests)))
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "requests_per_second": round(requests / elapsed, 1),
+                    "statuses": statuses,
+                    **latency_stats(samples)
+                }
+    finally:
+        app.dependency_overrides.clear()
+        memory.get_async_session_factory = get_async_session_factory
+    return results
+
+
+async def bench_agent(agent: Any, requests: int, levels: List[int]) -> Dict[str, Any]:
+    """Invokes the agent `requests` times at each concurrency level."""
+    results: Dict[str, Any] = {}
+    await agent.invoke({"input": "warm up"})
+    for level in levels:
+        semaphore = asyncio.Semaphore(level)
+        samples: List[float] = []
+
+        async def invoke(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await agent.invoke({"input": f"Request {i}"})
+                samples.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(invoke(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        results[str(level)] = {"invocations_per_second": round(requests / elapsed, 1), **latency_stats(samples)}
+    results["nodes"] = agent.get_info()["nodes"]
+    return results
+
+
+async def measure_async(args: argparse.Namespace, SessionLocal: Any, AsyncSessionLocal: Any, agent: Any,
+                        user_ids: List[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Runs the route and agent benchmarks on one event loop, which owns the async engine's connections."""
+    try:
+        routes = await bench_routes(SessionLocal, AsyncSessionLocal, args.postgres, user_ids, args.requests, args.concurrency)
+        agents = await bench_agent(agent, args.agent_requests, [int(level) for level in args.agent_concurrency.split(",")])
+    finally:
+        await AsyncSessionLocal.kw["bind"].dispose()
+    return routes, agents
+
+
+def headline(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flattens results into one comparable number per measurement."""
+    numbers = {f"crud {name} p50_ms": stats["p50_ms"] for name, stats in results["crud"].items()}
+    numbers.update({f"route {name} req/s": stats["requests_per_second"] for name, stats in results["routes"].items()})
+    numbers.update({
+        f"agent concurrency={level} p50_ms": stats["p50_ms"]
+        for level, stats in results["agents"].items() if level != "nodes"
+    })
+    return numbers
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any]) -> None:
+    """Prints each measurement next to the baseline's."""
+    before, after = headline(baseline), headline(results)
+    print(f"\nChange vs baseline ({baseline['meta'].get('commit', 'unknown')[:10]}):")
+    for name, value in after.items():
+        if name in before and before[name]:
+            print(f"{name:>55}: {before[name]:>10} -> {value:>10} ({(value / before[name] - 1) * 100:+.1f}%)")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postgres", action="store_true", help="Use the database from .env instead of a SQLite file")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=200, help="Tasks and expenses seeded per user")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per crud function")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16, help="Route requests in flight")
+    parser.add_argument("--agent-requests", type=int, default=200, help="Agent invocations per concurrency level")
+    parser.add_argument("--agent-concurrency", default="1,8,32", help="Comma-separated agent concurrency levels")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds the fake LLM takes per call")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if not args.postgres:
+        for key, value in SQLITE_SETTINGS.items():
+            os.environ.setdefault(key, value)
+
+    from app.core.dependencies import register_agent
+    from benchmarks.fakes import FakeLLMAgent
+
+    agent = FakeLLMAgent(latency=args.llm_latency)
+    register_agent(agent)
+
+    SessionLocal, AsyncSessionLocal, close = open_database(args.postgres)
+    user_ids: List[str] = []
+    try:
+        user_ids, task_ids, expense_ids = seed(SessionLocal, args.users, args.rows)
+        crud_results = bench_crud(SessionLocal, user_ids, task_ids, expense_ids, args.iterations)
+        route_results, agent_results = asyncio.run(measure_async(args, SessionLocal, AsyncSessionLocal, agent, user_ids))
+        results = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "database": "postgres" if args.postgres else "sqlite",
+                "python": platform.python_version(),
+                "args": vars(args)
+            },
+            "crud": crud_results,
+            "routes": route_results,
+            "agents": agent_results
+        }
+    finally:
+        if args.postgres and user_ids:
+            remove_users(SessionLocal, user_ids)
+        close()
+
+    for name, value in headline(results).items():
+        print(f"{name:>55}: {value}")
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
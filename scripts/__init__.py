@@ -0,0 +1,4 @@
+"""
+Maintenance and regression-check scripts.
+"""
+
@@ -0,0 +1,83 @@
+"""
+Import-time budget check for the application.
+
+Imports app.main in a fresh interpreter under `python -X importtime` and
+fails if the cumulative import time exceeds the budget, or if any module
+that must stay off the startup path (LangGraph, LangChain, database
+drivers) is imported. Settings, engines and agent graphs are built on
+first use, so the import needs no .env or database. Takes the best of
+several runs to smooth out noise. Exits non-zero on failure.
+
+Usage:
+    python -m scripts.check_import_time --budget-ms 1500 --runs 3
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+TARGET = "app.main"
+
+# Top-level packages that importing the app must not load
+FORBIDDEN = ("langgraph", "langchain", "langchain_core", "langchain_openai", "langchain_community",
+             "openai", "asyncpg", "psycopg2")
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)$")
+
+
+def profile_import() -> Tuple[int, Dict[str, int]]:
+    """
+    Imports TARGET in a subprocess with -X importtime.
+
+    Returns:
+        tuple: Cumulative microseconds for TARGET, and self time in microseconds per module.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONIMPORTTIME"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {TARGET} failed:\n{result.stderr[-2000:]}")
+
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, module = int(match[1]), int(match[2]), match[3]
+        modules[module] = self_us
+        if module == TARGET:
+            total = cumulative_us
+    return total, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to print")
+    args = parser.parse_args()
+
+    runs: List[Tuple[int, Dict[str, int]]] = [profile_import() for _ in range(args.runs)]
+    total, modules = min(runs, key=lambda run: run[0])
+
+    for module, self_us in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f} ms  {module}")
+
+    failures = 0
+    loaded = sorted({module for module in modules if module.split(".")[0] in FORBIDDEN})
+    if loaded:
+        failures += 1
+        print(f"FAIL import {TARGET} loads deferred modules: {', '.join(loaded)}")
+    ok = total / 1000 <= args.budget_ms
+    failures += not ok
+    print(f"{'OK  ' if ok else 'FAIL'} import {TARGET}: {total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Query-plan regression check for the crud layer.
+
+Runs EXPLAIN on every statement shape the crud modules issue and checks that
+each one is answered by the expected index instead of a sequential scan.
+Sequential scans are disabled for the session so the check is meaningful on
+small development tables. Exits non-zero on failure.
+
+Usage:
+    python -m scripts.check_query_plans
+"""
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set, Tuple
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.compiler import Compiled
+from app.db.database import get_engine
+from app.db.orm_models import UserProfileDB, TaskDB, ExpenseDB
+from app.db.queries import (
+    tasks_query, expenses_query, user_profiles_query, claim_agent_job_query, conversation_turns_query
+)
+
+USER_ID = "plan-check-user"
+CURSOR = (datetime(2025, 1, 1), 1000)
+
+TASK_PK = {"tasks_pkey", "ix_tasks_id"}
+EXPENSE_PK = {"expenses_pkey", "ix_expenses_id"}
+PROFILE_PK = {"user_profiles_pkey", "ix_user_profiles_id"}
+
+# (description, statement, acceptable indexes)
+QUERIES: List[Tuple[str, Select, Set[str]]] = [
+    ("get_user_profile", select(UserProfileDB).where(UserProfileDB.id == USER_ID), PROFILE_PK),
+    ("get_task / update_task", select(TaskDB).where(TaskDB.id == 1), TASK_PK),
+    ("list_tasks", tasks_query(USER_ID, limit=51), {"ix_tasks_user_id_created_at_id"}),
+    ("list_tasks (next page)", tasks_query(USER_ID, limit=51, after=CURSOR), {"ix_tasks_user_id_created_at_id"}),
+    ("list_tasks (status)", tasks_query(USER_ID, limit=51, status="in progress"),
+     {"ix_tasks_user_id_created_at_id", "ix_tasks_user_id_status_deadline"}),
+    ("list_tasks (date range)", tasks_query(USER_ID, limit=51, created_from=datetime(2025, 1, 1),
+                                            created_to=datetime(2025, 2, 1)), {"ix_tasks_user_id_created_at_id"}),
+    ("list_tasks (unbounded)", tasks_query(USER_ID), {"ix_tasks_user_id_created_at_id"}),
+    ("get_expense / update_expense", select(ExpenseDB).where(ExpenseDB.id == 1), EXPENSE_PK),
+    ("list_expenses", expenses_query(USER_ID, limit=51), {"ix_expenses_user_id_created_at_id"}),
+    ("list_expenses (next page)", expenses_query(USER_ID, limit=51, after=CURSOR),
+     {"ix_expenses_user_id_created_at_id"}),
+    ("list_expenses (category)", expenses_query(USER_ID, limit=51, category="food"),
+     {"ix_expenses_user_id_created_at_id"}),
+    ("list_expenses (date range)", expenses_query(USER_ID, limit=51, created_from=datetime(2025, 1, 1),
+                                                  created_to=datetime(2025, 2, 1)),
+     {"ix_expenses_user_id_created_at_id"}),
+    ("list_user_profiles (preferences)", user_profiles_query({"language": "es"}), {"ix_user_profiles_preferences"}),
+    ("claim_agent_job", claim_agent_job_query(CURSOR[0]), {"ix_agent_jobs_status_created_at"}),
+    ("get_conversation (turns)", conversation_turns_query(USER_ID), {"ix_conversation_turns_user_id_id"}),
+]
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walks an EXPLAIN (FORMAT JSON) plan tree depth-first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def driver_params(compiled: Compiled, dialect: Dialect) -> Dict[str, Any]:
+    """Applies each bind's type processor, e.g. serializing JSONB values for the driver."""
+    params = {}
+    for key, value in compiled.params.items():
+        processor = compiled.binds[key].type.dialect_impl(dialect).bind_processor(dialect)
+        params[key] = processor(value) if processor else value
+    return params
+
+
+def main() -> int:
+    failures = 0
+    with get_engine().connect() as conn:
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for description, stmt, expected in QUERIES:
+            compiled = stmt.compile(dialect=conn.dialect)
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", driver_params(compiled, conn.dialect)).scalar()
+            nodes = list(plan_nodes(plan[0]["Plan"]))
+            seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+            used = {node["Index Name"] for node in nodes if "Index Name" in node}
+
+            ok = not seq_scans and bool(used & expected)
+            failures += not ok
+            detail = f"seq scan on {', '.join(seq_scans)}" if seq_scans else f"uses {', '.join(sorted(used)) or 'no index'}"
+            print(f"{'OK  ' if ok else 'FAIL'} {description}: {detail}")
+        conn.rollback()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
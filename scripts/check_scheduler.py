@@ -0,0 +1,80 @@
+"""
+Slot accounting check for the agent scheduler.
+
+Queues waiters behind a full scheduler, cancels some of them and releases
+a slot before their tasks get to run (the cancelled futures are still
+queued at that point), then asserts the slot goes to a live waiter and
+that running and queued counts return to zero. Needs no database.
+Exits non-zero on failure.
+
+Usage:
+    python -m scripts.check_scheduler
+"""
+import asyncio
+import sys
+from typing import List, Tuple
+from app.core.scheduler import AgentScheduler, SchedulerSlot
+
+USERS = ("alice", "bob", "carol")
+GRANT_TIMEOUT_SECONDS = 1.0
+
+
+async def settle() -> None:
+    """Let every ready task run until it blocks again."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def check(cancelled_users: Tuple[str, ...]) -> List[str]:
+    """Runs one scenario and returns the problems found."""
+    problems: List[str] = []
+    scheduler = AgentScheduler(max_concurrency=1, max_queue=10, max_queue_per_user=10)
+    holder = await scheduler.acquire("holder")
+    waiters = {user_id: asyncio.create_task(scheduler.acquire(user_id)) for user_id in USERS}
+    await settle()
+
+    for user_id in cancelled_users:
+        waiters[user_id].cancel()
+    try:
+        # Cancelled futures are still queued: their tasks have not run yet
+        holder.release()
+    except Exception as e:
+        problems.append(f"release raised {type(e).__name__}: {e}")
+    await settle()
+
+    live = [user_id for user_id in USERS if user_id not in cancelled_users]
+    granted = [user_id for user_id in USERS if waiters[user_id].done() and not waiters[user_id].cancelled()]
+    if live and granted != live[:1]:
+        problems.append(f"expected {live[:1]} to get the slot, got {granted}")
+    if scheduler.running != min(1, len(live)):
+        problems.append(f"running is {scheduler.running} after the release")
+
+    # Run the remaining waiters to completion, one slot at a time
+    for user_id in live:
+        try:
+            slot: SchedulerSlot = await asyncio.wait_for(waiters[user_id], GRANT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            problems.append(f"{user_id} never got a slot")
+            continue
+        slot.release()
+        await settle()
+    await asyncio.gather(*waiters.values(), return_exceptions=True)
+    if scheduler.running or scheduler.queued or scheduler.stats()["users_queued"]:
+        problems.append(f"leaked: running={scheduler.running}, queued={scheduler.queued}")
+    return problems
+
+
+def main() -> int:
+    failures = 0
+    scenarios = [(), USERS[:1], USERS[:2], USERS]
+    for cancelled_users in scenarios:
+        problems = asyncio.run(check(cancelled_users))
+        failures += bool(problems)
+        print(f"{'FAIL' if problems else 'OK  '} release with {len(cancelled_users)} of {len(USERS)} waiters cancelled")
+        for problem in problems:
+            print(f"     {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Shared fixtures. Tests run against a throwaway SQLite file with the same
+schema variants the offline benchmark suite uses, so no Postgres is needed.
+"""
+import os
+
+# Settings requires the DB_* fields even though no test connects to Postgres
+for key in ("DB_HOST", "DB_NAME", "DB_USER", "DB_PASSWORD"):
+    os.environ.setdefault(key, "unused")
+os.environ.setdefault("DB_PORT", "5432")
+
+from datetime import datetime
+from typing import Any, Iterator, List, NamedTuple
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.db.database import instrument_engine
+from app.db.orm_models import Base
+from app.db.profile_cache import get_profile_cache
+
+
+class Database(NamedTuple):
+    """Session factories bound to the test database."""
+
+    SessionLocal: Any
+    AsyncSessionLocal: Any
+    # Timezone-aware datetimes bound to any statement; asyncpg rejects them for
+    # the plain timestamp columns, while SQLite silently drops the offset
+    aware_datetimes: List[datetime]
+
+
+def _record_aware_datetimes(engine: Engine, found: List[datetime]) -> None:
+    """Collect aware datetime parameters before SQLite's type processing turns them into strings."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        for params in context.compiled_parameters:
+            found.extend(
+                value for value in params.values()
+                if isinstance(value, datetime) and value.tzinfo is not None
+            )
+
+
+@pytest.fixture
+def database(tmp_path) -> Iterator[Database]:
+    """A fresh database with the full schema; the profile cache starts empty."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", poolclass=NullPool)
+    # NullPool: each test's event loop opens and closes its own connections
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    Base.metadata.create_all(engine)
+    # Record statements into track_queries() like the application engines
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    found: List[datetime] = []
+    _record_aware_datetimes(engine, found)
+    _record_aware_datetimes(async_engine.sync_engine, found)
+    get_profile_cache().clear()
+    try:
+        yield Database(
+            sessionmaker(autoflush=False, expire_on_commit=False, bind=engine),
+            async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False),
+            found
+        )
+    finally:
+        get_profile_cache().clear()
+        engine.dispose()
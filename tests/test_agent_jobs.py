@@ -0,0 +1,58 @@
+"""
+Agent job lifecycle: submit through the API, claim (including an expired
+lease) and finish, with naive timestamps bound throughout.
+"""
+import asyncio
+import httpx
+from app.core.dependencies import register_agent
+from app.db import async_crud
+from app.db.async_database import get_async_db
+from app.main import app
+
+USER_ID = "user-1"
+
+
+class EchoAgent:
+    """Stands in for a registered agent; submitting a job only looks it up."""
+
+    name = "echo"
+    cacheable = False
+
+
+def test_submit_claim_finish(database):
+    register_agent(EchoAgent())
+
+    async def override_db():
+        async with database.AsyncSessionLocal() as db:
+            yield db
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/agents/echo/jobs", json={"user_id": USER_ID, "input": "Hello"})
+        assert response.status_code == 202, response.text
+        job_id = response.json()["id"]
+
+        async with database.AsyncSessionLocal() as db:
+            claimed = await async_crud.claim_agent_job(db, lease_seconds=60, max_attempts=3)
+        assert claimed is not None and claimed.id == job_id and claimed.status == "running"
+
+        # Nothing else is runnable while the lease holds; once it expires the job is claimed again
+        async with database.AsyncSessionLocal() as db:
+            assert await async_crud.claim_agent_job(db, lease_seconds=60, max_attempts=3) is None
+        await asyncio.sleep(0.01)
+        async with database.AsyncSessionLocal() as db:
+            reclaimed = await async_crud.claim_agent_job(db, lease_seconds=0, max_attempts=3)
+        assert reclaimed is not None and reclaimed.attempts == 2
+
+        async with database.AsyncSessionLocal() as db:
+            finished = await async_crud.finish_agent_job(db, job_id, output="Hi")
+        assert finished is not None and finished.status == "succeeded" and finished.finished_at is not None
+
+    app.dependency_overrides[get_async_db] = override_db
+    try:
+        asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert database.aware_datetimes == []
@@ -0,0 +1,58 @@
+"""
+Async CRUD writes. The timestamp columns have no time zone, so every bound
+datetime must be naive: asyncpg raises DataError for aware ones on Postgres.
+"""
+import asyncio
+from datetime import datetime, timezone
+from app.agents.runner import load_user_profile
+from app.db import async_crud
+from app.db.models import Expense
+from app.db.orm_models import ExpenseDB, TaskDB, UserProfileDB
+from app.models.schemas import Task, TaskCreate
+
+USER_ID = "user-1"
+# 23:00 UTC on Jan 31 is 18:00 on Jan 31 in Colombia
+AWARE = datetime(2024, 1, 31, 23, 0, tzinfo=timezone.utc)
+LOCAL = datetime(2024, 1, 31, 18, 0)
+
+
+def test_first_contact_creates_profile(database):
+    async def run():
+        async with database.AsyncSessionLocal() as db:
+            await load_user_profile(db, USER_ID)
+
+    asyncio.run(run())
+
+    assert database.aware_datetimes == []
+    with database.SessionLocal() as db:
+        assert db.get(UserProfileDB, USER_ID) is not None
+
+
+def test_task_and_expense_writes_bind_naive_timestamps(database):
+    async def run():
+        async with database.AsyncSessionLocal() as db:
+            await load_user_profile(db, USER_ID)
+            task_id = await async_crud.create_task(
+                db, Task(title="Call", solutions=["Phone"], user_id=USER_ID, created_at=AWARE)
+            )
+            bulk_ids, errors = await async_crud.bulk_create_tasks(
+                db, [Task(title="Write", solutions=["Pen"], user_id=USER_ID, created_at=AWARE)]
+            )
+            assert errors == {}
+            await async_crud.update_task(
+                db, task_id, TaskCreate(title="Call back", solutions=["Phone"], user_id=USER_ID)
+            )
+            expense_id = await async_crud.create_expense(
+                db, Expense(description="Lunch", amount=10.0, user_id=USER_ID, created_at=AWARE)
+            )
+            await async_crud.bulk_create_expenses(db, [Expense(description="Bus", amount=2.0, user_id=USER_ID)])
+            assert await async_crud.update_expense(db, expense_id, {"amount": 12.0, "created_at": AWARE})
+            return task_id, bulk_ids[0], expense_id
+
+    task_id, bulk_task_id, expense_id = asyncio.run(run())
+
+    assert database.aware_datetimes == []
+    with database.SessionLocal() as db:
+        assert db.get(TaskDB, task_id).created_at == LOCAL
+        assert db.get(TaskDB, bulk_task_id).created_at == LOCAL
+        assert db.get(ExpenseDB, expense_id).created_at == LOCAL
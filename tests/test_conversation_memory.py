@@ -0,0 +1,32 @@
+"""
+Server-side conversation memory: exchanges are stored with naive timestamps
+and come back as the next request's history.
+"""
+import asyncio
+from app.agents import memory
+from app.db import async_crud
+from app.db.models import UserProfile
+from app.db.timestamps import local_now
+from app.models.schemas import AgentRequest
+
+USER_ID = "user-1"
+
+
+def test_exchange_becomes_history(database, monkeypatch):
+    # remember_exchange opens its own session outside the request
+    monkeypatch.setattr(memory, "get_async_session_factory", lambda: database.AsyncSessionLocal)
+
+    async def run():
+        async with database.AsyncSessionLocal() as db:
+            await async_crud.create_user_profile(db, UserProfile(id=USER_ID, created_at=local_now()))
+        await memory.remember_exchange(AgentRequest(user_id=USER_ID, input="Hello"), "Hi there")
+        async with database.AsyncSessionLocal() as db:
+            return await memory.resolve_history(db, AgentRequest(user_id=USER_ID, input="How are you?"))
+
+    request = asyncio.run(run())
+
+    assert database.aware_datetimes == []
+    assert request.history == [
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi there"}
+    ]
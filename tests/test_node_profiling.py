@@ -0,0 +1,40 @@
+"""
+Node profiles: BaseAgent.build wraps the nodes of the agent's own graph and
+leaves LangGraph and every other graph alone.
+"""
+import asyncio
+from typing import TypedDict
+from langgraph.graph import END, StateGraph
+from langgraph.graph.graph import Graph
+from benchmarks.fakes import FakeLLMAgent
+
+
+class CounterState(TypedDict):
+    count: int
+
+
+def test_agent_nodes_are_profiled():
+    agent = FakeLLMAgent()
+
+    asyncio.run(agent.invoke({"input": "How is my week?"}))
+
+    nodes = agent.profile.as_dict()
+    assert set(nodes) == {"build_prompt", "call_llm"}
+    assert nodes["build_prompt"]["calls"] == 1 and nodes["build_prompt"]["llm_calls"] == 0
+    assert nodes["call_llm"]["llm_calls"] == 1 and nodes["call_llm"]["total_tokens"] > 0
+
+
+def test_other_graphs_are_left_alone():
+    FakeLLMAgent().build()
+    assert Graph.add_node.__module__ == "langgraph.graph.graph"
+
+    def increment(state: CounterState) -> CounterState:
+        return {"count": state["count"] + 1}
+
+    workflow = StateGraph(CounterState)
+    workflow.add_node("increment", increment)
+    workflow.set_entry_point("increment")
+    workflow.add_edge("increment", END)
+
+    assert workflow.nodes["increment"].func is increment
+    assert workflow.compile().invoke({"count": 1})["count"] == 2
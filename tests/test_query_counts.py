@@ -0,0 +1,69 @@
+"""
+Query-count regression tests for the task listing.
+
+crud.list_tasks must run a fixed number of statements and never repeat a
+statement shape, so an N+1 lazy-load pattern cannot creep back in. crud
+functions log and swallow their exceptions, so any error logged during the
+call fails the test too. Tasks are seeded the way the API creates them,
+without solutions.
+"""
+import asyncio
+import logging
+from datetime import datetime
+import httpx
+import pytest
+from app.db import crud
+from app.db.database import get_db
+from app.db.orm_models import TaskDB, UserProfileDB
+from app.db.query_stats import track_queries
+from app.main import app
+
+USER_ID = "user-1"
+LIST_TASKS_QUERIES = 2
+
+
+@pytest.mark.parametrize("count", [0, 1, 10, 100])
+def test_list_tasks_query_count(database, caplog, count):
+    with database.SessionLocal() as db:
+        db.add(UserProfileDB(id=USER_ID, name="Query count check", preferences={}))
+        db.add_all(
+            TaskDB(title=f"Task {i}", solutions=[], user_id=USER_ID, created_at=datetime.now(), updated_at=datetime.now())
+            for i in range(count)
+        )
+        db.commit()
+
+    with caplog.at_level(logging.ERROR, logger=crud.__name__):
+        with database.SessionLocal() as db, track_queries() as stats:
+            tasks = crud.list_tasks(db, USER_ID)
+
+    assert [record.getMessage() for record in caplog.records] == []
+    assert len(tasks) == count
+    assert stats.count == LIST_TASKS_QUERIES
+    assert stats.repeated(2) == []
+
+
+def test_task_created_through_api_can_be_read(database):
+    def override_db():
+        with database.SessionLocal() as db:
+            yield db
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with database.SessionLocal() as db:
+                db.add(UserProfileDB(id=USER_ID, preferences={}))
+                db.commit()
+            response = await client.post("/api/todo/", json={"title": "Call", "user_id": USER_ID})
+            assert response.status_code == 200, response.text
+            listed = (await client.get("/api/todo/", params={"user_id": USER_ID})).json()
+            task_id = listed["items"][0]["id"]
+            return await client.get(f"/api/todo/{task_id}")
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        response = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200, response.text
+    assert response.json()["solutions"] == []
@@ -0,0 +1,16 @@
+"""
+QueryStats: repeated statements are grouped by shape, while the slowest
+statement is kept as it was sent.
+"""
+from app.db.query_stats import QueryStats
+
+
+def test_slowest_statement_is_the_sql_sent():
+    stats = QueryStats()
+    stats.record("SELECT * FROM tasks WHERE id IN (?, ?)", 0.002)
+    stats.record("SELECT * FROM tasks WHERE id IN (?, ?, ?)", 0.010)
+    stats.record("SELECT 1", 0.001)
+
+    assert stats.slowest_seconds == 0.010
+    assert stats.slowest_statement == "SELECT * FROM tasks WHERE id IN (?, ?, ?)"
+    assert stats.repeated(2) == [("SELECT * FROM tasks WHERE id IN (?)", 2)]